@@ -4,6 +4,8 @@ import time
 from typing import Optional
 from openai import OpenAIError, APIError, RateLimitError, APIConnectionError
 
+from utils.deadline import timeout_for
+
 class OpenAIClient:
     def __init__(self, api_key: str):
         """Initialize the OpenAI client with your API key."""
@@ -17,7 +19,8 @@ class OpenAIClient:
         model: str = "gpt-3.5-turbo",
         temperature: float = 0.7,
         max_retries: int = 3,
-        retry_delay: float = 1.0
+        retry_delay: float = 1.0,
+        timeout: Optional[float] = None
     ) -> Optional[str]:
         """
         Create a chat completion using OpenAI's models with error handling.
@@ -28,12 +31,14 @@ class OpenAIClient:
             temperature: Controls randomness (0.0 to 1.0)
             max_retries: Maximum number of retry attempts for recoverable errors
             retry_delay: Delay between retries in seconds
+            timeout: Timeout for each attempt in seconds, capped by the current deadline
         
         Returns:
             The generated response text, or None if all retries failed
             
         Raises:
             ValueError: If messages are empty or malformed
+            DeadlineExceeded: If the current deadline runs out before an attempt
             Exception: For unrecoverable API errors
         """
         if not messages:
@@ -49,10 +54,14 @@ class OpenAIClient:
         retries = 0
         while retries <= max_retries:
             try:
+                # The client treats an explicit None as "no timeout", so only pass a real one
+                attempt_timeout = timeout_for(timeout)
+                options = {"timeout": attempt_timeout} if attempt_timeout is not None else {}
                 response = self.client.chat.completions.create(
                     model=model,
                     messages=messages,
-                    temperature=temperature
+                    temperature=temperature,
+                    **options
                 )
                 return response.choices[0].message.content
 
@@ -1 +1,4 @@
-from .bookclub_api import BookClubAPI
\ No newline at end of file
+from .bookclub_api import BookClubAPI
+from .async_bookclub_api import AsyncBookClubAPI
+from .models import Book, Club, Discussion, Member, Session
+from .batch import BatchResult
@@ -0,0 +1,598 @@
+# async_bookclub_api.py
+import asyncio
+import time
+import aiohttp
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Mapping, Optional, Sequence, Tuple
+
+from .batch import (
+    DEFAULT_BATCH_CONCURRENCY,
+    DEFAULT_BATCH_SIZE,
+    BatchResult,
+    chunked,
+    item_ids,
+    read_payloads,
+    write_outcomes,
+)
+from .delta import ClubDelta
+from .hedging import HedgePolicy
+from .metrics import APIMetrics, MetricsRegistry, body_size
+from .models import Club, Member, Session, fast_json_loads
+from .projection import include_param, normalize_include
+from .cache import DEFAULT_CACHE_MAXSIZE, DEFAULT_CACHE_TTL, MISSING, TTLCache, conditional_headers
+from .singleflight import AsyncSingleFlight
+from .rate_limit import BACKGROUND, RateLimiter, default_priority, priority_for
+from .resilience import CircuitBreaker, RetryPolicy, parse_retry_after
+from .bookclub_api import (
+    APIError,
+    CIRCUIT_OPEN_MESSAGE,
+    CONNECTION_ERROR_MESSAGE,
+    CircuitOpenError,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_TIMEOUT,
+    ResourceNotFoundError,
+    TIMEOUT_ERROR_MESSAGE,
+    Timeout,
+    _without_id,
+    error_for_status,
+)
+from utils.deadline import DeadlineExceeded, expired, timeout_for
+
+def _client_timeout(timeout: Timeout) -> aiohttp.ClientTimeout:
+    """
+    Convert a requests-style timeout into an aiohttp.ClientTimeout.
+
+    Args:
+        timeout: Seconds for the whole call, or a (connect, read) tuple
+
+    Returns:
+        The equivalent aiohttp.ClientTimeout
+    """
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+    return aiohttp.ClientTimeout(total=timeout)
+
+def _request_size(response: aiohttp.ClientResponse) -> Optional[int]:
+    """Get the size of the request body behind a response, from the Content-Length aiohttp sent."""
+    length = response.request_info.headers.get("Content-Length")
+    return int(length) if isinstance(length, str) and length.isdigit() else body_size(None)
+
+def _never_sent(error: Exception) -> bool:
+    """Tell whether a request failed before its connection was opened, so the server cannot have seen it."""
+    # Timed out connecting, or refused, unreachable or not resolved
+    return isinstance(error, (aiohttp.ConnectionTimeoutError, aiohttp.ClientConnectorError))
+
+class AsyncBookClubAPI:
+    """
+    asyncio SDK for the Book Club API, mirroring BookClubAPI.
+
+    Every method is a coroutine with the same arguments, return values and
+    exceptions as its BookClubAPI counterpart, so it can be awaited from the
+    bot's event loop without blocking it.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        cache_maxsize: int = DEFAULT_CACHE_MAXSIZE,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        hedge: Optional[HedgePolicy] = None,
+        fast_json: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        batch_endpoints: bool = False,
+        metrics: Optional[MetricsRegistry] = None
+    ):
+        """
+        Initialize the async Book Club API client.
+
+        Args:
+            base_url: The base URL for the Supabase project (e.g., 'https://your-project.supabase.co')
+            api_key: The Supabase API key for authentication
+            pool_maxsize: Maximum number of kept-alive connections in the shared pool
+            timeout: Default timeout for every call, in seconds or as a (connect, read) tuple
+            cache_ttl: Seconds a club, member or session read is served from cache; 0 disables caching
+            cache_maxsize: Maximum number of cached reads
+            retry: Retry policy for failed calls; defaults to RetryPolicy()
+            breaker: Circuit breaker guarding every call; defaults to CircuitBreaker()
+            rate_limiter: Client-side limit on calls per second; defaults to RateLimiter()
+            hedge: Policy for hedging slow club, member and session reads; None disables hedging
+            fast_json: Decode responses with orjson, when installed, instead of the standard library
+            batch_size: Maximum number of items per batch request
+            batch_concurrency: Maximum number of requests a batch method runs at once
+            batch_endpoints: Whether the edge functions have batch endpoints (see api.batch);
+                if not, batch methods fan out to the single-item methods
+            metrics: Registry to record call latencies, sizes and errors in; defaults to a new one
+        """
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.functions_url = f"{self.base_url}/functions/v1"
+        self.headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        }
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.json_loads: Optional[Callable[[str], Any]] = fast_json_loads() if fast_json else None
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.cache = TTLCache(ttl=cache_ttl, maxsize=cache_maxsize)
+        self.inflight = AsyncSingleFlight()
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.hedge = hedge
+        self.batch_size = batch_size
+        self.batch_concurrency = batch_concurrency
+        self.batch_endpoints = batch_endpoints
+        self.metrics = APIMetrics(metrics or MetricsRegistry())
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared session, creating it on first use.
+
+        The session is created lazily so that it binds to the running event loop
+        rather than to whichever loop existed when the client was constructed.
+
+        Returns:
+            The shared aiohttp.ClientSession
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_maxsize)
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=_client_timeout(self.timeout)
+            )
+        return self.session
+
+    async def close(self) -> None:
+        """Close the underlying session and release its pooled connections."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Get the client's counters, grouped by component. See BookClubAPI.stats."""
+        return {
+            "cache": self.cache.stats(),
+            "singleflight": self.inflight.stats(),
+            "retry": {"retries": self.retry.retries},
+            "circuit_breaker": self.breaker.stats(),
+            "rate_limit": self.rate_limiter.stats(),
+            "hedging": self.hedge.stats() if self.hedge is not None else {},
+        }
+
+    def _json_options(self) -> Dict[str, Any]:
+        """Keyword arguments for ClientResponse.json selecting the fast decoder, if enabled."""
+        return {"loads": self.json_loads} if self.json_loads is not None else {}
+
+    async def _send(
+        self,
+        method: str,
+        resource_type: str,
+        resource_id: Optional[str] = None,
+        params: Optional[Dict] = None,
+        json: Optional[Dict] = None,
+        timeout: Optional[Timeout] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Mapping[str, str], Any]:
+        """
+        Send a request to an edge function through the shared session.
+
+        Retries, the circuit breaker and metrics behave as in BookClubAPI._send.
+
+        Args:
+            method: The HTTP verb (GET, POST, PUT, DELETE)
+            resource_type: The edge function to call, which is also the resource type (e.g., 'club')
+            resource_id: The ID of the resource, if applicable, used for error messages
+            params: Optional query string parameters
+            json: Optional JSON body
+            timeout: Optional per-call timeout, overriding the client default
+            headers: Optional extra headers for this call only
+
+        Returns:
+            Tuple of (status, response headers, decoded JSON body); the body is
+            None for a 304, which is never decoded
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+            DeadlineExceeded: If the current deadline runs out before the call completes
+            APIError: Or one of its subclasses, see error_for_status
+        """
+        url = f"{self.functions_url}/{resource_type}"
+
+        try:
+            attempt = 0
+            while True:
+                await self.rate_limiter.acquire_async(priority_for(method))
+                if not self.breaker.allow():
+                    self.metrics.error(resource_type, method, CircuitOpenError.__name__)
+                    raise CircuitOpenError(CIRCUIT_OPEN_MESSAGE)
+                cause = None
+                start = time.perf_counter()
+                try:
+                    async with self._get_session().request(
+                        method,
+                        url,
+                        params=params,
+                        json=json,
+                        headers=headers,
+                        timeout=_client_timeout(timeout_for(timeout if timeout is not None else self.timeout))
+                    ) as response:
+                        # The body is read before decoding, so that decode time is measured on its own
+                        body = await response.read()
+                        self.metrics.attempt(
+                            resource_type, method, str(response.status), time.perf_counter() - start,
+                            _request_size(response), body_size(body)
+                        )
+                        if response.status < 400:
+                            self.breaker.record_success()
+                            if response.status == 304:
+                                return response.status, response.headers, None
+                            decode_start = time.perf_counter()
+                            data = await response.json(content_type=None, **self._json_options())
+                            self.metrics.decoded(resource_type, time.perf_counter() - decode_start)
+                            return response.status, response.headers, data
+
+                        error = error_for_status(response.status, await response.text(), resource_type, resource_id)
+                        self.metrics.error(resource_type, method, type(error).__name__)
+                        if response.status < 500:
+                            self.breaker.record_success()  # The API is up, it just refused this call
+                        else:
+                            self.breaker.record_failure()
+                        if not self.retry.is_retryable_status(response.status):
+                            raise error
+                        delay = self.retry.delay(method, attempt, parse_retry_after(response.headers.get("Retry-After")))
+                except asyncio.TimeoutError as e:
+                    error_class = DeadlineExceeded if expired() else type(e)
+                    self.metrics.attempt(resource_type, method, error_class.__name__, time.perf_counter() - start)
+                    self.metrics.error(resource_type, method, error_class.__name__)
+                    if error_class is DeadlineExceeded:
+                        # Cut short by the deadline, not by the API being slow
+                        raise DeadlineExceeded("Deadline exceeded while waiting for the API") from e
+                    self.breaker.record_failure()
+                    error, cause = APIError(TIMEOUT_ERROR_MESSAGE), e
+                    delay = self.retry.delay(method, attempt, sent=not _never_sent(e))
+                except aiohttp.ClientConnectionError as e:
+                    self.metrics.attempt(resource_type, method, type(e).__name__, time.perf_counter() - start)
+                    self.metrics.error(resource_type, method, type(e).__name__)
+                    self.breaker.record_failure()
+                    error, cause = APIError(CONNECTION_ERROR_MESSAGE), e
+                    delay = self.retry.delay(method, attempt, sent=not _never_sent(e))
+                if delay is None:
+                    raise error from cause
+                await asyncio.sleep(delay)
+                attempt += 1
+        except aiohttp.ClientError as e:
+            raise APIError(f"Request failed: {str(e)}") from e
+        finally:
+            # A write that failed part-way may still have been applied, so always invalidate
+            if method != "GET":
+                self.cache.invalidate_for_write(resource_type, resource_id)
+
+    async def _timed_send(self, *args, **kwargs) -> Tuple[int, Mapping[str, str], Any]:
+        """Send a request with _send, recording its latency for the hedge policy if it succeeds."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await self._send(*args, **kwargs)
+        self.hedge.record(loop.time() - start)
+        return result
+
+    async def _hedged_send(self, *args, **kwargs) -> Tuple[int, Mapping[str, str], Any]:
+        """
+        Send an idempotent read, hedging it if it is slow. See BookClubAPI._hedged_send.
+
+        The losing attempt is cancelled, which aborts its request.
+        """
+        if self.hedge is None:
+            return await self._send(*args, **kwargs)
+        delay = self.hedge.start()
+        if delay is None:
+            return await self._timed_send(*args, **kwargs)
+
+        attempts = [asyncio.ensure_future(self._timed_send(*args, **kwargs))]
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if done or not self.hedge.allow_hedge():
+                return await attempts[0]
+
+            attempts.append(asyncio.ensure_future(self._timed_send(*args, **kwargs)))
+            pending, error = set(attempts), None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in attempts:
+                    if attempt in done and attempt.exception() is None:
+                        if attempt is attempts[1]:
+                            self.hedge.record_win()
+                        return attempt.result()
+                error = error or next(attempt.exception() for attempt in done)
+            raise error
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+    async def _request(
+        self,
+        method: str,
+        resource_type: str,
+        resource_id: Optional[str] = None,
+        params: Optional[Dict] = None,
+        json: Optional[Dict] = None,
+        timeout: Optional[Timeout] = None
+    ) -> Dict:
+        """Send a request to an edge function and return its decoded JSON response. See _send."""
+        _, _, data = await self._send(method, resource_type, resource_id, params=params, json=json, timeout=timeout)
+        return data
+
+    async def _cached_get(
+        self,
+        resource_type: str,
+        resource_id: str,
+        params: Dict,
+        model: Callable[[Dict], Any],
+        include: Optional[Iterable[str]] = None,
+        timeout: Optional[Timeout] = None
+    ) -> Any:
+        """Read a resource's model from cache, or through a coalesced conditional request. See BookClubAPI._cached_get."""
+        include = normalize_include(include)
+        key = (resource_type, resource_id, include) if include else (resource_type, resource_id)
+        if include:
+            params = dict(params, include=include_param(include))
+        cached = self.cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        async def fetch():
+            version = self.cache.version
+            stale = self.cache.peek(key)
+            try:
+                status, headers, data = await self._hedged_send(
+                    "GET", resource_type, resource_id,
+                    params=params, timeout=timeout, headers=conditional_headers(stale)
+                )
+            except CircuitOpenError:
+                if stale is None:
+                    raise
+                return self.cache.serve_stale(stale)
+            if status == 304 and stale is not None:
+                if self.cache.refresh(key, version=version) is not None:
+                    return stale.value
+                # Invalidated while revalidating, so the 304 does not vouch for it: read it whole
+                version = self.cache.version
+                status, headers, data = await self._hedged_send(
+                    "GET", resource_type, resource_id, params=params, timeout=timeout
+                )
+
+            data = model(data)
+            self.cache.set(
+                key, data, version=version,
+                etag=headers.get("ETag"),
+                last_modified=headers.get("Last-Modified")
+            )
+            return data
+
+        return await self.inflight.do(key, fetch)
+
+    # Club Methods
+    async def get_club(
+        self,
+        club_id: str,
+        include: Optional[Iterable[str]] = None,
+        timeout: Optional[Timeout] = None
+    ) -> Club:
+        """Get details for a specific club. See BookClubAPI.get_club."""
+        return await self._cached_get(
+            "club", club_id, params={"id": club_id}, model=Club.from_dict, include=include, timeout=timeout
+        )
+
+    async def get_club_changes(self, club_id: str, since: int, timeout: Optional[Timeout] = None) -> ClubDelta:
+        """Get what changed in a club since a version of it. See BookClubAPI.get_club_changes."""
+        return ClubDelta.from_dict(
+            await self._request("GET", "club", club_id, params={"id": club_id, "updated_since": since}, timeout=timeout)
+        )
+
+    async def create_club(self, club_data: Dict, timeout: Optional[Timeout] = None) -> Dict:
+        """Create a new club with all its associated data. See BookClubAPI.create_club."""
+        return await self._request("POST", "club", json=club_data, timeout=timeout)
+
+    async def update_club(self, club_id: str, data: Dict, timeout: Optional[Timeout] = None) -> Dict:
+        """Update a club. See BookClubAPI.update_club."""
+        return await self._request("PUT", "club", club_id, json={"id": club_id, **data}, timeout=timeout)
+
+    async def delete_club(self, club_id: str, timeout: Optional[Timeout] = None) -> Dict:
+        """Delete a club and all associated data. See BookClubAPI.delete_club."""
+        return await self._request("DELETE", "club", club_id, params={"id": club_id}, timeout=timeout)
+
+    # Member Methods
+    async def get_member(self, member_id: int, timeout: Optional[Timeout] = None) -> Member:
+        """Get details for a specific member. See BookClubAPI.get_member."""
+        return await self._cached_get("member", str(member_id), params={"id": member_id}, model=Member.from_dict, timeout=timeout)
+
+    async def create_member(self, member_data: Dict, timeout: Optional[Timeout] = None) -> Dict:
+        """Create a new member. See BookClubAPI.create_member."""
+        return await self._request("POST", "member", json=member_data, timeout=timeout)
+
+    async def update_member(self, member_id: int, update_data: Dict, timeout: Optional[Timeout] = None) -> Dict:
+        """Update member details. See BookClubAPI.update_member."""
+        return await self._request("PUT", "member", str(member_id), json={"id": member_id, **update_data}, timeout=timeout)
+
+    async def delete_member(self, member_id: int, timeout: Optional[Timeout] = None) -> Dict:
+        """Delete a member. See BookClubAPI.delete_member."""
+        return await self._request("DELETE", "member", str(member_id), params={"id": member_id}, timeout=timeout)
+
+    # Session Methods
+    async def get_session(
+        self,
+        session_id: str,
+        include: Optional[Iterable[str]] = None,
+        timeout: Optional[Timeout] = None
+    ) -> Session:
+        """Get details for a specific session. See BookClubAPI.get_session."""
+        return await self._cached_get(
+            "session", session_id, params={"id": session_id}, model=Session.from_dict, include=include, timeout=timeout
+        )
+
+    async def create_session(self, session_data: Dict, timeout: Optional[Timeout] = None) -> Dict:
+        """Create a new reading session. See BookClubAPI.create_session."""
+        return await self._request("POST", "session", json=session_data, timeout=timeout)
+
+    async def update_session(self, session_id: str, update_data: Dict, timeout: Optional[Timeout] = None) -> Dict:
+        """Update session details. See BookClubAPI.update_session."""
+        return await self._request("PUT", "session", session_id, json={"id": session_id, **update_data}, timeout=timeout)
+
+    async def delete_session(self, session_id: str, timeout: Optional[Timeout] = None) -> Dict:
+        """Delete a session. See BookClubAPI.delete_session."""
+        return await self._request("DELETE", "session", session_id, params={"id": session_id}, timeout=timeout)
+
+    # Batch Methods
+    async def _run_concurrently(self, keys: Sequence[Hashable], call: Callable[[Hashable], Awaitable[Any]]) -> BatchResult:
+        """Await a call for every key, at most batch_concurrency at a time. See BookClubAPI._run_concurrently."""
+        semaphore = asyncio.Semaphore(max(1, self.batch_concurrency))
+
+        async def bounded(key: Hashable) -> Any:
+            async with semaphore:
+                return await call(key)
+
+        with default_priority(BACKGROUND):
+            outcomes = await asyncio.gather(*(bounded(key) for key in keys), return_exceptions=True)
+        batch = BatchResult()
+        for key, outcome in zip(keys, outcomes):
+            if isinstance(outcome, APIError):
+                batch.errors[key] = outcome
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                batch.results[key] = outcome
+        return batch
+
+    async def _run_chunks(self, ids: Sequence[Hashable], call: Callable[[Sequence[Hashable]], Awaitable[BatchResult]]) -> BatchResult:
+        """Run a batch request per chunk of IDs concurrently. See BookClubAPI._run_chunks."""
+        chunks = list(chunked(list(ids), self.batch_size))
+        outcomes = await self._run_concurrently(range(len(chunks)), lambda index: call(chunks[index]))
+        batch = BatchResult()
+        for index, chunk in enumerate(chunks):
+            if index in outcomes.errors:
+                batch.errors.update((item_id, outcomes.errors[index]) for item_id in chunk)
+            else:
+                batch.results.update(outcomes.results[index].results)
+                batch.errors.update(outcomes.results[index].errors)
+        return batch
+
+    async def _batch_get(
+        self,
+        resource_type: str,
+        ids: Sequence[Hashable],
+        model: Callable[[Dict], Any],
+        timeout: Optional[Timeout] = None
+    ) -> BatchResult:
+        """Read many resources through the batch read endpoint. See BookClubAPI._batch_get."""
+        batch = BatchResult()
+        wanted = []
+        for resource_id in dict.fromkeys(ids):
+            cached = self.cache.get((resource_type, str(resource_id)))
+            if cached is MISSING:
+                wanted.append(resource_id)
+            else:
+                batch.results[resource_id] = cached
+
+        async def fetch(chunk: Sequence[Hashable]) -> BatchResult:
+            version = self.cache.version
+            data = await self._request(
+                "GET", resource_type, params={"ids": ",".join(str(resource_id) for resource_id in chunk)}, timeout=timeout
+            )
+            payloads = read_payloads(resource_type, data)
+            outcome = BatchResult()
+            for resource_id in chunk:
+                payload = payloads.get(str(resource_id))
+                if payload is None:
+                    outcome.errors[resource_id] = error_for_status(404, "", resource_type, str(resource_id))
+                    continue
+                outcome.results[resource_id] = model(payload)
+                self.cache.set((resource_type, str(resource_id)), outcome.results[resource_id], version=version)
+            return outcome
+
+        fetched = await self._run_chunks(wanted, fetch)
+        batch.results.update(fetched.results)
+        batch.errors.update(fetched.errors)
+        return batch
+
+    async def _batch_write(self, resource_type: str, items: Sequence[Dict], upsert: bool, timeout: Optional[Timeout] = None) -> BatchResult:
+        """Write many resources through the batch write endpoint. See BookClubAPI._batch_write."""
+        by_id = dict(zip(item_ids(items), items))
+
+        async def write(chunk: Sequence[Hashable]) -> BatchResult:
+            try:
+                data = await self._request(
+                    "PUT", resource_type,
+                    json={f"{resource_type}s": [by_id[item_id] for item_id in chunk], "upsert": upsert},
+                    timeout=timeout
+                )
+            finally:
+                # Batch writes don't name a single resource, so drop every cached one of the type
+                self.cache.invalidate(resource_type)
+            outcomes = write_outcomes(data)
+            outcome = BatchResult()
+            for item_id in chunk:
+                status, result = outcomes.get(str(item_id), (500, {"error": "No result returned for this item"}))
+                if status < 400:
+                    outcome.results[item_id] = result
+                else:
+                    outcome.errors[item_id] = error_for_status(status, result.get("error", ""), resource_type, str(item_id))
+            return outcome
+
+        return await self._run_chunks(list(by_id), write)
+
+    async def get_members(self, member_ids: Iterable[int], timeout: Optional[Timeout] = None) -> BatchResult:
+        """Get many members at once. See BookClubAPI.get_members."""
+        member_ids = list(member_ids)
+        if self.batch_endpoints:
+            return await self._batch_get("member", member_ids, Member.from_dict, timeout=timeout)
+        return await self._run_concurrently(
+            list(dict.fromkeys(member_ids)), lambda member_id: self.get_member(member_id, timeout=timeout)
+        )
+
+    async def get_clubs(self, club_ids: Iterable[str], timeout: Optional[Timeout] = None) -> BatchResult:
+        """Get many clubs at once. See BookClubAPI.get_clubs."""
+        club_ids = list(club_ids)
+        if self.batch_endpoints:
+            return await self._batch_get("club", club_ids, Club.from_dict, timeout=timeout)
+        return await self._run_concurrently(
+            list(dict.fromkeys(club_ids)), lambda club_id: self.get_club(club_id, timeout=timeout)
+        )
+
+    async def update_members(self, updates: Iterable[Dict], timeout: Optional[Timeout] = None) -> BatchResult:
+        """Update many members at once. See BookClubAPI.update_members."""
+        updates = list(updates)
+        if self.batch_endpoints:
+            return await self._batch_write("member", updates, upsert=False, timeout=timeout)
+        by_id = dict(zip(item_ids(updates), updates))
+        return await self._run_concurrently(
+            list(by_id),
+            lambda member_id: self.update_member(member_id, _without_id(by_id[member_id]), timeout=timeout)
+        )
+
+    async def upsert_members(self, members: Iterable[Dict], timeout: Optional[Timeout] = None) -> BatchResult:
+        """Create or update many members at once. See BookClubAPI.upsert_members."""
+        members = list(members)
+        if self.batch_endpoints:
+            return await self._batch_write("member", members, upsert=True, timeout=timeout)
+        by_id = dict(zip(item_ids(members), members))
+
+        async def upsert(member_id: int) -> Dict:
+            try:
+                return await self.update_member(member_id, _without_id(by_id[member_id]), timeout=timeout)
+            except ResourceNotFoundError:
+                return await self.create_member(by_id[member_id], timeout=timeout)
+
+        return await self._run_concurrently(list(by_id), upsert)
@@ -0,0 +1,92 @@
+# batch.py
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_BATCH_CONCURRENCY = 4
+
+# Batch endpoints, when the edge functions have them (see the clients' batch_endpoints option):
+#
+#   GET /{type}?ids=1,2,3         -> {"{type}s": [payload, ...]}; IDs left out were not found
+#   PUT /{type} {"{type}s": [...], "upsert": bool}
+#                                 -> {"results": [{"id": 1, "success": true},
+#                                                 {"id": 2, "status": 404, "error": "..."}]}
+#
+# Without them, batch methods fan out to the single-item methods instead.
+
+class BatchResult:
+    """Per-item outcome of a batch call: results and errors, both keyed by item ID."""
+    __slots__ = ("results", "errors")
+
+    def __init__(self):
+        self.results: Dict[Hashable, Any] = {}
+        self.errors: Dict[Hashable, Exception] = {}
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def __repr__(self) -> str:
+        return f"BatchResult(results={len(self.results)}, errors={len(self.errors)})"
+
+def chunked(items: Sequence, size: int) -> Iterator[Sequence]:
+    """
+    Split items into consecutive chunks.
+
+    Args:
+        items: The items to split
+        size: Maximum number of items per chunk
+
+    Returns:
+        Iterator over the chunks
+    """
+    for start in range(0, len(items), max(1, size)):
+        yield items[start:start + size]
+
+def item_ids(items: Iterable[Dict]) -> List[Hashable]:
+    """
+    Get the IDs of the items of a batch write.
+
+    Args:
+        items: The items, each a dict with an 'id'
+
+    Returns:
+        The IDs, in order
+
+    Raises:
+        ValueError: If an item has no ID, since results are keyed by it
+    """
+    ids = []
+    for item in items:
+        if item.get("id") is None:
+            raise ValueError("Every item of a batch write needs an 'id'")
+        ids.append(item["id"])
+    return ids
+
+def read_payloads(resource_type: str, data: Optional[Dict]) -> Dict[str, Dict]:
+    """
+    Index the payloads returned by a batch read by ID.
+
+    Args:
+        resource_type: The type of resource read (e.g., 'member')
+        data: The decoded batch response
+
+    Returns:
+        Dict of payload by stringified ID
+    """
+    return {str(payload.get("id")): payload for payload in (data or {}).get(f"{resource_type}s") or ()}
+
+def write_outcomes(data: Optional[Dict]) -> Dict[str, Tuple[int, Dict]]:
+    """
+    Index the per-item outcomes returned by a batch write by ID.
+
+    Args:
+        data: The decoded batch response
+
+    Returns:
+        Dict of (status, outcome) by stringified ID, where status is 200 for a success
+    """
+    outcomes = {}
+    for outcome in (data or {}).get("results") or ():
+        status = 200 if outcome.get("success") else outcome.get("status", 500)
+        outcomes[str(outcome.get("id"))] = (status, outcome)
+    return outcomes
@@ -1,7 +1,40 @@
 # bookclub_api.py
+import contextvars
 import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 import requests
-from typing import Dict, List, Optional, Union, Any
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union, Any
+
+from .batch import (
+    DEFAULT_BATCH_CONCURRENCY,
+    DEFAULT_BATCH_SIZE,
+    BatchResult,
+    chunked,
+    item_ids,
+    read_payloads,
+    write_outcomes,
+)
+from .delta import ClubDelta
+from .hedging import HedgePolicy
+from .metrics import APIMetrics, MetricsRegistry, body_size
+from .models import Club, Member, Session, fast_json_loads
+from .projection import include_param, normalize_include
+from .cache import DEFAULT_CACHE_MAXSIZE, DEFAULT_CACHE_TTL, MISSING, TTLCache, conditional_headers
+from .rate_limit import BACKGROUND, RateLimiter, default_priority, priority_for
+from .resilience import CircuitBreaker, RetryPolicy, parse_retry_after
+from .singleflight import SingleFlight
+from utils.deadline import DeadlineExceeded, expired, timeout_for
+
+# A timeout is either a single number of seconds or a (connect, read) tuple,
+# exactly as accepted by requests.
+Timeout = Union[float, Tuple[float, float]]
+
+DEFAULT_TIMEOUT: Timeout = (3.05, 10)
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 10
 
 class APIError(Exception):
     """Raised when there's an error communicating with the API."""
@@ -19,16 +52,110 @@ class AuthenticationError(APIError):
     """Raised when there's an authentication issue."""
     pass
 
+class CircuitOpenError(APIError):
+    """Raised without calling the API while the circuit breaker is open."""
+    pass
+
+CONNECTION_ERROR_MESSAGE = (
+    "Connection error: Could not connect to the API. "
+    "Check if the server is running and the URL is correct."
+)
+TIMEOUT_ERROR_MESSAGE = "Connection error: The API did not respond in time."
+CIRCUIT_OPEN_MESSAGE = "Connection error: The API is failing, so calls are paused for a moment."
+
+def error_for_status(status_code: int, error_text: str, resource_type: str, resource_id: Optional[str] = None) -> APIError:
+    """
+    Build the custom exception matching an HTTP error status.
+    
+    Shared by the sync and async clients so both surface the same hierarchy.
+    
+    Args:
+        status_code: The HTTP status code of the failed response
+        error_text: The body of the failed response
+        resource_type: The type of resource being accessed (e.g., 'club', 'member')
+        resource_id: The ID of the resource, if applicable
+        
+    Returns:
+        ResourceNotFoundError: If the resource was not found (404)
+        ValidationError: If the request was invalid (400)
+        AuthenticationError: If there was an authentication issue (401, 403)
+        APIError: For other API errors
+    """
+    if status_code == 404:
+        id_info = f" with ID '{resource_id}'" if resource_id else ""
+        return ResourceNotFoundError(
+            f"{resource_type.capitalize()}{id_info} not found. "
+            f"Check if it exists in this environment."
+        )
+    
+    elif status_code == 400:
+        return ValidationError(f"Invalid request: {error_text}")
+    
+    elif status_code in (401, 403):
+        return AuthenticationError(f"Authentication error: {error_text}")
+    
+    else:
+        return APIError(f"API error ({status_code}): {error_text}")
+
+def _without_id(item: Dict) -> Dict:
+    """Copy an item without its 'id', which the single-item methods take separately."""
+    return {key: value for key, value in item.items() if key != "id"}
+
+def _close_response(future: Future) -> None:
+    """Release the connection of a hedged attempt that lost, once it answers."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+def _never_sent(error: requests.exceptions.RequestException) -> bool:
+    """Tell whether a request failed before its connection was opened, so the server cannot have seen it."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)  # Refused, unreachable or not resolved
+
 class BookClubAPI:
     """SDK for interacting with Book Club API powered by Supabase Edge Functions."""
     
-    def __init__(self, base_url: str, api_key: str):
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        cache_maxsize: int = DEFAULT_CACHE_MAXSIZE,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        hedge: Optional[HedgePolicy] = None,
+        fast_json: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        batch_endpoints: bool = False,
+        metrics: Optional[MetricsRegistry] = None
+    ):
         """
         Initialize the Book Club API client.
         
         Args:
             base_url: The base URL for the Supabase project (e.g., 'https://your-project.supabase.co')
             api_key: The Supabase API key for authentication
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum number of kept-alive connections per pool
+            timeout: Default timeout for every call, in seconds or as a (connect, read) tuple
+            cache_ttl: Seconds a club, member or session read is served from cache; 0 disables caching
+            cache_maxsize: Maximum number of cached reads
+            retry: Retry policy for failed calls; defaults to RetryPolicy()
+            breaker: Circuit breaker guarding every call; defaults to CircuitBreaker()
+            rate_limiter: Client-side limit on calls per second; defaults to RateLimiter()
+            hedge: Policy for hedging slow club, member and session reads; None disables hedging
+            fast_json: Decode responses with orjson, when installed, instead of the standard library
+            batch_size: Maximum number of items per batch request
+            batch_concurrency: Maximum number of requests a batch method runs at once
+            batch_endpoints: Whether the edge functions have batch endpoints (see api.batch);
+                if not, batch methods fan out to the single-item methods
+            metrics: Registry to record call latencies, sizes and errors in; defaults to a new one
         """
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
@@ -37,6 +164,322 @@ class BookClubAPI:
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}"
         }
+        self.timeout = timeout
+        self.json_loads: Optional[Callable[[bytes], Any]] = fast_json_loads() if fast_json else None
+        self.session = self._create_session(pool_connections, pool_maxsize)
+        self.cache = TTLCache(ttl=cache_ttl, maxsize=cache_maxsize)
+        self.inflight = SingleFlight()
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.hedge = hedge
+        # Hedged reads run in worker threads, so that a second attempt can start while the first is pending
+        self._hedge_pool = ThreadPoolExecutor(max_workers=pool_maxsize) if hedge is not None else None
+        self.batch_size = batch_size
+        self.batch_concurrency = batch_concurrency
+        self.batch_endpoints = batch_endpoints
+        self.metrics = APIMetrics(metrics or MetricsRegistry())
+    
+    def _create_session(self, pool_connections: int, pool_maxsize: int) -> requests.Session:
+        """
+        Create the pooled, keep-alive HTTP session shared by every call.
+        
+        Args:
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum number of kept-alive connections per pool
+            
+        Returns:
+            A configured requests.Session
+        """
+        session = requests.Session()
+        session.headers.update(self.headers)
+        session.headers["Connection"] = "keep-alive"
+        
+        # Retries are not handled at the transport level, so that every failure
+        # surfaces through _handle_request_error.
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    def close(self) -> None:
+        """Close the underlying session and release its pooled connections."""
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False)
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get the client's counters.
+        
+        Returns:
+            Dict of counters grouped by component (e.g., 'cache', 'circuit_breaker')
+        """
+        return {
+            "cache": self.cache.stats(),
+            "singleflight": self.inflight.stats(),
+            "retry": {"retries": self.retry.retries},
+            "circuit_breaker": self.breaker.stats(),
+            "rate_limit": self.rate_limiter.stats(),
+            "hedging": self.hedge.stats() if self.hedge is not None else {},
+        }
+    
+    def _send(
+        self,
+        method: str,
+        resource_type: str,
+        resource_id: Optional[str] = None,
+        params: Optional[Dict] = None,
+        json: Optional[Dict] = None,
+        timeout: Optional[Timeout] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> requests.Response:
+        """
+        Send a request to an edge function through the shared session.
+        
+        Reads that fail at the connection level or with a retryable
+        status are retried with jittered backoff, honoring Retry-After. Other
+        calls are retried only if the connection could not even be opened. Every
+        attempt waits for the rate limiter, interactive reads ahead of background
+        work, then goes through the circuit breaker, which fails fast while open.
+        
+        Under a deadline (see utils.deadline), every attempt's timeout is capped
+        at the time left, and no retry is attempted that would outlive it.
+        
+        Every attempt's latency, status and body sizes are recorded in
+        self.metrics, along with the class of its error if it failed.
+        
+        Args:
+            method: The HTTP verb (GET, POST, PUT, DELETE)
+            resource_type: The edge function to call, which is also the resource type (e.g., 'club')
+            resource_id: The ID of the resource, if applicable, used for error messages
+            params: Optional query string parameters
+            json: Optional JSON body
+            timeout: Optional per-call timeout, overriding the client default
+            headers: Optional extra headers for this call only
+            
+        Returns:
+            The successful (2xx or 304) response, not yet decoded
+            
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+            DeadlineExceeded: If the current deadline runs out before the call completes
+            APIError: Or one of its subclasses, see _handle_request_error
+        """
+        url = f"{self.functions_url}/{resource_type}"
+        
+        try:
+            attempt = 0
+            while True:
+                self.rate_limiter.acquire(priority_for(method))
+                if not self.breaker.allow():
+                    self.metrics.error(resource_type, method, CircuitOpenError.__name__)
+                    raise CircuitOpenError(CIRCUIT_OPEN_MESSAGE)
+                start = time.perf_counter()
+                try:
+                    response = self.session.request(
+                        method,
+                        url,
+                        params=params,
+                        json=json,
+                        headers=headers,
+                        timeout=timeout_for(timeout if timeout is not None else self.timeout)
+                    )
+                    self.metrics.attempt(
+                        resource_type, method, str(response.status_code), time.perf_counter() - start,
+                        body_size(response.request.body), body_size(response.content)
+                    )
+                    response.raise_for_status()
+                    self.breaker.record_success()
+                    return response
+                except requests.exceptions.HTTPError as e:
+                    status_code = e.response.status_code
+                    self.metrics.error(resource_type, method, type(error_for_status(status_code, "", resource_type)).__name__)
+                    if status_code < 500:
+                        self.breaker.record_success()  # The API is up, it just refused this call
+                    else:
+                        self.breaker.record_failure()
+                    if not self.retry.is_retryable_status(status_code):
+                        raise
+                    delay = self.retry.delay(method, attempt, parse_retry_after(e.response.headers.get("Retry-After")))
+                    if delay is None:
+                        raise
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    error_class = DeadlineExceeded if isinstance(e, requests.exceptions.Timeout) and expired() else type(e)
+                    self.metrics.attempt(resource_type, method, error_class.__name__, time.perf_counter() - start)
+                    self.metrics.error(resource_type, method, error_class.__name__)
+                    if error_class is DeadlineExceeded:
+                        # Cut short by the deadline, not by the API being slow
+                        raise DeadlineExceeded("Deadline exceeded while waiting for the API") from e
+                    self.breaker.record_failure()
+                    delay = self.retry.delay(method, attempt, sent=not _never_sent(e))
+                    if delay is None:
+                        raise
+                time.sleep(delay)
+                attempt += 1
+        except requests.exceptions.RequestException as e:
+            self._handle_request_error(e, resource_type, resource_id)
+        finally:
+            # A write that failed part-way may still have been applied, so always invalidate
+            if method != "GET":
+                self.cache.invalidate_for_write(resource_type, resource_id)
+    
+    def _timed_send(self, *args, **kwargs) -> requests.Response:
+        """Send a request with _send, recording its latency for the hedge policy if it succeeds."""
+        start = time.monotonic()
+        response = self._send(*args, **kwargs)
+        self.hedge.record(time.monotonic() - start)
+        return response
+    
+    def _hedged_send(self, *args, **kwargs) -> requests.Response:
+        """
+        Send an idempotent read, hedging it if it is slow.
+        
+        If the read has not answered within the hedge policy's delay, a second
+        attempt is sent and whichever succeeds first is returned. requests cannot
+        abort a call in flight, so the loser's connection is released as soon as
+        it answers.
+        
+        Args:
+            See _send
+            
+        Returns:
+            The first successful response
+            
+        Raises:
+            The error of the first attempt to fail, if both fail; see _send
+        """
+        if self.hedge is None:
+            return self._send(*args, **kwargs)
+        delay = self.hedge.start()
+        if delay is None:
+            return self._timed_send(*args, **kwargs)
+        
+        first = self._hedge_pool.submit(contextvars.copy_context().run, self._timed_send, *args, **kwargs)
+        done, _ = wait([first], timeout=delay)
+        if done or not self.hedge.allow_hedge():
+            return first.result()
+        
+        second = self._hedge_pool.submit(contextvars.copy_context().run, self._timed_send, *args, **kwargs)
+        pending, error = {first, second}, None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for attempt in (first, second):
+                if attempt in done and attempt.exception() is None:
+                    if attempt is second:
+                        self.hedge.record_win()
+                    loser = second if attempt is first else first
+                    loser.add_done_callback(_close_response)
+                    return attempt.result()
+            error = error or next(attempt.exception() for attempt in done)
+        raise error
+    
+    def _request(
+        self,
+        method: str,
+        resource_type: str,
+        resource_id: Optional[str] = None,
+        params: Optional[Dict] = None,
+        json: Optional[Dict] = None,
+        timeout: Optional[Timeout] = None
+    ) -> Dict:
+        """
+        Send a request to an edge function and decode its JSON response.
+        
+        Args:
+            See _send
+            
+        Returns:
+            The decoded JSON response
+            
+        Raises:
+            APIError: Or one of its subclasses, see _handle_request_error
+        """
+        response = self._send(method, resource_type, resource_id, params=params, json=json, timeout=timeout)
+        return self._decode(response, resource_type)
+    
+    def _decode(self, response: requests.Response, resource_type: str) -> Any:
+        """Decode a JSON response body, with the fast decoder if enabled, recording the time it took."""
+        start = time.perf_counter()
+        data = self.json_loads(response.content) if self.json_loads is not None else response.json()
+        self.metrics.decoded(resource_type, time.perf_counter() - start)
+        return data
+    
+    def _cached_get(
+        self,
+        resource_type: str,
+        resource_id: str,
+        params: Dict,
+        model: Callable[[Dict], Any],
+        include: Optional[Iterable[str]] = None,
+        timeout: Optional[Timeout] = None
+    ) -> Any:
+        """
+        Read a resource, serving it from cache while it is fresh.
+        
+        The response is decoded into its model once, and that model is what is
+        cached. On a miss, concurrent reads of the same resource share one upstream
+        request and one decoded result. If an expired entry has validators, the
+        request is conditional, and a 304 revalidates the cached object without
+        downloading or decoding the body again; if the entry was invalidated while
+        it was revalidated, it is read again in full instead. While the circuit
+        breaker is open, an expired entry is served rather than failing. A
+        projected read (see include) is cached separately from the full resource,
+        and is invalidated along with it.
+        
+        Args:
+            resource_type: The edge function to call, which is also the resource type (e.g., 'club')
+            resource_id: The ID of the resource
+            params: Query string parameters
+            model: Builds the resource's model from the decoded JSON (e.g., Club.from_dict)
+            include: Optional dotted field paths to fetch instead of the whole resource
+            timeout: Optional per-call timeout, overriding the client default
+            
+        Returns:
+            The resource's model, possibly from cache
+        """
+        include = normalize_include(include)
+        key = (resource_type, resource_id, include) if include else (resource_type, resource_id)
+        if include:
+            params = dict(params, include=include_param(include))
+        cached = self.cache.get(key)
+        if cached is not MISSING:
+            return cached
+        
+        def fetch():
+            version = self.cache.version
+            stale = self.cache.peek(key)
+            try:
+                response = self._hedged_send(
+                    "GET", resource_type, resource_id,
+                    params=params, timeout=timeout, headers=conditional_headers(stale)
+                )
+            except CircuitOpenError:
+                if stale is None:
+                    raise
+                return self.cache.serve_stale(stale)
+            if response.status_code == 304 and stale is not None:
+                if self.cache.refresh(key, version=version) is not None:
+                    return stale.value
+                # Invalidated while revalidating, so the 304 does not vouch for it: read it whole
+                version = self.cache.version
+                response = self._hedged_send("GET", resource_type, resource_id, params=params, timeout=timeout)
+            
+            data = model(self._decode(response, resource_type))
+            self.cache.set(
+                key, data, version=version,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified")
+            )
+            return data
+        
+        return self.inflight.do(key, fetch)
     
     def _handle_request_error(self, error: requests.exceptions.RequestException, resource_type: str, resource_id: Optional[str] = None) -> None:
         """
@@ -54,59 +497,73 @@ class BookClubAPI:
             APIError: For other API errors
         """
         if isinstance(error, requests.exceptions.HTTPError):
-            status_code = error.response.status_code
-            error_text = error.response.text
-            
-            if status_code == 404:
-                id_info = f" with ID '{resource_id}'" if resource_id else ""
-                raise ResourceNotFoundError(
-                    f"{resource_type.capitalize()}{id_info} not found. "
-                    f"Check if it exists in this environment."
-                ) from error
-            
-            elif status_code == 400:
-                raise ValidationError(f"Invalid request: {error_text}") from error
-            
-            elif status_code in (401, 403):
-                raise AuthenticationError(f"Authentication error: {error_text}") from error
-            
-            else:
-                raise APIError(f"API error ({status_code}): {error_text}") from error
+            raise error_for_status(
+                error.response.status_code, error.response.text, resource_type, resource_id
+            ) from error
+        
+        elif isinstance(error, requests.exceptions.Timeout):
+            raise APIError(TIMEOUT_ERROR_MESSAGE) from error
         
         elif isinstance(error, requests.exceptions.ConnectionError):
-            raise APIError(f"Connection error: Could not connect to the API. "
-                          f"Check if the server is running and the URL is correct.") from error
+            raise APIError(CONNECTION_ERROR_MESSAGE) from error
         
         else:
             raise APIError(f"Request failed: {str(error)}") from error
     
     # Club Methods
-    def get_club(self, club_id: str) -> Dict:
+    def get_club(
+        self,
+        club_id: str,
+        include: Optional[Iterable[str]] = None,
+        timeout: Optional[Timeout] = None
+    ) -> Club:
         """
         Get details for a specific club.
         
         Args:
             club_id: The ID of the club to retrieve
+            include: Optional dotted field paths to fetch instead of the whole club,
+                e.g. ['active_session.book']; fields left out get their model defaults
+            timeout: Optional per-call timeout, overriding the client default
             
         Returns:
-            Dict containing club details including members and active session
+            Club with its members, active session and past sessions
             
         Raises:
             ResourceNotFoundError: If the club doesn't exist
             AuthenticationError: If there's an authentication issue
             APIError: For other API errors
         """
-        url = f"{self.functions_url}/club"
-        params = {"id": club_id}
+        return self._cached_get(
+            "club", club_id, params={"id": club_id}, model=Club.from_dict, include=include, timeout=timeout
+        )
+    
+    def get_club_changes(self, club_id: str, since: int, timeout: Optional[Timeout] = None) -> ClubDelta:
+        """
+        Get what changed in a club since a version of it, from the club change feed.
         
-        try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            self._handle_request_error(e, "club", club_id)
+        Never cached. See api/delta.py for the feed's format and ClubSync for
+        keeping a club up to date with it.
+        
+        Args:
+            club_id: The ID of the club
+            since: The version the caller has, i.e. the version of its last read
+            timeout: Optional per-call timeout, overriding the client default
+            
+        Returns:
+            ClubDelta with the changed and deleted members, sessions and discussions,
+            or with resync set if the club must be read whole again
+            
+        Raises:
+            ResourceNotFoundError: If the club doesn't exist
+            AuthenticationError: If there's an authentication issue
+            APIError: For other API errors
+        """
+        return ClubDelta.from_dict(
+            self._request("GET", "club", club_id, params={"id": club_id, "updated_since": since}, timeout=timeout)
+        )
     
-    def create_club(self, club_data: Dict) -> Dict:
+    def create_club(self, club_data: Dict, timeout: Optional[Timeout] = None) -> Dict:
         """
         Create a new club with all its associated data.
         
@@ -128,6 +585,7 @@ class BookClubAPI:
                         "due_date": "2023-12-31"
                     }
                 }
+            timeout: Optional per-call timeout, overriding the client default
             
         Returns:
             Dict containing success status and message
@@ -137,16 +595,9 @@ class BookClubAPI:
             AuthenticationError: If there's an authentication issue
             APIError: For other API errors
         """
-        url = f"{self.functions_url}/club"
-        
-        try:
-            response = requests.post(url, headers=self.headers, json=club_data)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            self._handle_request_error(e, "club")
+        return self._request("POST", "club", json=club_data, timeout=timeout)
     
-    def update_club(self, club_id: str, data: Dict) -> Dict:
+    def update_club(self, club_id: str, data: Dict, timeout: Optional[Timeout] = None) -> Dict:
         """
         Update a club.
         
@@ -159,6 +610,7 @@ class BookClubAPI:
                     "discord_channel": 987654321098765432,  # Optional
                     "shame_list": [1, 2, 3]  # Optional - list of member IDs
                 }
+            timeout: Optional per-call timeout, overriding the client default
             
         Returns:
             Dict containing success status and message
@@ -169,22 +621,15 @@ class BookClubAPI:
             AuthenticationError: If there's an authentication issue
             APIError: For other API errors
         """
-        url = f"{self.functions_url}/club"
-        update_data = {"id": club_id, **data}
-        
-        try:
-            response = requests.put(url, headers=self.headers, json=update_data)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            self._handle_request_error(e, "club", club_id)
+        return self._request("PUT", "club", club_id, json={"id": club_id, **data}, timeout=timeout)
     
-    def delete_club(self, club_id: str) -> Dict:
+    def delete_club(self, club_id: str, timeout: Optional[Timeout] = None) -> Dict:
         """
         Delete a club and all associated data.
         
         Args:
             club_id: The ID of the club to delete
+            timeout: Optional per-call timeout, overriding the client default
             
         Returns:
             Dict containing success status and message
@@ -194,43 +639,28 @@ class BookClubAPI:
             AuthenticationError: If there's an authentication issue
             APIError: For other API errors
         """
-        url = f"{self.functions_url}/club"
-        params = {"id": club_id}
-        
-        try:
-            response = requests.delete(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            self._handle_request_error(e, "club", club_id)
+        return self._request("DELETE", "club", club_id, params={"id": club_id}, timeout=timeout)
     
     # Member Methods
-    def get_member(self, member_id: int) -> Dict:
+    def get_member(self, member_id: int, timeout: Optional[Timeout] = None) -> Member:
         """
         Get details for a specific member.
         
         Args:
             member_id: The ID of the member to retrieve
+            timeout: Optional per-call timeout, overriding the client default
             
         Returns:
-            Dict containing member details including clubs and shame_clubs
+            Member with their clubs and shame_clubs
             
         Raises:
             ResourceNotFoundError: If the member doesn't exist
             AuthenticationError: If there's an authentication issue
             APIError: For other API errors
         """
-        url = f"{self.functions_url}/member"
-        params = {"id": member_id}
-        
-        try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            self._handle_request_error(e, "member", str(member_id))
+        return self._cached_get("member", str(member_id), params={"id": member_id}, model=Member.from_dict, timeout=timeout)
     
-    def create_member(self, member_data: Dict) -> Dict:
+    def create_member(self, member_data: Dict, timeout: Optional[Timeout] = None) -> Dict:
         """
         Create a new member.
         
@@ -243,6 +673,7 @@ class BookClubAPI:
                     "books_read": 0,  # Optional
                     "clubs": ["club-id-1", "club-id-2"]  # Optional - list of club IDs
                 }
+            timeout: Optional per-call timeout, overriding the client default
             
         Returns:
             Dict containing success status and message
@@ -252,16 +683,9 @@ class BookClubAPI:
             AuthenticationError: If there's an authentication issue
             APIError: For other API errors
         """
-        url = f"{self.functions_url}/member"
-        
-        try:
-            response = requests.post(url, headers=self.headers, json=member_data)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            self._handle_request_error(e, "member")
+        return self._request("POST", "member", json=member_data, timeout=timeout)
     
-    def update_member(self, member_id: int, update_data: Dict) -> Dict:
+    def update_member(self, member_id: int, update_data: Dict, timeout: Optional[Timeout] = None) -> Dict:
         """
         Update member details.
         
@@ -275,6 +699,7 @@ class BookClubAPI:
                     "books_read": 5,  # Optional
                     "clubs": ["club-id-1", "club-id-3"]  # Optional - complete list of club IDs
                 }
+            timeout: Optional per-call timeout, overriding the client default
             
         Returns:
             Dict containing success status and message
@@ -285,22 +710,15 @@ class BookClubAPI:
             AuthenticationError: If there's an authentication issue
             APIError: For other API errors
         """
-        url = f"{self.functions_url}/member"
-        data = {"id": member_id, **update_data}
-        
-        try:
-            response = requests.put(url, headers=self.headers, json=data)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            self._handle_request_error(e, "member", str(member_id))
+        return self._request("PUT", "member", str(member_id), json={"id": member_id, **update_data}, timeout=timeout)
     
-    def delete_member(self, member_id: int) -> Dict:
+    def delete_member(self, member_id: int, timeout: Optional[Timeout] = None) -> Dict:
         """
         Delete a member.
         
         Args:
             member_id: The ID of the member to delete
+            timeout: Optional per-call timeout, overriding the client default
             
         Returns:
             Dict containing success status and message
@@ -310,43 +728,37 @@ class BookClubAPI:
             AuthenticationError: If there's an authentication issue
             APIError: For other API errors
         """
-        url = f"{self.functions_url}/member"
-        params = {"id": member_id}
-        
-        try:
-            response = requests.delete(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            self._handle_request_error(e, "member", str(member_id))
+        return self._request("DELETE", "member", str(member_id), params={"id": member_id}, timeout=timeout)
     
     # Session Methods
-    def get_session(self, session_id: str) -> Dict:
+    def get_session(
+        self,
+        session_id: str,
+        include: Optional[Iterable[str]] = None,
+        timeout: Optional[Timeout] = None
+    ) -> Session:
         """
         Get details for a specific session.
         
         Args:
             session_id: The ID of the session to retrieve
+            include: Optional dotted field paths to fetch instead of the whole session,
+                e.g. ['book'] or ['discussions']; fields left out get their model defaults
+            timeout: Optional per-call timeout, overriding the client default
             
         Returns:
-            Dict containing session details including book, club info, and discussions
+            Session with its book, club and discussions
             
         Raises:
             ResourceNotFoundError: If the session doesn't exist
             AuthenticationError: If there's an authentication issue
             APIError: For other API errors
         """
-        url = f"{self.functions_url}/session"
-        params = {"id": session_id}
-        
-        try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            self._handle_request_error(e, "session", session_id)
+        return self._cached_get(
+            "session", session_id, params={"id": session_id}, model=Session.from_dict, include=include, timeout=timeout
+        )
     
-    def create_session(self, session_data: Dict) -> Dict:
+    def create_session(self, session_data: Dict, timeout: Optional[Timeout] = None) -> Dict:
         """
         Create a new reading session.
         
@@ -369,6 +781,7 @@ class BookClubAPI:
                         }
                     ]
                 }
+            timeout: Optional per-call timeout, overriding the client default
             
         Returns:
             Dict containing success status and message
@@ -378,16 +791,9 @@ class BookClubAPI:
             AuthenticationError: If there's an authentication issue
             APIError: For other API errors
         """
-        url = f"{self.functions_url}/session"
-        
-        try:
-            response = requests.post(url, headers=self.headers, json=session_data)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            self._handle_request_error(e, "session")
+        return self._request("POST", "session", json=session_data, timeout=timeout)
     
-    def update_session(self, session_id: str, update_data: Dict) -> Dict:
+    def update_session(self, session_id: str, update_data: Dict, timeout: Optional[Timeout] = None) -> Dict:
         """
         Update session details.
         
@@ -419,6 +825,7 @@ class BookClubAPI:
                     ],
                     "discussion_ids_to_delete": ["discussion-id-1"]  # Optional
                 }
+            timeout: Optional per-call timeout, overriding the client default
             
         Returns:
             Dict containing success status and message
@@ -429,22 +836,15 @@ class BookClubAPI:
             AuthenticationError: If there's an authentication issue
             APIError: For other API errors
         """
-        url = f"{self.functions_url}/session"
-        data = {"id": session_id, **update_data}
-        
-        try:
-            response = requests.put(url, headers=self.headers, json=data)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            self._handle_request_error(e, "session", session_id)
+        return self._request("PUT", "session", session_id, json={"id": session_id, **update_data}, timeout=timeout)
 
-    def delete_session(self, session_id: str) -> Dict:
+    def delete_session(self, session_id: str, timeout: Optional[Timeout] = None) -> Dict:
         """
         Delete a session.
         
         Args:
             session_id: The ID of the session to delete
+            timeout: Optional per-call timeout, overriding the client default
             
         Returns:
             Dict containing success status and message
@@ -454,15 +854,225 @@ class BookClubAPI:
             AuthenticationError: If there's an authentication issue
             APIError: For other API errors
         """
-        url = f"{self.functions_url}/session"
-        params = {"id": session_id}
+        return self._request("DELETE", "session", session_id, params={"id": session_id}, timeout=timeout)
+    
+    # Batch Methods
+    def _run_concurrently(self, keys: Sequence[Hashable], call: Callable[[Hashable], Any]) -> BatchResult:
+        """
+        Call a function for every key, at most batch_concurrency at a time.
         
-        try:
-            response = requests.delete(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            self._handle_request_error(e, "session", session_id)
+        Calls run in worker threads, each in a copy of the caller's context so
+        that the current deadline (see utils.deadline) applies to them too. They
+        are rate limited as background calls, unless the caller set a priority.
+        
+        Args:
+            keys: The keys to call the function for
+            call: Returns the result for one key, or raises APIError
+            
+        Returns:
+            BatchResult with each key's result or error
+        """
+        batch = BatchResult()
+        with default_priority(BACKGROUND), ThreadPoolExecutor(max_workers=max(1, self.batch_concurrency)) as pool:
+            futures = {key: pool.submit(contextvars.copy_context().run, call, key) for key in keys}
+            for key, future in futures.items():
+                try:
+                    batch.results[key] = future.result()
+                except APIError as e:
+                    batch.errors[key] = e
+        return batch
+    
+    def _run_chunks(self, ids: Sequence[Hashable], call: Callable[[Sequence[Hashable]], BatchResult]) -> BatchResult:
+        """
+        Split IDs into chunks of batch_size and run a batch request per chunk concurrently.
+        
+        Args:
+            ids: The IDs of the items
+            call: Runs the batch request for one chunk, returning its per-item outcome
+            
+        Returns:
+            BatchResult merging every chunk; a chunk that failed as a whole fails each of its items
+        """
+        chunks = list(chunked(list(ids), self.batch_size))
+        outcomes = self._run_concurrently(range(len(chunks)), lambda index: call(chunks[index]))
+        batch = BatchResult()
+        for index, chunk in enumerate(chunks):
+            if index in outcomes.errors:
+                batch.errors.update((item_id, outcomes.errors[index]) for item_id in chunk)
+            else:
+                batch.results.update(outcomes.results[index].results)
+                batch.errors.update(outcomes.results[index].errors)
+        return batch
+    
+    def _batch_get(
+        self,
+        resource_type: str,
+        ids: Sequence[Hashable],
+        model: Callable[[Dict], Any],
+        timeout: Optional[Timeout] = None
+    ) -> BatchResult:
+        """
+        Read many resources through the batch read endpoint, serving fresh ones from cache.
+        
+        Args:
+            resource_type: The type of resource to read (e.g., 'member')
+            ids: The IDs of the resources
+            model: Builds a resource's model from its payload
+            timeout: Optional per-call timeout, overriding the client default
+            
+        Returns:
+            BatchResult of models by ID; missing resources fail with ResourceNotFoundError
+        """
+        batch = BatchResult()
+        wanted = []
+        for resource_id in dict.fromkeys(ids):
+            cached = self.cache.get((resource_type, str(resource_id)))
+            if cached is MISSING:
+                wanted.append(resource_id)
+            else:
+                batch.results[resource_id] = cached
+        
+        def fetch(chunk: Sequence[Hashable]) -> BatchResult:
+            version = self.cache.version
+            data = self._request(
+                "GET", resource_type, params={"ids": ",".join(str(resource_id) for resource_id in chunk)}, timeout=timeout
+            )
+            payloads = read_payloads(resource_type, data)
+            outcome = BatchResult()
+            for resource_id in chunk:
+                payload = payloads.get(str(resource_id))
+                if payload is None:
+                    outcome.errors[resource_id] = error_for_status(404, "", resource_type, str(resource_id))
+                    continue
+                outcome.results[resource_id] = model(payload)
+                self.cache.set((resource_type, str(resource_id)), outcome.results[resource_id], version=version)
+            return outcome
+        
+        fetched = self._run_chunks(wanted, fetch)
+        batch.results.update(fetched.results)
+        batch.errors.update(fetched.errors)
+        return batch
+    
+    def _batch_write(self, resource_type: str, items: Sequence[Dict], upsert: bool, timeout: Optional[Timeout] = None) -> BatchResult:
+        """
+        Write many resources through the batch write endpoint.
+        
+        Args:
+            resource_type: The type of resource to write (e.g., 'member')
+            items: The items to write, each with an 'id'
+            upsert: Whether items that don't exist yet are created
+            timeout: Optional per-call timeout, overriding the client default
+            
+        Returns:
+            BatchResult of each item's outcome by ID
+        """
+        by_id = dict(zip(item_ids(items), items))
+        
+        def write(chunk: Sequence[Hashable]) -> BatchResult:
+            try:
+                data = self._request(
+                    "PUT", resource_type,
+                    json={f"{resource_type}s": [by_id[item_id] for item_id in chunk], "upsert": upsert},
+                    timeout=timeout
+                )
+            finally:
+                # Batch writes don't name a single resource, so drop every cached one of the type
+                self.cache.invalidate(resource_type)
+            outcomes = write_outcomes(data)
+            outcome = BatchResult()
+            for item_id in chunk:
+                status, result = outcomes.get(str(item_id), (500, {"error": "No result returned for this item"}))
+                if status < 400:
+                    outcome.results[item_id] = result
+                else:
+                    outcome.errors[item_id] = error_for_status(status, result.get("error", ""), resource_type, str(item_id))
+            return outcome
+        
+        return self._run_chunks(list(by_id), write)
+    
+    def get_members(self, member_ids: Iterable[int], timeout: Optional[Timeout] = None) -> BatchResult:
+        """
+        Get many members at once.
+        
+        Args:
+            member_ids: The IDs of the members to retrieve
+            timeout: Optional per-call timeout, overriding the client default
+            
+        Returns:
+            BatchResult with a Member per found ID, and an error per failed one
+            (e.g., ResourceNotFoundError)
+        """
+        member_ids = list(member_ids)
+        if self.batch_endpoints:
+            return self._batch_get("member", member_ids, Member.from_dict, timeout=timeout)
+        return self._run_concurrently(list(dict.fromkeys(member_ids)), lambda member_id: self.get_member(member_id, timeout=timeout))
+    
+    def get_clubs(self, club_ids: Iterable[str], timeout: Optional[Timeout] = None) -> BatchResult:
+        """
+        Get many clubs at once.
+        
+        Args:
+            club_ids: The IDs of the clubs to retrieve
+            timeout: Optional per-call timeout, overriding the client default
+            
+        Returns:
+            BatchResult with a Club per found ID, and an error per failed one
+        """
+        club_ids = list(club_ids)
+        if self.batch_endpoints:
+            return self._batch_get("club", club_ids, Club.from_dict, timeout=timeout)
+        return self._run_concurrently(list(dict.fromkeys(club_ids)), lambda club_id: self.get_club(club_id, timeout=timeout))
+    
+    def update_members(self, updates: Iterable[Dict], timeout: Optional[Timeout] = None) -> BatchResult:
+        """
+        Update many members at once.
+        
+        Args:
+            updates: Dicts with the 'id' of a member and the fields to update,
+                as for update_member
+            timeout: Optional per-call timeout, overriding the client default
+            
+        Returns:
+            BatchResult with each member's outcome by ID
+            
+        Raises:
+            ValueError: If an update has no 'id'
+        """
+        updates = list(updates)
+        if self.batch_endpoints:
+            return self._batch_write("member", updates, upsert=False, timeout=timeout)
+        by_id = dict(zip(item_ids(updates), updates))
+        return self._run_concurrently(
+            list(by_id),
+            lambda member_id: self.update_member(member_id, _without_id(by_id[member_id]), timeout=timeout)
+        )
+    
+    def upsert_members(self, members: Iterable[Dict], timeout: Optional[Timeout] = None) -> BatchResult:
+        """
+        Create or update many members at once.
+        
+        Args:
+            members: Dicts with the 'id' of a member and its fields, as for create_member
+            timeout: Optional per-call timeout, overriding the client default
+            
+        Returns:
+            BatchResult with each member's outcome by ID
+            
+        Raises:
+            ValueError: If a member has no 'id'
+        """
+        members = list(members)
+        if self.batch_endpoints:
+            return self._batch_write("member", members, upsert=True, timeout=timeout)
+        by_id = dict(zip(item_ids(members), members))
+        
+        def upsert(member_id: int) -> Dict:
+            try:
+                return self.update_member(member_id, _without_id(by_id[member_id]), timeout=timeout)
+            except ResourceNotFoundError:
+                return self.create_member(by_id[member_id], timeout=timeout)
+        
+        return self._run_concurrently(list(by_id), upsert)
 
 
 # Example usage
@@ -476,8 +1086,8 @@ if __name__ == "__main__":
     try:
         # Get club details
         club = api.get_club("club-1")
-        print(f"Club name: {club['name']}")
-        print(f"Number of members: {len(club['members'])}")
+        print(f"Club name: {club.name}")
+        print(f"Number of members: {len(club.members)}")
     except ResourceNotFoundError as e:
         print(f"Resource not found: {e}")
     except ValidationError as e:
@@ -0,0 +1,262 @@
+# cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+DEFAULT_CACHE_TTL = 60.0
+DEFAULT_CACHE_MAXSIZE = 128
+
+# Marker returned by TTLCache.get on a miss, since None is a valid cached value.
+MISSING = object()
+
+# Resource types whose payloads embed another resource type, and so go stale
+# whenever a resource of that type is written. A club payload lists its members
+# and active session, while member and session payloads name their clubs.
+EMBEDDED_IN = {
+    "club": ("member", "session"),
+    "member": ("club",),
+    "session": ("club",),
+}
+
+class CacheEntry:
+    """A cached value, the time at which it stops being fresh, and its HTTP validators."""
+    __slots__ = ("value", "expires_at", "etag", "last_modified")
+
+    def __init__(self, value: Any, expires_at: float, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        self.value = value
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+def conditional_headers(entry: Optional[CacheEntry]) -> Optional[Dict[str, str]]:
+    """
+    Build the headers that make a GET conditional on a cached entry's validators.
+
+    Args:
+        entry: The cached entry, if any
+
+    Returns:
+        Dict with If-None-Match and/or If-Modified-Since, or None if there is nothing to validate
+    """
+    if entry is None:
+        return None
+    headers = {}
+    if entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+    return headers or None
+
+class TTLCache:
+    """
+    Bounded, thread-safe LRU cache whose entries expire after a fixed TTL.
+
+    Keys are tuples that start with a resource type and ID, e.g. ('club', 'club-1'),
+    so that every entry for a resource can be invalidated at once.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_CACHE_TTL,
+        maxsize: int = DEFAULT_CACHE_MAXSIZE,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry stays fresh; 0 or less disables caching
+            maxsize: Maximum number of entries before the least recently used is evicted
+            clock: Monotonic time source, injectable for tests
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.revalidations = 0
+        self.stale_served = 0
+        # Bumped by every invalidation, so a read that raced a write can avoid caching its result
+        self.version = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Get a fresh value from the cache.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached value, or MISSING if there is no fresh entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            if entry.expires_at <= self.clock():
+                # Expired entries are kept (until evicted) so callers can still fall back on them
+                self.stale += 1
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def peek(self, key: Hashable) -> Optional[CacheEntry]:
+        """
+        Get an entry whether or not it is still fresh, without touching the counters.
+
+        Used to find the validators of an expired entry for a conditional request.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The entry, or None if there is none
+        """
+        with self._lock:
+            return self._entries.get(key)
+
+    def refresh(self, key: Hashable, version: Optional[int] = None) -> Optional[CacheEntry]:
+        """
+        Make an entry fresh again, after the server confirmed it is unchanged (304).
+
+        Args:
+            key: The cache key
+            version: The cache version read before revalidating, see set()
+
+        Returns:
+            The refreshed entry, or None if it is gone or was invalidated meanwhile
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (version is not None and version != self.version):
+                return None
+            entry.expires_at = self.clock() + self.ttl
+            self._entries.move_to_end(key)
+            self.revalidations += 1
+            return entry
+
+    def serve_stale(self, entry: CacheEntry) -> Any:
+        """
+        Count an expired entry being served because the API is unavailable.
+
+        Args:
+            entry: The expired entry, as returned by peek()
+
+        Returns:
+            The entry's value
+        """
+        with self._lock:
+            self.stale_served += 1
+        return entry.value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        version: Optional[int] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        """
+        Store a value in the cache, evicting the least recently used entry if full.
+
+        Args:
+            key: The cache key
+            value: The value to cache
+            version: The cache version read before fetching the value; if anything was
+                invalidated since, the value may predate a write and is not stored
+            etag: The response's ETag validator, if any
+            last_modified: The response's Last-Modified validator, if any
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if version is not None and version != self.version:
+                return
+            self._entries[key] = CacheEntry(value, self.clock() + self.ttl, etag, last_modified)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, resource_type: str, resource_id: Optional[str] = None) -> int:
+        """
+        Drop every entry for a resource, or for a whole resource type.
+
+        Args:
+            resource_type: The type of resource (e.g., 'club', 'member')
+            resource_id: The ID of the resource; if None, all entries of the type are dropped
+
+        Returns:
+            The number of entries dropped
+        """
+        with self._lock:
+            doomed = [
+                key for key in self._entries
+                if key[0] == resource_type and (resource_id is None or key[1] == str(resource_id))
+            ]
+            for key in doomed:
+                del self._entries[key]
+            self.invalidations += len(doomed)
+            self.version += 1
+            return len(doomed)
+
+    def invalidate_for_write(self, resource_type: str, resource_id: Optional[str] = None) -> int:
+        """
+        Drop the entries affected by a create, update or delete of a resource.
+
+        That is the written resource itself plus every cached resource type whose
+        payload embeds it (see EMBEDDED_IN).
+
+        Args:
+            resource_type: The type of resource written
+            resource_id: The ID of the resource written, if known
+
+        Returns:
+            The number of entries dropped
+        """
+        dropped = self.invalidate(resource_type, resource_id) if resource_id is not None else 0
+        for embedding_type in EMBEDDED_IN.get(resource_type, ()):
+            dropped += self.invalidate(embedding_type)
+        return dropped
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self.version += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters.
+
+        Returns:
+            Dict with hits, misses, stale (misses on an expired entry), evictions,
+            invalidations, revalidations (stale entries confirmed by a 304), stale_served
+            (stale entries served while the API was unavailable) and the current size
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "revalidations": self.revalidations,
+                "stale_served": self.stale_served,
+                "size": len(self._entries),
+            }
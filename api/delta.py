@@ -0,0 +1,282 @@
+# delta.py
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from .models import Club, Discussion, Member, Session
+
+# Change feed, when the club edge function has one (see the clients' get_club_changes):
+#
+#   GET /club?id=<club_id>                    -> the full club, with "version": the feed position it was read at
+#   GET /club?id=<club_id>&updated_since=<v>  -> {
+#       "id": "club-1",
+#       "version": 42,
+#       "club": {"name", "discord_channel", "active_session_id", "shame_list"},  # only if the club itself changed
+#       "members": [member, ...],                     # joined or changed since v
+#       "sessions": [session, ...],                   # created or changed since v, without their discussions
+#       "discussions": [{"session_id", ...}, ...],    # created or changed since v
+#       "deleted": {"members": [...], "sessions": [...], "discussions": [...]}
+#   }
+#
+# or {"id": "club-1", "resync": true} when the server does not know v (e.g. it restarted) and the club must be
+# refetched whole. A club read without a "version" cannot be synced by delta, so it is refetched whole every time.
+
+class ClubDelta:
+    """The changes to a club since a version of it, as returned by get_club_changes."""
+    __slots__ = (
+        "id", "version", "resync", "club", "members", "sessions", "discussions",
+        "deleted_members", "deleted_sessions", "deleted_discussions"
+    )
+
+    def __init__(
+        self,
+        id: str,
+        version: Optional[int] = None,
+        resync: bool = False,
+        club: Optional[Dict[str, Any]] = None,
+        members: Tuple[Member, ...] = (),
+        sessions: Tuple[Session, ...] = (),
+        discussions: Tuple[Tuple[str, Discussion], ...] = (),
+        deleted_members: Tuple[int, ...] = (),
+        deleted_sessions: Tuple[str, ...] = (),
+        deleted_discussions: Tuple[str, ...] = ()
+    ):
+        self.id = id
+        self.version = version
+        self.resync = resync
+        self.club = club
+        self.members = members
+        self.sessions = sessions
+        self.discussions = discussions
+        self.deleted_members = deleted_members
+        self.deleted_sessions = deleted_sessions
+        self.deleted_discussions = deleted_discussions
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ClubDelta":
+        deleted = data.get("deleted") or {}
+        return cls(
+            id=data.get("id"),
+            version=data.get("version"),
+            resync=bool(data.get("resync")),
+            club=data.get("club"),
+            members=tuple(Member.from_dict(member) for member in data.get("members") or ()),
+            sessions=tuple(Session.from_dict(session) for session in data.get("sessions") or ()),
+            discussions=tuple(
+                (discussion.get("session_id"), Discussion.from_dict(discussion))
+                for discussion in data.get("discussions") or ()
+            ),
+            deleted_members=tuple(deleted.get("members") or ()),
+            deleted_sessions=tuple(deleted.get("sessions") or ()),
+            deleted_discussions=tuple(deleted.get("discussions") or ())
+        )
+
+    @property
+    def changes(self) -> int:
+        """Number of changed or deleted items, counting the club's own fields as one."""
+        return (
+            (1 if self.club else 0) + len(self.members) + len(self.sessions) + len(self.discussions)
+            + len(self.deleted_members) + len(self.deleted_sessions) + len(self.deleted_discussions)
+        )
+
+    def __repr__(self) -> str:
+        return f"ClubDelta(id={self.id!r}, version={self.version!r}, resync={self.resync}, changes={self.changes})"
+
+def _upsert(items: Dict[Hashable, Any], item: Any) -> None:
+    items[item.id] = item
+
+def apply_delta(club: Club, delta: ClubDelta) -> Club:
+    """
+    Patch a club with the changes made since it was read.
+
+    Models are immutable, so the result is a new club; the members, sessions
+    and discussions that did not change are shared with the old one.
+
+    Args:
+        club: The club, as read at some version
+        delta: The changes since that version
+
+    Returns:
+        The club as of delta.version
+    """
+    members = {member.id: member for member in club.members}
+    for member in delta.members:
+        _upsert(members, member)
+    for member_id in delta.deleted_members:
+        members.pop(member_id, None)
+
+    old_active = club.active_session
+    sessions = {session.id: session for session in ((old_active,) if old_active else ()) + club.past_sessions}
+    for session in delta.sessions:
+        old = sessions.get(session.id)
+        _upsert(sessions, session.replace(discussions=old.discussions) if old else session)
+    for session_id in delta.deleted_sessions:
+        sessions.pop(session_id, None)
+
+    touched: Dict[str, Dict[Hashable, Discussion]] = {}
+    for session_id, discussion in delta.discussions:
+        if session_id in sessions:
+            if session_id not in touched:
+                touched[session_id] = {item.id: item for item in sessions[session_id].discussions}
+            _upsert(touched[session_id], discussion)
+    if delta.deleted_discussions:
+        deleted = set(delta.deleted_discussions)
+        for session_id, session in sessions.items():
+            if any(discussion.id in deleted for discussion in session.discussions):
+                if session_id not in touched:
+                    touched[session_id] = {item.id: item for item in session.discussions}
+                for discussion_id in deleted:
+                    touched[session_id].pop(discussion_id, None)
+    for session_id, discussions in touched.items():
+        sessions[session_id] = sessions[session_id].replace(discussions=tuple(discussions.values()))
+
+    fields = delta.club or {}
+    active_id = fields.get("active_session_id", old_active.id if old_active else None)
+    past_ids: List[Hashable] = [session.id for session in club.past_sessions]
+    if old_active and old_active.id != active_id:
+        past_ids.insert(0, old_active.id)  # The previous active session is now the most recent past one
+    past_ids += [session_id for session_id in sessions if session_id != active_id and session_id not in past_ids]
+
+    return club.replace(
+        name=fields.get("name", club.name),
+        discord_channel=fields.get("discord_channel", club.discord_channel),
+        shame_list=tuple(fields["shame_list"]) if "shame_list" in fields else club.shame_list,
+        members=tuple(members.values()),
+        active_session=sessions.get(active_id),
+        past_sessions=tuple(
+            sessions[session_id] for session_id in past_ids if session_id in sessions and session_id != active_id
+        ),
+        version=delta.version
+    )
+
+class ClubSync:
+    """
+    Keeps an in-memory club up to date through the change feed of an AsyncBookClubAPI.
+
+    refresh() reads the whole club; sync() pulls only what changed since the
+    last read and patches the club with it. How stale the club may be is
+    bounded by how often sync() runs, and staleness() measures it.
+    """
+
+    def __init__(
+        self,
+        api: Any,
+        club_id: str,
+        clock: Callable[[], float] = time.monotonic,
+        on_change: Optional[Callable[[Club, Optional[ClubDelta]], Awaitable[None]]] = None
+    ):
+        """
+        Initialize the sync; nothing is read until refresh() or sync().
+
+        Args:
+            api: The AsyncBookClubAPI to read through
+            club_id: The ID of the club to keep
+            clock: Monotonic time source, injectable for tests
+            on_change: Awaited with the club and the delta that changed it after every
+                delta that changed it, and with the club and None after every full read,
+                e.g. to keep a copy of it elsewhere by applying only what changed
+        """
+        self.api = api
+        self.club_id = club_id
+        self.clock = clock
+        self.on_change = on_change
+        self.club: Optional[Club] = None
+        self.synced_at: Optional[float] = None
+        self.full_syncs = 0
+        self.delta_syncs = 0
+        self.resyncs = 0
+        self.failures = 0
+        self.changes_applied = 0
+
+    async def refresh(self) -> Club:
+        """
+        Read the whole club, bypassing the client's cache.
+
+        Returns:
+            The club
+        """
+        self.api.cache.invalidate("club", self.club_id)
+        try:
+            club = await self.api.get_club(self.club_id)
+        except Exception:
+            self.failures += 1
+            raise
+        self.club = club
+        self.synced_at = self.clock()
+        self.full_syncs += 1
+        if self.on_change is not None:
+            await self.on_change(club, None)
+        return club
+
+    async def sync(self) -> Club:
+        """
+        Bring the club up to date, by delta if possible.
+
+        Falls back on refresh() before the first read, when the API reports no
+        version, and when the server asks for a resync.
+
+        Returns:
+            The up-to-date club
+        """
+        if self.club is None or self.club.version is None:
+            return await self.refresh()
+        try:
+            delta = await self.api.get_club_changes(self.club_id, self.club.version)
+        except Exception:
+            self.failures += 1
+            raise
+        if delta.resync:
+            self.resyncs += 1
+            return await self.refresh()
+
+        if delta.changes:
+            self.club = apply_delta(self.club, delta)
+            self.changes_applied += delta.changes
+            self.api.cache.invalidate("club", self.club_id)  # Reads that bypass the sync should not be older than it
+        elif delta.version is not None:
+            self.club = self.club.replace(version=delta.version)
+        self.synced_at = self.clock()
+        self.delta_syncs += 1
+        if delta.changes and self.on_change is not None:
+            await self.on_change(self.club, delta)
+        return self.club
+
+    def staleness(self) -> Optional[float]:
+        """
+        Get how long ago the club was last brought up to date.
+
+        Returns:
+            Seconds since the last successful read, or None if there was none
+        """
+        return None if self.synced_at is None else self.clock() - self.synced_at
+
+    def fresh(self, max_staleness: float) -> Optional[Club]:
+        """
+        Get the club if it is recent enough to serve.
+
+        Args:
+            max_staleness: Largest acceptable staleness, in seconds
+
+        Returns:
+            The club, or None if it was never read or is staler than that
+        """
+        staleness = self.staleness()
+        return self.club if staleness is not None and staleness <= max_staleness else None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the sync counters.
+
+        Returns:
+            Dict with full reads, delta reads, resyncs, failures, items changed
+            through deltas, the current version and the staleness in seconds
+        """
+        staleness = self.staleness()
+        return {
+            "full_syncs": self.full_syncs,
+            "delta_syncs": self.delta_syncs,
+            "resyncs": self.resyncs,
+            "failures": self.failures,
+            "changes_applied": self.changes_applied,
+            "version": self.club.version if self.club else None,
+            "staleness": round(staleness, 3) if staleness is not None else None,
+        }
@@ -0,0 +1,133 @@
+# hedging.py
+import math
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Union
+
+class LatencyTracker:
+    """Sliding window of recent call latencies."""
+
+    def __init__(self, window: int = 200):
+        """
+        Initialize the tracker.
+
+        Args:
+            window: Number of most recent latencies kept
+        """
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, latency: float) -> None:
+        """Record the latency of a call, in seconds."""
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Get a percentile of the recent latencies, by nearest rank.
+
+        Args:
+            percentile: The percentile, from 0 to 100
+
+        Returns:
+            The latency in seconds, or None if nothing was recorded yet
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(1, math.ceil(percentile / 100 * len(samples)))
+        return samples[min(rank, len(samples)) - 1]
+
+class HedgePolicy:
+    """
+    When to send a second, hedged attempt of a slow idempotent read.
+
+    A read that has not answered within the given percentile of recent read
+    latency gets a second attempt, and whichever answers first wins. Hedges
+    are capped at a fraction of reads, so a slow API does not see its traffic
+    double.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        min_delay: float = 0.05,
+        max_extra: float = 0.1,
+        min_samples: int = 20,
+        window: int = 200
+    ):
+        """
+        Initialize the hedge policy.
+
+        Args:
+            percentile: Percentile of recent latency after which a read is hedged
+            min_delay: Shortest wait, in seconds, before hedging
+            max_extra: Largest fraction of reads that may be hedged, e.g. 0.1 for 10% extra load
+            min_samples: Latencies recorded before hedging starts, so the percentile means something
+            window: Number of recent latencies the percentile is taken over
+        """
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_extra = max_extra
+        self.min_samples = min_samples
+        self.latency = LatencyTracker(window)
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def start(self) -> Optional[float]:
+        """
+        Count a hedgeable read and get how long to wait before hedging it.
+
+        Returns:
+            Seconds to wait before hedging, or None if not enough latencies were recorded yet
+        """
+        with self._lock:
+            self.reads += 1
+        if len(self.latency) < max(1, self.min_samples):
+            return None
+        return max(self.min_delay, self.latency.percentile(self.percentile))
+
+    def allow_hedge(self) -> bool:
+        """
+        Check the extra-load cap, counting the hedge if it is allowed.
+
+        Returns:
+            True if a hedged attempt may be sent
+        """
+        with self._lock:
+            if self.hedged + 1 > self.max_extra * self.reads:
+                return False
+            self.hedged += 1
+            return True
+
+    def record(self, latency: float) -> None:
+        """Record the latency of a successful attempt, in seconds."""
+        self.latency.record(latency)
+
+    def record_win(self) -> None:
+        """Record a hedged attempt answering before the original one."""
+        with self._lock:
+            self.hedge_wins += 1
+
+    def stats(self) -> Dict[str, Union[int, Optional[float]]]:
+        """
+        Get the hedging counters.
+
+        Returns:
+            Dict with hedgeable reads, hedged reads, hedges that answered first,
+            and the current hedging delay in seconds (None until enough samples)
+        """
+        delay = self.latency.percentile(self.percentile) if len(self.latency) >= max(1, self.min_samples) else None
+        with self._lock:
+            return {
+                "reads": self.reads,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "delay": max(self.min_delay, delay) if delay is not None else None,
+            }
@@ -0,0 +1,345 @@
+# metrics.py
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Upper bounds of the histogram buckets, in seconds or bytes; every histogram also has a +Inf bucket
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DECODE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05)
+SIZE_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152)
+
+Labels = Tuple[str, ...]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Metric:
+    """Base for the metrics of a MetricsRegistry: a named family of values, one per set of label values."""
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[Labels, Any] = {}
+
+    def _check(self, values: Labels) -> Labels:
+        if len(values) != len(self.labels):
+            raise ValueError(f"{self.name} takes labels {self.labels}, got {values}")
+        return values
+
+    def _lines(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Render the metric in the Prometheus text exposition format."""
+        return "\n".join([f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self._lines()])
+
+class Counter(Metric):
+    """A value that only goes up, e.g. a number of errors."""
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """
+        Add to the counter.
+
+        Args:
+            *labels: The label values, in the order of the counter's label names
+            amount: How much to add
+        """
+        with self._lock:
+            if labels not in self._values:
+                self._values[self._check(labels)] = 0
+            self._values[labels] += amount
+
+    def value(self, *labels: str) -> float:
+        """Get the counter's value for some label values; 0 if never incremented."""
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def _lines(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(self.labels, labels)} {_format_number(value)}"
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [{"labels": dict(zip(self.labels, labels)), "value": value} for labels, value in values]
+
+class Histogram(Metric):
+    """Distribution of observed values, e.g. latencies, counted into buckets."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        """
+        Initialize the histogram.
+
+        Args:
+            name: The metric name
+            help: What the metric measures
+            labels: The label names
+            buckets: Upper bounds of the buckets, in increasing order
+        """
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Record an observation.
+
+        Args:
+            value: The observed value
+            *labels: The label values, in the order of the histogram's label names
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # [per-bucket counts, with +Inf last; sum; count]
+                state = self._values[self._check(labels)] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, *labels: str) -> int:
+        """Get the number of observations for some label values."""
+        with self._lock:
+            state = self._values.get(labels)
+            return state[2] if state else 0
+
+    def sum(self, *labels: str) -> float:
+        """Get the sum of the observations for some label values."""
+        with self._lock:
+            state = self._values.get(labels)
+            return state[1] if state else 0.0
+
+    def _states(self) -> List[Tuple[Labels, List[int], float, int]]:
+        with self._lock:
+            return [(labels, list(state[0]), state[1], state[2]) for labels, state in sorted(self._values.items())]
+
+    def _lines(self) -> Iterator[str]:
+        bounds = [_format_number(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, counts, total, count in self._states():
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels(self.labels + ("le",), labels + (bound,))
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, labels)} {_format_number(total)}"
+            yield f"{self.name}_count{_format_labels(self.labels, labels)} {count}"
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "labels": dict(zip(self.labels, labels)),
+                "buckets": dict(zip([*self.buckets, "+Inf"], counts)),
+                "sum": total,
+                "count": count,
+            }
+            for labels, counts, total, count in self._states()
+        ]
+
+class MetricsRegistry:
+    """
+    In-process registry of counters and histograms.
+
+    Recording is a lock and a dict update per observation, cheap enough for
+    every API call. The registry can be dumped with snapshot(), or scraped in
+    the Prometheus text format from render() (see serve_metrics).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is None:
+                self._metrics[metric.name] = metric
+                return metric
+        if type(existing) is not type(metric) or existing.labels != metric.labels:
+            raise ValueError(f"Metric {metric.name} is already registered with a different type or labels")
+        return existing
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        """
+        Get a counter, registering it if it is new.
+
+        Args:
+            name: The metric name, conventionally ending in _total
+            help: What the counter counts
+            labels: The label names
+
+        Returns:
+            The counter; the same one for every call with the same name
+        """
+        return self._register(Counter(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        """
+        Get a histogram, registering it if it is new.
+
+        Args:
+            name: The metric name, conventionally ending in its unit (e.g., _seconds)
+            help: What the histogram measures
+            labels: The label names
+            buckets: Upper bounds of the buckets, in increasing order
+
+        Returns:
+            The histogram; the same one for every call with the same name
+        """
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def get(self, name: str) -> Optional[Metric]:
+        """Get a registered metric by name, or None."""
+        with self._lock:
+            return self._metrics.get(name)
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            The exposition text
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        return "".join(metric.render() + "\n" for metric in metrics)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Dump every metric as JSON-compatible data.
+
+        Returns:
+            Dict by metric name of its type, help and values by label set
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        return {
+            metric.name: {"type": metric.kind, "help": metric.help, "values": metric.snapshot()}
+            for metric in metrics
+        }
+
+class APIMetrics:
+    """The instruments of an API client, registered in a MetricsRegistry."""
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self.request_seconds = registry.histogram(
+            "bookclub_api_request_seconds",
+            "Latency of edge function calls, per attempt",
+            ("endpoint", "method", "status")
+        )
+        self.request_bytes = registry.histogram(
+            "bookclub_api_request_bytes", "Size of request bodies sent", ("endpoint", "method"), SIZE_BUCKETS
+        )
+        self.response_bytes = registry.histogram(
+            "bookclub_api_response_bytes", "Size of response bodies received", ("endpoint", "method", "status"), SIZE_BUCKETS
+        )
+        self.decode_seconds = registry.histogram(
+            "bookclub_api_decode_seconds", "Time spent decoding JSON responses", ("endpoint",), DECODE_BUCKETS
+        )
+        self.errors = registry.counter(
+            "bookclub_api_errors_total", "Failed edge function call attempts, by error class", ("endpoint", "method", "error")
+        )
+
+    def attempt(
+        self,
+        endpoint: str,
+        method: str,
+        status: str,
+        seconds: float,
+        request_bytes: Optional[int] = None,
+        response_bytes: Optional[int] = None
+    ) -> None:
+        """
+        Record one attempt at a call.
+
+        Args:
+            endpoint: The edge function called (e.g., 'club')
+            method: The HTTP verb
+            status: The response status code, or the class of the error if there was no response
+            seconds: How long the attempt took
+            request_bytes: Size of the request body, if known
+            response_bytes: Size of the response body, if known
+        """
+        self.request_seconds.observe(seconds, endpoint, method, status)
+        if request_bytes is not None:
+            self.request_bytes.observe(request_bytes, endpoint, method)
+        if response_bytes is not None:
+            self.response_bytes.observe(response_bytes, endpoint, method, status)
+
+    def error(self, endpoint: str, method: str, error: str) -> None:
+        """Count a failed attempt by the class of its error (e.g., 'ResourceNotFoundError')."""
+        self.errors.inc(endpoint, method, error)
+
+    def decoded(self, endpoint: str, seconds: float) -> None:
+        """Record the time taken to decode a response."""
+        self.decode_seconds.observe(seconds, endpoint)
+
+def body_size(body: Any) -> Optional[int]:
+    """
+    Get the size of a request or response body.
+
+    Args:
+        body: The body, as bytes or str, or None if there was none
+
+    Returns:
+        The size in bytes, 0 for no body, or None if it cannot be told
+    """
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    return None
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = self.server.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # One line per scrape would drown the bot's logs
+
+def serve_metrics(registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9100) -> ThreadingHTTPServer:
+    """
+    Serve a registry for Prometheus to scrape, from a background thread.
+
+    Args:
+        registry: The registry to serve
+        host: Interface to listen on
+        port: Port to listen on; 0 picks a free one
+
+    Returns:
+        The server; call shutdown() and server_close() on it to stop serving
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,247 @@
+# models.py
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # The fast decoder is optional
+    orjson = None
+
+def fast_json_loads() -> Optional[Callable[[Any], Any]]:
+    """
+    Get the fast JSON decoder, if it is installed.
+
+    Returns:
+        orjson.loads, or None to fall back on the standard library decoder
+    """
+    return orjson.loads if orjson is not None else None
+
+def parse_date(value: Any) -> Optional[date]:
+    """
+    Parse a date as sent by the API.
+
+    Args:
+        value: An ISO date or datetime string (e.g. '2025-04-15'), a date, or None
+
+    Returns:
+        The date, or None if there is none or it is not a recognizable date,
+        so that one malformed date cannot fail the read of a whole club
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value)
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(text, "%m/%d/%Y").date()
+    except ValueError:
+        return None
+
+def _encode(value: Any) -> Any:
+    """Turn a model attribute back into its JSON-compatible form."""
+    if isinstance(value, Model):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_encode(item) for item in value]
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+class Model:
+    """
+    Base for the API's response models.
+
+    Models are immutable and keep their attributes in __slots__, so a decoded
+    club shared through the client's cache costs far less memory than the
+    nested dicts it replaces, and cannot be modified by one of its readers.
+    Collections are tuples for the same reasons.
+    """
+    __slots__ = ()
+
+    def _init(self, **values: Any) -> None:
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def _values(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash(self._values())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def replace(self, **changes: Any) -> "Model":
+        """
+        Get a copy of the model with some attributes changed.
+
+        Args:
+            **changes: New values by attribute name
+
+        Returns:
+            The new model; attributes not changed are shared with this one
+        """
+        return type(self)(**{**{name: getattr(self, name) for name in self.__slots__}, **changes})
+
+    def to_dict(self) -> Dict:
+        """
+        Convert the model back into the API's JSON representation.
+
+        Returns:
+            Dict with nested models as dicts, tuples as lists and dates as ISO strings
+        """
+        return {name: _encode(getattr(self, name)) for name in self.__slots__}
+
+class Book(Model):
+    """A book read in a session."""
+    __slots__ = ("id", "title", "author", "edition", "year", "isbn")
+
+    def __init__(
+        self,
+        title: str,
+        author: str,
+        id: Optional[int] = None,
+        edition: Optional[str] = None,
+        year: Optional[int] = None,
+        isbn: Optional[str] = None
+    ):
+        self._init(id=id, title=title, author=author, edition=edition, year=year, isbn=isbn)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Book":
+        return cls(
+            title=data.get("title"),
+            author=data.get("author"),
+            id=data.get("id"),
+            edition=data.get("edition"),
+            year=data.get("year"),
+            isbn=data.get("isbn", data.get("ISBN"))
+        )
+
+class Discussion(Model):
+    """A scheduled discussion of a session's book."""
+    __slots__ = ("id", "title", "date", "location")
+
+    def __init__(self, title: str, date: date, id: Optional[str] = None, location: Optional[str] = None):
+        self._init(id=id, title=title, date=date, location=location)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Discussion":
+        return cls(
+            title=data.get("title"),
+            date=parse_date(data.get("date")),
+            id=data.get("id"),
+            location=data.get("location")
+        )
+
+class Member(Model):
+    """A book club member, and the clubs they belong to when fetched on their own."""
+    __slots__ = ("id", "name", "points", "books_read", "clubs", "shame_clubs")
+
+    def __init__(
+        self,
+        id: int,
+        name: Optional[str] = None,
+        points: int = 0,
+        books_read: int = 0,
+        clubs: Tuple["Club", ...] = (),
+        shame_clubs: Tuple["Club", ...] = ()
+    ):
+        self._init(id=id, name=name, points=points, books_read=books_read, clubs=clubs, shame_clubs=shame_clubs)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Member":
+        return cls(
+            id=data.get("id"),
+            name=data.get("name"),
+            points=data.get("points") or 0,
+            books_read=data.get("books_read") or 0,
+            clubs=tuple(Club.from_dict(club) for club in data.get("clubs") or ()),
+            shame_clubs=tuple(Club.from_dict(club) for club in data.get("shame_clubs") or ())
+        )
+
+class Session(Model):
+    """A reading session: a book, its due date and its discussions."""
+    __slots__ = ("id", "book", "due_date", "discussions", "club", "shame_list")
+
+    def __init__(
+        self,
+        id: Optional[str] = None,
+        book: Optional[Book] = None,
+        due_date: Optional[date] = None,
+        discussions: Tuple[Discussion, ...] = (),
+        club: Optional["Club"] = None,
+        shame_list: Tuple[int, ...] = ()
+    ):
+        self._init(id=id, book=book, due_date=due_date, discussions=discussions, club=club, shame_list=shame_list)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Session":
+        book = data.get("book")
+        club = data.get("club")
+        return cls(
+            id=data.get("id"),
+            book=Book.from_dict(book) if book else None,
+            due_date=parse_date(data.get("due_date")),
+            discussions=tuple(Discussion.from_dict(discussion) for discussion in data.get("discussions") or ()),
+            club=Club.from_dict(club) if club else None,
+            shame_list=tuple(data.get("shame_list") or ())
+        )
+
+class Club(Model):
+    """
+    A book club with its members, active session and past sessions.
+
+    version is the change-feed position the club was read at, when the API
+    reports one; see api/delta.py.
+    """
+    __slots__ = ("id", "name", "discord_channel", "members", "active_session", "past_sessions", "shame_list", "version")
+
+    def __init__(
+        self,
+        id: str,
+        name: Optional[str] = None,
+        discord_channel: Optional[int] = None,
+        members: Tuple[Member, ...] = (),
+        active_session: Optional[Session] = None,
+        past_sessions: Tuple[Session, ...] = (),
+        shame_list: Tuple[int, ...] = (),
+        version: Optional[int] = None
+    ):
+        self._init(
+            id=id, name=name, discord_channel=discord_channel, members=members,
+            active_session=active_session, past_sessions=past_sessions, shame_list=shame_list,
+            version=version
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Club":
+        active_session = data.get("active_session")
+        return cls(
+            id=data.get("id"),
+            name=data.get("name"),
+            discord_channel=data.get("discord_channel"),
+            members=tuple(Member.from_dict(member) for member in data.get("members") or ()),
+            active_session=Session.from_dict(active_session) if active_session else None,
+            past_sessions=tuple(Session.from_dict(session) for session in data.get("past_sessions") or ()),
+            shame_list=tuple(data.get("shame_list") or ()),
+            version=data.get("version")
+        )
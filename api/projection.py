@@ -0,0 +1,71 @@
+# projection.py
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Fields every projected payload keeps, so a partial resource can still be identified
+ALWAYS_INCLUDED = ("id",)
+
+def normalize_include(include: Optional[Iterable[str]]) -> Optional[Tuple[str, ...]]:
+    """
+    Normalize an include= option, so equivalent projections share a cache entry.
+
+    Args:
+        include: Dotted field paths (e.g., ['active_session.book']), or None for every field
+
+    Returns:
+        The sorted, de-duplicated paths, or None for every field
+    """
+    if include is None:
+        return None
+    if isinstance(include, str):
+        include = [include]
+    paths = tuple(sorted({path.strip() for path in include if path and path.strip()}))
+    return paths or None
+
+def include_param(include: Optional[Tuple[str, ...]]) -> Optional[str]:
+    """
+    Encode normalized include paths as the 'include' query string parameter.
+
+    Args:
+        include: Normalized paths, see normalize_include
+
+    Returns:
+        The comma-separated paths, or None if every field is wanted
+    """
+    return ",".join(include) if include else None
+
+def project(payload: Any, include: Optional[Iterable[str]]) -> Any:
+    """
+    Keep only the included fields of a payload, as the edge functions do for include=.
+
+    A path keeps everything under it: 'active_session.book' keeps the whole book
+    of the active session, along with the session's and the club's IDs. Paths
+    apply to every item of a list.
+
+    Args:
+        payload: The decoded JSON payload
+        include: Dotted field paths, or None to keep every field
+
+    Returns:
+        The projected payload; the input is not modified
+    """
+    paths = normalize_include(include)
+    if paths is None:
+        return payload
+    return _project(payload, [path.split(".") for path in paths])
+
+def _project(value: Any, paths: List[List[str]]) -> Any:
+    if any(not path for path in paths):
+        return value  # A path ended here, so the whole value is included
+    if isinstance(value, list):
+        return [_project(item, paths) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    nested: Dict[str, List[List[str]]] = {}
+    for head, *rest in paths:
+        nested.setdefault(head, []).append(rest)
+    projected = {field: value[field] for field in ALWAYS_INCLUDED if field in value}
+    for field, rests in nested.items():
+        if field in value:
+            projected[field] = _project(value[field], rests)
+    return projected
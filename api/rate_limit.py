@@ -0,0 +1,234 @@
+# rate_limit.py
+import asyncio
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Union
+
+from utils.deadline import DeadlineExceeded, remaining
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+# Seconds a background call holds back before checking again whether interactive calls are still waiting
+PRIORITY_BACKOFF = 0.05
+
+# Calls made while handling a command default to interactive; bulk jobs opt into background
+_priority = contextvars.ContextVar("rate_limit_priority", default=None)
+
+@contextmanager
+def priority(value: str):
+    """
+    Make every API call inside the block use the given priority.
+
+    Args:
+        value: INTERACTIVE or BACKGROUND
+    """
+    token = _priority.set(value)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+@contextmanager
+def default_priority(value: str):
+    """
+    Like priority(), but leaves a priority set by an enclosing block alone.
+
+    Args:
+        value: INTERACTIVE or BACKGROUND
+    """
+    with priority(_priority.get() or value):
+        yield
+
+def priority_for(method: str) -> str:
+    """
+    Get the priority of a call: the one set with priority(), or else interactive
+    for reads and background for writes.
+
+    Args:
+        method: The HTTP verb of the call
+
+    Returns:
+        INTERACTIVE or BACKGROUND
+    """
+    return _priority.get() or (INTERACTIVE if method == "GET" else BACKGROUND)
+
+class TokenBucket:
+    """Refills at rate tokens per second, up to burst tokens."""
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the bucket, full.
+
+        Args:
+            rate: Tokens added per second; 0 or less disables the limit
+            burst: Maximum number of tokens, i.e. the largest burst allowed
+            clock: Monotonic time source, injectable for tests
+        """
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = burst
+        self._updated_at = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def take(self) -> float:
+        """
+        Take a token if one is available.
+
+        Returns:
+            0 if a token was taken, or else the seconds until one will be
+        """
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+class RateLimiter:
+    """
+    Client-side limit on edge function invocations, to stay under the plan's throttling.
+
+    Interactive calls (serving a command) and background calls (syncs and
+    other bulk jobs) draw from separate token buckets, so a bulk job cannot use
+    up the budget commands need. Interactive calls also take priority: while
+    one is waiting for a token, background calls hold back.
+    """
+
+    def __init__(
+        self,
+        interactive_rate: float = 10.0,
+        interactive_burst: float = 20.0,
+        background_rate: float = 5.0,
+        background_burst: float = 10.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            interactive_rate: Interactive calls per second; 0 disables their limit
+            interactive_burst: Interactive calls allowed at once after a quiet period
+            background_rate: Background calls per second; 0 disables their limit
+            background_burst: Background calls allowed at once after a quiet period
+            clock: Monotonic time source, injectable for tests
+        """
+        self.buckets = {
+            INTERACTIVE: TokenBucket(interactive_rate, interactive_burst, clock),
+            BACKGROUND: TokenBucket(background_rate, background_burst, clock),
+        }
+        self._lock = threading.Lock()
+        self._interactive_waiting = 0
+        self.acquired = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.throttled = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.wait_seconds = {INTERACTIVE: 0.0, BACKGROUND: 0.0}
+
+    def _try_acquire(self, level: str) -> float:
+        """Take a token for a call, or return the seconds to wait before trying again."""
+        with self._lock:
+            if level == BACKGROUND and self._interactive_waiting:
+                return PRIORITY_BACKOFF
+            delay = self.buckets[level].take()
+            if delay == 0:
+                self.acquired[level] += 1
+            return delay
+
+    def _check_deadline(self, delay: float) -> None:
+        left = remaining()
+        if left is not None and delay >= left:
+            raise DeadlineExceeded("Deadline exceeded while waiting for the rate limiter")
+
+    def _start_waiting(self, level: str) -> None:
+        with self._lock:
+            self.throttled[level] += 1
+            if level == INTERACTIVE:
+                self._interactive_waiting += 1
+
+    def _stop_waiting(self, level: str, waited: float) -> None:
+        with self._lock:
+            self.wait_seconds[level] += waited
+            if level == INTERACTIVE:
+                self._interactive_waiting -= 1
+
+    def acquire(self, level: str, sleep: Callable[[float], None] = time.sleep) -> float:
+        """
+        Wait for a token, blocking the calling thread.
+
+        Args:
+            level: INTERACTIVE or BACKGROUND
+            sleep: Sleep function, injectable for tests
+
+        Returns:
+            The seconds waited
+
+        Raises:
+            DeadlineExceeded: If the wait would outlast the current deadline
+        """
+        delay = self._try_acquire(level)
+        if delay == 0:
+            return 0.0
+        self._start_waiting(level)
+        waited = 0.0
+        try:
+            while delay:
+                self._check_deadline(delay)
+                sleep(delay)
+                waited += delay
+                delay = self._try_acquire(level)
+        finally:
+            self._stop_waiting(level, waited)
+        return waited
+
+    async def acquire_async(self, level: str) -> float:
+        """
+        Wait for a token without blocking the event loop. See acquire.
+
+        Args:
+            level: INTERACTIVE or BACKGROUND
+
+        Returns:
+            The seconds waited
+
+        Raises:
+            DeadlineExceeded: If the wait would outlast the current deadline
+        """
+        delay = self._try_acquire(level)
+        if delay == 0:
+            return 0.0
+        self._start_waiting(level)
+        waited = 0.0
+        try:
+            while delay:
+                self._check_deadline(delay)
+                await asyncio.sleep(delay)
+                waited += delay
+                delay = self._try_acquire(level)
+        finally:
+            self._stop_waiting(level, waited)
+        return waited
+
+    def stats(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        """
+        Get the limiter's counters.
+
+        Returns:
+            Dict by priority of calls acquired, calls throttled (made to wait)
+            and the total seconds they waited
+        """
+        with self._lock:
+            return {
+                level: {
+                    "acquired": self.acquired[level],
+                    "throttled": self.throttled[level],
+                    "wait_seconds": round(self.wait_seconds[level], 3),
+                }
+                for level in (INTERACTIVE, BACKGROUND)
+            }
@@ -0,0 +1,205 @@
+# resilience.py
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, FrozenSet, Optional, Union
+
+from utils.deadline import remaining
+
+# Verbs that can be safely repeated once the server may have seen them. Only reads:
+# a PUT of a session creates the discussions it sends without IDs, and repeating a
+# DELETE that went through answers 404. Any verb is retried when the request
+# provably never reached the server (see RetryPolicy.delay).
+IDEMPOTENT_METHODS = frozenset({"GET"})
+
+# Statuses worth retrying: throttling and transient edge-function failures.
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """
+    Parse a Retry-After header, given either in seconds or as an HTTP date.
+
+    Args:
+        value: The header value, if any
+        now: The current time, injectable for tests
+
+    Returns:
+        The number of seconds to wait, or None if the header is missing or invalid
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (retry_at - now).total_seconds())
+
+class RetryPolicy:
+    """Bounded retries with full-jitter exponential backoff for idempotent calls."""
+
+    def __init__(
+        self,
+        max_retries: int = 2,
+        backoff_base: float = 0.25,
+        backoff_max: float = 4.0,
+        max_retry_after: float = 10.0,
+        methods: FrozenSet[str] = IDEMPOTENT_METHODS,
+        statuses: FrozenSet[int] = RETRYABLE_STATUSES,
+        rand: Callable[[], float] = random.random
+    ):
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_retries: Retries after the first attempt; 0 disables retrying
+            backoff_base: Backoff cap, in seconds, before the first retry; doubled for every retry after
+            backoff_max: Largest backoff cap, in seconds
+            max_retry_after: Longest Retry-After, in seconds, worth waiting for; longer ones fail instead
+            methods: HTTP verbs that may be retried
+            statuses: HTTP statuses that may be retried
+            rand: Source of uniform [0, 1) jitter, injectable for tests
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retry_after = max_retry_after
+        self.methods = methods
+        self.statuses = statuses
+        self.rand = rand
+        self.retries = 0
+
+    def is_retryable_status(self, status: int) -> bool:
+        return status in self.statuses
+
+    def delay(self, method: str, attempt: int, retry_after: Optional[float] = None, sent: bool = True) -> Optional[float]:
+        """
+        Decide whether a failed attempt is retried, and after how long.
+
+        A retry that could not start before the current deadline runs out is not attempted.
+
+        Args:
+            method: The HTTP verb of the call
+            attempt: The number of the failed attempt, starting at 0
+            retry_after: Seconds the server asked us to wait, if it did
+            sent: Whether the request may have reached the server; one that provably
+                did not, e.g. because the connection was refused, is retried whatever its verb
+
+        Returns:
+            Seconds to wait before retrying, or None to give up
+        """
+        if (sent and method not in self.methods) or attempt >= self.max_retries:
+            return None
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            delay = retry_after
+        else:
+            delay = self.rand() * min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        left = remaining()
+        if left is not None and delay >= left:
+            return None
+        self.retries += 1
+        return delay
+
+class CircuitBreaker:
+    """
+    Fail fast while the API is down.
+
+    After failure_threshold consecutive failures the breaker opens and calls are
+    rejected without touching the network. Once reset_timeout has passed it goes
+    half-open and lets calls through: the first success closes it again, and the
+    first failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker; 0 disables it
+            reset_timeout: Seconds the breaker stays open before letting a call through
+            clock: Monotonic time source, injectable for tests
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may go out, counting it as rejected if not.
+
+        Returns:
+            False while the breaker is open, True otherwise
+        """
+        with self._lock:
+            if self._current_state() == self.OPEN:
+                self.rejected += 1
+                return False
+            return True
+
+    def record_success(self) -> None:
+        """Record a call the API answered, closing the breaker."""
+        with self._lock:
+            self.consecutive_failures = 0
+            self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        """Record a call that failed at the connection level or with a 5xx, possibly opening the breaker."""
+        with self._lock:
+            self.consecutive_failures += 1
+            state = self._current_state()
+            tripped = self.failure_threshold > 0 and self.consecutive_failures >= self.failure_threshold
+            if state == self.HALF_OPEN or (state == self.CLOSED and tripped):
+                self._state = self.OPEN
+                self._opened_at = self.clock()
+                self.times_opened += 1
+
+    def stats(self) -> Dict[str, Union[str, int]]:
+        """
+        Get the breaker's state and counters.
+
+        Returns:
+            Dict with the current state, consecutive failures, how many times the
+            breaker opened and how many calls it rejected
+        """
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self.consecutive_failures,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+            }
@@ -0,0 +1,125 @@
+# singleflight.py
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class _Call:
+    """An in-flight call that other threads can wait on."""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls made from different threads.
+
+    The first caller for a key runs the call; every caller that arrives while it
+    is in flight waits and receives the same result, or the same exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn, unless a call for the same key is already in flight.
+
+        Args:
+            key: Identifies identical calls
+            fn: The call to make
+
+        Returns:
+            The result of fn, shared with every concurrent caller for the key
+
+        Raises:
+            Whatever fn raised, re-raised in every concurrent caller for the key
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+                self.calls += 1
+            else:
+                leader = False
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the coalescing counters.
+
+        Returns:
+            Dict with the number of upstream calls made, calls coalesced onto them
+            and calls currently in flight
+        """
+        with self._lock:
+            return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+class AsyncSingleFlight:
+    """
+    Coalesce concurrent identical coroutine calls on one event loop.
+
+    The call runs as its own task, so a caller being cancelled does not cancel
+    it for everyone else still waiting on the result.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn(), unless a call for the same key is already in flight.
+
+        Args:
+            key: Identifies identical calls
+            fn: Coroutine function making the call
+
+        Returns:
+            The result of fn(), shared with every concurrent caller for the key
+
+        Raises:
+            Whatever fn() raised, re-raised in every concurrent caller for the key
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        """Drop a finished call, marking its exception retrieved in case every caller was cancelled."""
+        self._tasks.pop(key, None)
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the coalescing counters. See SingleFlight.stats."""
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._tasks)}
@@ -0,0 +1,78 @@
+"""
+Benchmark of the club-scoped reads of the local Database as the number of clubs grows.
+
+Every club has the same size, so reads that cost O(club size) take the same
+time however many clubs share the database, while the previous get_club,
+which read every member, book and discussion, slows down with it. Run from
+the repository root:
+
+    python benchmarks/club_reads.py [--clubs 10 100 1000] [--members 50] [--repeat 200]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add parent directory to path to import the database module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.local_database import Database
+from local_get_club import legacy_get_club
+
+SESSIONS_PER_CLUB = 4
+DISCUSSIONS_PER_SESSION = 3
+
+def populate(db, clubs, members):
+    """Fill the database with clubs of the same size, each with sessions and discussions."""
+    with db.transaction() as connection:
+        for c in range(clubs):
+            club_id = f"club-{c}"
+            connection.execute("INSERT INTO Clubs (id, name) VALUES (?, ?)", (club_id, f"Club {c}"))
+            for s in range(SESSIONS_PER_CLUB):
+                session_id = f"{club_id}-session-{s}"
+                book_id = connection.execute(
+                    "INSERT INTO Books (title, author) VALUES (?, ?)", (f"Book {s}", "Author")
+                ).lastrowid
+                connection.execute(
+                    "INSERT INTO Sessions (id, club_id, book_id, dueDate) VALUES (?, ?, ?, ?)",
+                    (session_id, club_id, book_id, "2025-01-01")
+                )
+                db.upsert_discussions(
+                    {"id": f"{session_id}-disc-{d}", "session_id": session_id, "title": "Discussion", "date": "2025-01-01"}
+                    for d in range(DISCUSSIONS_PER_SESSION)
+                )
+        db.upsert_members({"id": i, "name": f"Member {i}"} for i in range(clubs * members))
+        db.link_members((i, f"club-{i // members}") for i in range(clubs * members))
+
+def per_call(repeat, read):
+    """Time a read, in microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        read()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clubs", type=int, nargs="+", default=[10, 100, 1000], help="Numbers of clubs to measure")
+    parser.add_argument("--members", type=int, default=50, help="Members per club")
+    parser.add_argument("--repeat", type=int, default=200, help="Calls per measurement")
+    args = parser.parse_args()
+
+    reads = ("get_club", "get_active_session", "iter_members", "legacy get_club")
+    print(f"{'clubs':>6}  " + "  ".join(f"{name + ' (us)':>22}" for name in reads))
+    for clubs in args.clubs:
+        with tempfile.TemporaryDirectory() as directory:
+            db = Database(os.path.join(directory, "bench.db"))
+            populate(db, clubs, args.members)
+            club_id = f"club-{clubs // 2}"
+            timings = [
+                per_call(args.repeat, lambda: db.get_club(club_id)),
+                per_call(args.repeat, lambda: db.get_active_session(club_id)),
+                per_call(args.repeat, lambda: list(db.iter_members(club_id, page_size=20))),
+                per_call(max(1, args.repeat // 20), lambda: legacy_get_club(db)),
+            ]
+            print(f"{clubs:>6}  " + "  ".join(f"{timing:>22.1f}" for timing in timings))
+            db.close()
+
+if __name__ == "__main__":
+    main()
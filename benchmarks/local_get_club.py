@@ -0,0 +1,149 @@
+"""
+Benchmark of Database.get_club on large clubs.
+
+Compares the current set-based read with the previous one, which looked up
+each member's clubs one query at a time and loaded every book and discussion
+in the database. Run from the repository root:
+
+    python benchmarks/local_get_club.py [--members 10000 100000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add parent directory to path to import the database module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.local_database import Database, StorageProfile
+
+CLUB_ID = "club-0"
+OTHER_CLUBS = 20
+SESSIONS_PER_CLUB = 10
+DISCUSSIONS_PER_SESSION = 5
+
+def legacy_get_club(db):
+    """The previous Database.get_club, kept here to measure against."""
+    connection = db.connection
+    club = connection.execute("SELECT * FROM Clubs").fetchone()
+    members = connection.execute("SELECT * FROM Members").fetchall()
+    sessions = connection.execute("SELECT * FROM Sessions ORDER BY dueDate DESC, rowid DESC").fetchall()
+    connection.execute("SELECT * FROM Books").fetchall()
+    discussions = connection.execute("SELECT * FROM Discussions").fetchall()
+
+    members_data = []
+    for member in members:
+        clubs = connection.execute("SELECT club_id FROM MemberClubs WHERE member_id = ?", (member[0],)).fetchall()
+        members_data.append({
+            "id": member[0],
+            "name": member[1],
+            "points": member[2],
+            "clubs": [club_id[0] for club_id in clubs],
+            "numberOfBooksRead": member[3]
+        })
+
+    # The active session is the club's session due last, as in Database.get_active_session
+    club_sessions = [session for session in sessions if session[1] == club[0]]
+    session_data = None
+    if club_sessions:
+        session = club_sessions[0]
+        book = connection.execute("SELECT * FROM Books WHERE id = ?", (session[2],)).fetchone()
+        session_data = {
+            "id": session[0],
+            "club_id": session[1],
+            "book": {"title": book[1], "author": book[2], "edition": book[3], "year": book[4], "ISBN": book[5]},
+            "dueDate": session[3],
+            "defaultChannel": session[4],
+            "shameList": [],
+            "discussions": [
+                {"id": d[0], "session_id": d[1], "title": d[2], "date": d[3], "location": d[4]}
+                for d in discussions if d[1] == session[0]
+            ]
+        }
+
+    return {
+        "id": club[0],
+        "name": club[1],
+        "members": members_data,
+        "activeSession": session_data,
+        "pastSessions": []
+    }
+
+def populate(db, members):
+    """Fill the database with one club of the given size, plus other clubs some members also belong to."""
+    clubs = [CLUB_ID] + [f"club-{i}" for i in range(1, OTHER_CLUBS + 1)]
+    with db.connection:
+        db.connection.executemany("INSERT INTO Clubs (id, name) VALUES (?, ?)", ((club, club.title()) for club in clubs))
+        db.connection.executemany(
+            "INSERT INTO Members (id, name, points, numberOfBooksRead) VALUES (?, ?, ?, ?)",
+            ((i, f"member-{i}", i % 50, i % 7) for i in range(members))
+        )
+        db.connection.executemany(
+            "INSERT INTO MemberClubs (member_id, club_id) VALUES (?, ?)",
+            ((i, CLUB_ID) for i in range(members))
+        )
+        db.connection.executemany(
+            "INSERT INTO MemberClubs (member_id, club_id) VALUES (?, ?)",
+            ((i, clubs[1 + i % OTHER_CLUBS]) for i in range(0, members, 3))
+        )
+        for club in clubs:
+            for s in range(SESSIONS_PER_CLUB):
+                session_id = f"{club}-session-{s}"
+                book_id = db.connection.execute(
+                    "INSERT INTO Books (title, author, edition, year, ISBN) VALUES (?, ?, ?, ?, ?)",
+                    (f"Book {s}", "Author", "", 2000 + s, 0)
+                ).lastrowid
+                db.connection.execute(
+                    "INSERT INTO Sessions (id, club_id, book_id, dueDate, defaultChannel) VALUES (?, ?, ?, ?, ?)",
+                    (session_id, club, book_id, "2025-01-01", 1234)
+                )
+                db.connection.executemany(
+                    "INSERT INTO Discussions (id, session_id, title, date, location) VALUES (?, ?, ?, ?, ?)",
+                    ((f"{session_id}-disc-{d}", session_id, f"Discussion {d}", "2025-01-01", "virtual")
+                     for d in range(DISCUSSIONS_PER_SESSION))
+                )
+
+def count_queries(db, read):
+    """Count the statements a read issues."""
+    statements = []
+    db.connection.set_trace_callback(statements.append)
+    try:
+        read()
+    finally:
+        db.connection.set_trace_callback(None)
+    return len(statements)
+
+def best_of(repeat, read):
+    """Time a read, keeping the best of several runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--members", type=int, nargs="+", default=[10_000, 100_000], help="Club sizes to measure")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement, keeping the best")
+    args = parser.parse_args()
+
+    print(f"{'members':>8}  {'read':<8} {'queries':>8} {'seconds':>9}")
+    for members in args.members:
+        with tempfile.TemporaryDirectory() as directory:
+            # Read through the writer, so its trace callback sees every query
+            db = Database(os.path.join(directory, "bench.db"), profile=StorageProfile(readers=0))
+            populate(db, members)
+            legacy = legacy_get_club(db)
+            current = db.get_club(CLUB_ID)
+            assert [m["id"] for m in legacy["members"]] == [m["id"] for m in current["members"]]
+            assert legacy["activeSession"] == current["activeSession"]
+
+            for name, read in (("legacy", lambda: legacy_get_club(db)), ("current", lambda: db.get_club(CLUB_ID))):
+                queries = count_queries(db, read)
+                seconds = best_of(args.repeat, read)
+                print(f"{members:>8}  {name:<8} {queries:>8} {seconds:>9.4f}")
+            db.close()
+
+if __name__ == "__main__":
+    main()
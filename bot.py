@@ -11,13 +11,20 @@ from datetime import datetime
 from discord.ext import commands
 
 from config import BotConfig
-from api import BookClubAPI
+from api import AsyncBookClubAPI
+from api.delta import ClubSync
+from api.metrics import MetricsRegistry, serve_metrics
+from api.rate_limit import RateLimiter
+from database.async_database import AsyncDatabase
+from database.local_database import Database
+from database.mirror import ClubMirror
 from services.openai_service import OpenAIService
-from utils.constants import DEFAULT_CHANNEL, GENERIC_ERRORS, RESOURCE_NOT_FOUND_MESSAGES, VALIDATION_MESSAGES, AUTH_MESSAGES, CONNECTION_MESSAGES
+from utils.constants import DEFAULT_CHANNEL, GENERIC_ERRORS, RESOURCE_NOT_FOUND_MESSAGES, VALIDATION_MESSAGES, AUTH_MESSAGES, CONNECTION_MESSAGES, TIMEOUT_MESSAGES
 from events.message_handler import setup_message_handlers
 from utils.schedulers import setup_scheduled_tasks
 
 from api.bookclub_api import ResourceNotFoundError, ValidationError, AuthenticationError, APIError
+from utils.deadline import DeadlineExceeded
 
 class BookClubBot(commands.Bot):
     """Main bot class"""
@@ -34,26 +41,58 @@ class BookClubBot(commands.Bot):
         self.config = BotConfig()
         
         # Initialize services
-        self.api = BookClubAPI(self.config.SUPABASE_URL, self.config.SUPABASE_KEY)
+        self.metrics = MetricsRegistry()
+        self.metrics_server = None
+        self.api = AsyncBookClubAPI(
+            self.config.SUPABASE_URL,
+            self.config.SUPABASE_KEY,
+            cache_ttl=self.config.API_CACHE_TTL,
+            rate_limiter=RateLimiter(
+                interactive_rate=self.config.API_RATE_INTERACTIVE,
+                background_rate=self.config.API_RATE_BACKGROUND
+            ),
+            metrics=self.metrics
+        )
+        self.club_sync = ClubSync(self.api, self.config.DEFAULT_CLUB_ID)
+        self.mirror = None
+        if self.config.MIRROR_DB_PATH:
+            # Commands read the club from the local copy; writes still reach Supabase first
+            self.mirror = ClubMirror(self.api, Database(self.config.MIRROR_DB_PATH), self.config.DEFAULT_CLUB_ID, self.club_sync)
+            self.api = self.mirror
+        self.db = None
+        if self.config.LOCAL_DB_PATH:
+            # Opened only when configured, since it starts a writer thread
+            self.db = AsyncDatabase(Database(self.config.LOCAL_DB_PATH))
         self.openai_service = OpenAIService(self.config.KEY_OPENAI)
         
-        # Load club data
-        self.load_session_details()
-        
         # Register cogs
         self.load_cogs()
         
         # Setup message handlers
         setup_message_handlers(self)
         
-    def load_session_details(self):
+    @property
+    def club(self):
+        """The club as of its last sync (see utils/schedulers.py)"""
+        return self.club_sync.club
+
+    async def load_session_details(self):
         """Load session details from the database"""
-        self.club = self.api.get_club(self.config.DEFAULT_CLUB_ID)
+        if self.mirror is None:
+            await self.club_sync.refresh()
+            return
+        await self.mirror.hydrate()
+        if self.club_sync.synced_at is None:
+            self.logger.warning("Supabase is unreachable; serving the club from the local mirror")
 
     async def setup_hook(self):
         """Setup hook called when bot is being prepared to connect"""
+        await self.load_session_details()  # Load club data
         await self.tree.sync()  # Sync slash commands
         setup_scheduled_tasks(self)
+        if self.config.METRICS_PORT:
+            self.metrics_server = serve_metrics(self.metrics, port=self.config.METRICS_PORT)
+            self.logger.info(f"Serving metrics on port {self.config.METRICS_PORT}")
         self.loop.create_task(self.print_nickname())
         self.tree.on_error = self.on_command_error # Set up global error handler
         self.logger.info("Command error handler registered")
@@ -63,7 +102,17 @@ class BookClubBot(commands.Bot):
         await self.wait_until_ready()
         for guild in self.guilds:
             nickname = guild.me.nick or guild.me.name
-            print(f"[DEBUG] ~~~~~~~~~~~~ Instance initialized as '{nickname}' ~~~~~~~~~~~~\nwith metadata: \n{json.dumps(self.club, separators=(',', ':'))}")
+            print(f"[DEBUG] ~~~~~~~~~~~~ Instance initialized as '{nickname}' ~~~~~~~~~~~~\nwith metadata: \n{json.dumps(self.club.to_dict(), separators=(',', ':'))}")
+
+    async def close(self):
+        """Close the API client's connection pool, the local database and the metrics endpoint along with the bot"""
+        if self.metrics_server is not None:
+            self.metrics_server.shutdown()
+            self.metrics_server.server_close()
+        await self.api.close()
+        if self.db is not None:
+            await self.db.close()
+        await super().close()
 
     def load_cogs(self):
         """Load all command cogs"""
@@ -116,9 +165,14 @@ class BookClubBot(commands.Bot):
         """Handle errors in application commands gracefully"""
         self.logger.error(f"Error in command {interaction.command.name if interaction.command else 'unknown'}: {error}")
         
+        # Errors raised inside a command reach us wrapped in CommandInvokeError
+        error = getattr(error, 'original', error)
+        
         # Select appropriate message based on error type
         error_message = ""
-        if isinstance(error, ResourceNotFoundError):
+        if isinstance(error, DeadlineExceeded):
+            error_message = random.choice(TIMEOUT_MESSAGES)
+        elif isinstance(error, ResourceNotFoundError):
             error_message = random.choice(RESOURCE_NOT_FOUND_MESSAGES)
         elif isinstance(error, ValidationError):
             error_message = random.choice(VALIDATION_MESSAGES)
@@ -2,8 +2,10 @@
 Session-related commands (book, duedate, session, discussions)
 """
 import discord
+from datetime import date
 from discord import app_commands
 
+from utils.deadline import deadline
 from utils.embeds import create_embed
 
 def setup_session_commands(bot):
@@ -13,12 +15,14 @@ def setup_session_commands(bot):
     Args:
         bot: The bot instance
     """
-    async def _get_active_session(interaction):
+    async def _get_active_session(interaction, include):
         """
         Helper function to get active session data
         
         Args:
             interaction: The Discord interaction
+            include: The fields of the active session the command renders,
+                e.g. ['book'], so only those are fetched
             
         Returns:
             Tuple of (club_data, session_data) if successful
@@ -27,42 +31,48 @@ def setup_session_commands(bot):
         # Get the club ID from bot config (or use a default if not available)
         club_id = getattr(bot.config, 'DEFAULT_CLUB_ID', 'club-1')
         
-        # Get club data from API
-        club_data = bot.api.get_club(club_id)
+        # Serve the synced club while it is recent enough, otherwise get it from the API
+        # within the command's time budget
+        club_data = bot.club_sync.fresh(bot.config.CLUB_SYNC_MAX_STALENESS)
+        if club_data is None:
+            with deadline(bot.config.COMMAND_DEADLINE):
+                club_data = await bot.api.get_club(
+                    club_id, include=[f"active_session.{field}" for field in include]
+                )
         
         # Check if there's an active session
-        if not club_data.get('active_session'):
+        if not club_data.active_session:
             await interaction.followup.send("There is no active reading session right now.")
             return None, None
             
-        return club_data, club_data['active_session']
+        return club_data, club_data.active_session
 
     @bot.tree.command(name="book", description="Show current book details")
     async def book_command(interaction: discord.Interaction):
         await interaction.response.defer()  # Defer the response while we fetch data
         
         # Get active session data
-        club_data, session = await _get_active_session(interaction)
+        club_data, session = await _get_active_session(interaction, ['book'])
         if not session:
             return
             
-        book = session['book']
+        book = session.book
         
         embed = create_embed(
             title="📚 Current Book",
-            description=f"**{book['title']}**",
+            description=f"**{book.title}**",
             color_key="info",
             fields=[
-                {"name": "Author", "value": f"{book['author']}"}
+                {"name": "Author", "value": f"{book.author}"}
             ],
             footer="Happy reading! 📖"
         )
         
         # Add extra book details if available
-        if book.get('year'):
-            embed.add_field(name="Year", value=str(book['year']), inline=True)
-        if book.get('edition'):
-            embed.add_field(name="Edition", value=book['edition'], inline=True)
+        if book.year:
+            embed.add_field(name="Year", value=str(book.year), inline=True)
+        if book.edition:
+            embed.add_field(name="Edition", value=book.edition, inline=True)
             
         await interaction.followup.send(embed=embed)
         print("Sent book command response.")
@@ -72,11 +82,11 @@ def setup_session_commands(bot):
         await interaction.response.defer()
         
         # Get active session data
-        club_data, session = await _get_active_session(interaction)
+        club_data, session = await _get_active_session(interaction, ['due_date'])
         if not session:
             return
             
-        due_date = session['due_date']
+        due_date = session.due_date or "TBD"
         
         embed = create_embed(
             title="📅 Due Date",
@@ -91,35 +101,35 @@ def setup_session_commands(bot):
         await interaction.response.defer()
         
         # Get active session data
-        club_data, session = await _get_active_session(interaction)
+        club_data, session = await _get_active_session(interaction, ['book', 'due_date', 'discussions'])
         if not session:
             return
             
-        book = session['book']
+        book = session.book
         
         fields = [
             {
                 "name": "Book",
-                "value": f"{book['title']}",
+                "value": f"{book.title}",
                 "inline": True
             },
             {
                 "name": "Author",
-                "value": f"{book['author']}",
+                "value": f"{book.author}",
                 "inline": True
             },
             {
                 "name": "Due Date",
-                "value": f"{session['due_date']}",
+                "value": f"{session.due_date or 'TBD'}",
                 "inline": False
             }
         ]
         
         # Add discussion count if available
-        if session.get('discussions') and len(session['discussions']) > 0:
+        if session.discussions:
             fields.append({
                 "name": "Discussions",
-                "value": f"{len(session['discussions'])} scheduled",
+                "value": f"{len(session.discussions)} scheduled",
                 "inline": True
             })
         
@@ -137,26 +147,24 @@ def setup_session_commands(bot):
         await interaction.response.defer()
         
         # Get active session data
-        club_data, session = await _get_active_session(interaction)
+        club_data, session = await _get_active_session(interaction, ['discussions'])
         if not session:
             return
             
         # Check if there are any discussions
-        if not session.get('discussions') or len(session['discussions']) == 0:
+        if not session.discussions:
             await interaction.followup.send("There are no discussions scheduled for this session.")
             return
             
-        discussions = session['discussions']
-        
-        # Sort discussions by date
-        discussions.sort(key=lambda x: x['date'])
+        # Sort discussions by date, undated ones last; the session's discussions are an immutable tuple
+        discussions = sorted(session.discussions, key=lambda x: (x.date is None, x.date or date.min))
         
         # Create fields for each discussion
         fields = []
         for i, discussion in enumerate(discussions):
             fields.append({
-                "name": f"Discussion {i+1}: {discussion['title']}",
-                "value": f"**Date**: {discussion['date']}\n**Location**: {discussion.get('location', 'TBD')}",
+                "name": f"Discussion {i+1}: {discussion.title}",
+                "value": f"**Date**: {discussion.date or 'TBD'}\n**Location**: {discussion.location or 'TBD'}",
                 "inline": False
             })
         
@@ -174,16 +182,18 @@ def setup_session_commands(bot):
         """Ask OpenAI for a summary of the active book."""
         await interaction.response.defer()
         
-        # Get active session data
-        club_data, session = await _get_active_session(interaction)
-        if not session:
-            return
+        # One budget covers both the API and the OpenAI call
+        with deadline(bot.config.COMMAND_DEADLINE):
+            # Get active session data
+            club_data, session = await _get_active_session(interaction, ['book'])
+            if not session:
+                return
+                
+            book_title = session.book.title
             
-        book_title = session['book']['title']
-        
-        response = await bot.openai_service.get_response(
-            f"What is {book_title} about?"
-        )
+            response = await bot.openai_service.get_response(
+                f"What is {book_title} about?"
+            )
         embed = create_embed(
             title="🤖 Book Summary",
             description=response,
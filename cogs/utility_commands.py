@@ -6,6 +6,7 @@ import discord
 from discord import app_commands
 
 from utils.constants import FUN_FACTS, FACT_CLOSERS
+from utils.deadline import deadline
 from utils.embeds import create_embed
 from services.weather_service import WeatherService
 
@@ -24,7 +25,8 @@ def setup_utility_commands(bot):
         print(f"Weather command received for location: {location}")
         await interaction.response.defer()  # Defer the response since weather API call might take time
         
-        weather_info = await weather_service.get_weather(location)
+        with deadline(bot.config.COMMAND_DEADLINE):
+            weather_info = await weather_service.get_weather(location)
         embed = create_embed(
             title=f"🌤 Weather for {location.title()}",
             description=weather_info,
@@ -53,7 +55,8 @@ def setup_utility_commands(bot):
         """Make prompt to OpenAI."""
         await interaction.response.defer()  # Defer the response since API call might take time
         
-        response = await bot.openai_service.get_response(prompt)
+        with deadline(bot.config.COMMAND_DEADLINE):
+            response = await bot.openai_service.get_response(prompt)
         embed = create_embed(
             title="🤖 Robot Response",
             description=response,
@@ -66,7 +69,8 @@ def setup_utility_commands(bot):
     @bot.command()
     async def robot(ctx, *, prompt: str):
         """Make prompt to OpenAI."""
-        response = await bot.openai_service.get_response(prompt)
+        with deadline(bot.config.COMMAND_DEADLINE):
+            response = await bot.openai_service.get_response(prompt)
         embed = create_embed(
             title="🤖 Robot Response",
             description=response,
@@ -31,6 +31,29 @@ class BotConfig:
         # API Keys    
         self.KEY_WEATHER = os.getenv("KEY_WEATHER")
         self.KEY_OPENAI = os.getenv("KEY_OPEN_AI")
+
+        # Seconds that club, member and session reads are served from the API client's cache
+        self.API_CACHE_TTL = float(os.getenv("API_CACHE_TTL", "60"))
+
+        # Edge function calls per second, for commands and for background jobs; 0 disables the limit
+        self.API_RATE_INTERACTIVE = float(os.getenv("API_RATE_INTERACTIVE", "10"))
+        self.API_RATE_BACKGROUND = float(os.getenv("API_RATE_BACKGROUND", "5"))
+
+        # Seconds a deferred command may spend on outbound calls before replying with a fallback
+        self.COMMAND_DEADLINE = float(os.getenv("COMMAND_DEADLINE", "30"))
+
+        # Seconds between pulls of the club's changes, and the oldest synced club commands may still read
+        self.CLUB_SYNC_INTERVAL = float(os.getenv("CLUB_SYNC_INTERVAL", "60"))
+        self.CLUB_SYNC_MAX_STALENESS = float(os.getenv("CLUB_SYNC_MAX_STALENESS", "180"))
+
+        # Local port to serve API client metrics on for Prometheus to scrape; 0 disables the endpoint
+        self.METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+        # Local SQLite database the bot records members who join in; unset disables it
+        self.LOCAL_DB_PATH = os.getenv("LOCAL_DB_PATH", "")
+
+        # Serve the club from a local SQLite copy of Supabase, which keeps reads working through outages
+        self.MIRROR_DB_PATH = os.getenv("MIRROR_DB_PATH", "")
         
         # Print debug information
         self._debug_print()
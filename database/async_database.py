@@ -0,0 +1,241 @@
+"""
+Asyncio front end for the local SQLite database.
+
+SQLite calls block, so coroutines must not make them on the event loop.
+AsyncDatabase hands writes to a single writer thread through a queue and
+reads to a small pool of reader threads, and returns awaitables with the
+same method names as Database:
+
+    db = AsyncDatabase(Database("local_bookclub.db"))
+    await db.add_member(member.id, member.name, 0, 0, [club_id])
+    club = await db.get_club(club_id)
+
+Writes that queue up while the writer is busy are committed together, one
+transaction per batch, which amortizes the cost of syncing to disk. Each
+write still succeeds or fails on its own: it runs under a savepoint, and
+its awaitable resolves only once the batch has committed.
+"""
+import asyncio
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+from database.local_database import Database
+
+DEFAULT_MAX_BATCH = 100
+
+# A queued write: the method to run, its arguments, and the future for its result
+Write = Tuple[Callable[..., Any], tuple, dict, asyncio.Future]
+
+_STOP = object()
+
+class AsyncDatabase:
+    """Awaitable access to a local Database, with writes batched on a dedicated thread."""
+
+    def __init__(self, db: Database, max_batch: int = DEFAULT_MAX_BATCH, batch_window: float = 0.0):
+        """
+        Initialize the database front end and start its writer thread.
+
+        Args:
+            db: The database to access; its writer connection is only used from the writer thread
+            max_batch: Most writes committed in one transaction
+            batch_window: Seconds the writer waits for more writes after the first of a batch;
+                0 commits whatever is queued at once
+        """
+        self.db = db
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._readers = ThreadPoolExecutor(max_workers=max(1, db.profile.readers), thread_name_prefix="db-reader")
+        self._writer = threading.Thread(target=self._run_writer, name="db-writer", daemon=True)
+        self._closed = False
+        self.writes = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self._writer.start()
+
+    async def __aenter__(self) -> "AsyncDatabase":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Commit the writes still queued, stop the threads and close the database."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._writer.join)
+        self._readers.shutdown(wait=True)
+        self.db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the write batching counters.
+
+        Returns:
+            Dict with the writes committed, the batches they were committed in,
+            the largest batch and the writes still queued
+        """
+        return {
+            "writes": self.writes,
+            "batches": self.batches,
+            "largest_batch": self.largest_batch,
+            "queued": self._queue.qsize(),
+        }
+
+    # Writer
+
+    def _submit(self, method: Callable[..., Any], *args, **kwargs) -> asyncio.Future:
+        if self._closed:
+            raise RuntimeError("AsyncDatabase is closed")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put((method, args, kwargs, future))
+        return future
+
+    def _next_batch(self) -> Optional[List[Write]]:
+        """Wait for a write, then take the writes queued behind it; None once stopped."""
+        first = self._queue.get()
+        if first is _STOP:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch:
+            try:
+                timeout = deadline - time.monotonic()
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)  # Stop after this batch
+                break
+            batch.append(item)
+        return batch
+
+    def _run_writer(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            results = []
+            try:
+                with self.db.transaction() as connection:
+                    for method, args, kwargs, _ in batch:
+                        connection.execute("SAVEPOINT batched_write")
+                        try:
+                            results.append((method(*args, **kwargs), None))
+                        except Exception as e:
+                            connection.execute("ROLLBACK TO batched_write")
+                            results.append((None, e))
+                        connection.execute("RELEASE batched_write")
+            except Exception as e:
+                # The commit itself failed, and every write in the batch with it
+                results = [(None, e)] * len(batch)
+            else:
+                self.writes += len(batch)
+                self.batches += 1
+                self.largest_batch = max(self.largest_batch, len(batch))
+            for (_, _, _, future), (result, error) in zip(batch, results):
+                future.get_loop().call_soon_threadsafe(_resolve, future, result, error)
+
+    # Readers
+
+    async def _read(self, method: Callable[..., Any], *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._readers, method, *args)
+
+    # Database methods
+
+    async def save_club(self, data: Dict) -> None:
+        """See Database.save_club."""
+        return await self._submit(self.db.save_club, data)
+
+    async def update_club(self, club_id: str, name: str) -> None:
+        """See Database.update_club."""
+        return await self._submit(self.db.update_club, club_id, name)
+
+    async def add_member(self, member_id: int, name: str, points: int, number_of_books_read: int, clubs: Iterable[str]) -> None:
+        """See Database.add_member."""
+        return await self._submit(self.db.add_member, member_id, name, points, number_of_books_read, clubs)
+
+    async def upsert_members(self, members: Iterable[Dict], overwrite: bool = True) -> int:
+        """See Database.upsert_members; a generator is consumed on the writer thread."""
+        return await self._submit(self.db.upsert_members, members, overwrite=overwrite)
+
+    async def upsert_discussions(self, discussions: Iterable[Dict], overwrite: bool = True) -> int:
+        """See Database.upsert_discussions."""
+        return await self._submit(self.db.upsert_discussions, discussions, overwrite=overwrite)
+
+    async def link_members(self, pairs: Iterable[Tuple[int, str]]) -> int:
+        """See Database.link_members."""
+        return await self._submit(self.db.link_members, pairs)
+
+    async def add_to_shame_list(self, session_id: str, member_id: int) -> None:
+        """See Database.add_to_shame_list."""
+        return await self._submit(self.db.add_to_shame_list, session_id, member_id)
+
+    async def update_session(
+        self,
+        session_id: str,
+        club_id: Optional[str] = None,
+        book_id: Optional[int] = None,
+        dueDate: Optional[str] = None,
+        defaultChannel: Optional[int] = None
+    ) -> None:
+        """See Database.update_session."""
+        return await self._submit(self.db.update_session, session_id, club_id, book_id, dueDate, defaultChannel)
+
+    async def update_discussion(
+        self,
+        discussion_id: str,
+        session_id: Optional[str] = None,
+        title: Optional[str] = None,
+        date: Optional[str] = None,
+        location: Optional[str] = None
+    ) -> None:
+        """See Database.update_discussion."""
+        return await self._submit(self.db.update_discussion, discussion_id, session_id, title, date, location)
+
+    async def update_member(
+        self,
+        member_id: int,
+        name: Optional[str] = None,
+        points: Optional[int] = None,
+        numberOfBooksRead: Optional[int] = None
+    ) -> None:
+        """See Database.update_member."""
+        return await self._submit(self.db.update_member, member_id, name, points, numberOfBooksRead)
+
+    async def get_club(self, club_id: Optional[str] = None) -> Optional[Dict]:
+        """See Database.get_club."""
+        return await self._read(self.db.get_club, club_id)
+
+    async def get_active_session(self, club_id: str) -> Optional[Dict]:
+        """See Database.get_active_session."""
+        return await self._read(self.db.get_active_session, club_id)
+
+    async def get_session_details(self, session_id: str) -> Optional[Dict]:
+        """See Database.get_session_details."""
+        return await self._read(self.db.get_session_details, session_id)
+
+    async def iter_members(self, club_id: str, page_size: int = 500) -> AsyncIterator[Dict]:
+        """See Database.iter_members; each page is read on a reader thread."""
+        members = self.db.iter_members(club_id, page_size)
+        while True:
+            page = await self._read(lambda: list(itertools.islice(members, page_size)))
+            if not page:
+                return
+            for member in page:
+                yield member
+
+def _resolve(future: asyncio.Future, result: Any, error: Optional[BaseException]) -> None:
+    if future.cancelled():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
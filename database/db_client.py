@@ -6,8 +6,17 @@ from supabase import create_client
 # Load environment variables
 load_dotenv()
 
+# PostgREST resource embedding: related rows come back nested in the row that references them,
+# in the same request. A session with its book and discussions:
+SESSION_COLUMNS = "*, books(*), discussions(*)"
+# A membership with its member, and every club that member belongs to
+MEMBERSHIP_COLUMNS = "member_id, members(*, memberclubs(club_id))"
+
+# Rows written per request by the bulk writes; PostgREST takes the whole chunk as one JSON body
+DEFAULT_CHUNK_SIZE = 500
+
 class Database:
-    def __init__(self):
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE):
         # Initialize connection to Supabase
         self.ENV = os.getenv("ENV")
         if self.ENV == "dev":
@@ -21,120 +30,135 @@ class Database:
             raise ValueError("[ERROR] Missing Supabase credentials in .env file")
             
         self.supabase = create_client(supabase_url, supabase_key)
+        self.chunk_size = chunk_size
     
     def save_club(self, data):
+        """
+        Save a club with its members, active session and discussions.
+
+        Each table is written in bulk, parents before children. Rows that
+        already exist are left as they are, so saving a club again, e.g. after
+        a failure part way through, adds only what is missing.
+
+        Args:
+            data: The club data, as returned by get_club
+        """
         # Insert club data
-        self.supabase.table("clubs").insert({
-            "id": data['id'],
-            "name": data['name']
-        }).execute()
+        self._upsert("clubs", [{"id": data['id'], "name": data['name']}], "id")
         
-        # Insert member data
-        for member in data['members']:
-            self.supabase.table("members").insert({
+        # Insert member data and link members to their clubs
+        self._upsert("members", [
+            {
                 "id": member['id'],
                 "name": member['name'],
                 "points": member['points'],
                 "numberOfBooksRead": member['numberOfBooksRead']
-            }).execute()
-            
-            # Link members to clubs
-            for club_id in member['clubs']:
-                self.supabase.table("memberclubs").insert({
-                    "member_id": member['id'],
-                    "club_id": club_id
-                }).execute()
+            } for member in data['members']
+        ], "id")
+        self._upsert("memberclubs", [
+            {"member_id": member['id'], "club_id": club_id}
+            for member in data['members'] for club_id in member['clubs']
+        ], "member_id,club_id")
         
-        # Insert book data
-        book = data['activeSession']['book']
-        book_response = self.supabase.table("books").insert({
-            "title": book['title'],
-            "author": book['author'],
-            "edition": book['edition'],
-            "year": book['year'],
-            "ISBN": book['ISBN']
-        }).execute()
-        
-        # Get the book ID from the response
-        book_id = book_response.data[0]['id']
+        # Insert book data, unless an earlier save already stored the session or the book
+        session = data['activeSession']
+        saved = self.supabase.table("sessions").select("book_id").eq("id", session['id']).execute().data
+        book_id = saved[0]['book_id'] if saved else self._save_book(session['book'])
         
         # Insert session data
-        session = data['activeSession']
-        self.supabase.table("sessions").insert({
+        self._upsert("sessions", [{
             "id": session['id'],
             "club_id": session['club_id'],
             "book_id": book_id,
             "dueDate": session['dueDate'],
             "defaultChannel": session['defaultChannel']
-        }).execute()
+        }], "id")
         
         # Insert discussion data
-        for discussion in session['discussions']:
-            self.supabase.table("discussions").insert({
+        self._upsert("discussions", [
+            {
                 "id": discussion['id'],
                 "session_id": session['id'],
                 "title": discussion['title'],
                 "date": discussion['date'],
                 "location": discussion['location']
-            }).execute()
+            } for discussion in session['discussions']
+        ], "id")
     
     def update_club(self, club_id, name):
         """Update the name of a club."""
         self.supabase.table("clubs").update({"name": name}).eq("id", club_id).execute()
 
     def add_member(self, member_id, name, points, number_of_books_read, clubs):
-        """Add a new member and associate them with clubs."""
-        self.supabase.table("members").insert({
+        """Add a new member and associate them with clubs, in two requests."""
+        self._upsert("members", [{
             "id": member_id,
             "name": name,
             "points": points,
             "numberOfBooksRead": number_of_books_read
-        }).execute()
+        }], "id")
+        self._upsert("memberclubs", [{"member_id": member_id, "club_id": club_id} for club_id in clubs], "member_id,club_id")
+
+    def _save_book(self, book):
+        """
+        Get the ID of a book, inserting it unless a book with the same title, author and edition exists.
+
+        Books have no key of their own, so this is what keeps a save that failed
+        after its book was inserted from inserting the book again.
+
+        Args:
+            book: The book data
+
+        Returns:
+            The book's ID
+        """
+        query = self.supabase.table("books").select("id").eq("title", book['title']).eq("author", book['author'])
+        query = query.eq("edition", book['edition']) if book['edition'] is not None else query.is_("edition", "null")
+        existing = query.limit(1).execute().data
+        if existing:
+            return existing[0]['id']
         
-        for club_id in clubs:
-            self.supabase.table("memberclubs").insert({
-                "member_id": member_id,
-                "club_id": club_id
-            }).execute()
+        book_response = self.supabase.table("books").insert({
+            "title": book['title'],
+            "author": book['author'],
+            "edition": book['edition'],
+            "year": book['year'],
+            "ISBN": book['ISBN']
+        }).execute()
+        return book_response.data[0]['id']
+
+    def _upsert(self, table, rows, on_conflict, overwrite=False):
+        """
+        Write rows to a table, chunk_size rows per request.
+
+        Args:
+            table: The table to write to
+            rows: The rows, as dicts of column values
+            on_conflict: Comma-separated columns of the unique key that identifies a row
+            overwrite: Whether rows that already exist take the new values or are left as they are
+
+        Returns:
+            The rows written, as returned by Supabase
+        """
+        # Postgres refuses to write the same row twice in one statement, so duplicates are dropped first
+        keys = on_conflict.split(",")
+        unique = list({tuple(row[key] for key in keys): row for row in rows}.values())
+        written = []
+        for start in range(0, len(unique), self.chunk_size):
+            response = self.supabase.table(table).upsert(
+                unique[start:start + self.chunk_size], on_conflict=on_conflict, ignore_duplicates=not overwrite
+            ).execute()
+            written.extend(response.data or [])
+        return written
 
     def get_session_details(self, session_id):
-        """Retrieve session details, including book and discussions."""
-        # Get session details
-        session_response = self.supabase.table("sessions").select("*").eq("id", session_id).execute()
+        """Retrieve session details, including book and discussions, in one request."""
+        session_response = self.supabase.table("sessions").select(SESSION_COLUMNS).eq("id", session_id).execute()
         
         if not session_response.data:
             return None
-            
-        session = session_response.data[0]
-        
-        # Get book details
-        book_response = self.supabase.table("books").select("*").eq("id", session["book_id"]).execute()
-        book = book_response.data[0] if book_response.data else None
-        
-        # Get discussions
-        discussions_response = self.supabase.table("discussions").select("*").eq("session_id", session_id).execute()
         
-        return {
-            "id": session["id"],
-            "club_id": session["club_id"],
-            "book": {
-                "title": book["title"],
-                "author": book["author"],
-                "edition": book["edition"],
-                "year": book["year"],
-                "ISBN": book["ISBN"]
-            },
-            "dueDate": session["dueDate"],
-            "defaultChannel": session["defaultChannel"],
-            "discussions": [
-                {
-                    "id": discussion["id"],
-                    "title": discussion["title"],
-                    "date": discussion["date"],
-                    "location": discussion["location"]
-                } for discussion in discussions_response.data
-            ]
-        }
+        return self._session_data(session_response.data[0])
 
     def add_to_shame_list(self, session_id, member_id):
         """Add a member to the shame list for a session."""
@@ -186,77 +210,118 @@ class Database:
         if update_data:
             self.supabase.table("members").update(update_data).eq("id", member_id).execute()
 
-    # TODO: Stop fetching the first club, and instead fetch the club with the given ID
-    def get_club(self):
-        # Get club data
-        club_response = self.supabase.table("clubs").select("*").execute()
+    def get_club(self, club_id=None):
+        """
+        Reconstruct a club with its members and active session.
+
+        Only the club's own rows are read, so the cost grows with the club, not the database.
+        The club comes with its active session embedded, and its members with their clubs,
+        a page of 500 at a time (see iter_members). Paging stops at the first page that is
+        not full, so a club of fewer than 500 members takes two requests, and every 500
+        members add one more; a club of exactly 500 takes three.
+
+        Args:
+            club_id: The club to read; defaults to the first club
+
+        Returns:
+            The club data, or None if there is no such club
+        """
+        # Get club data, with its latest session
+        query = self.supabase.table("clubs").select(f"*, sessions({SESSION_COLUMNS})") \
+            .order("duedate", desc=True, foreign_table="sessions").limit(1, foreign_table="sessions")
+        club_response = (query.eq("id", club_id) if club_id is not None else query.limit(1)).execute()
         club = club_response.data[0] if club_response.data else None
         
         if not club:
             return None
-            
-        # Get all members
-        members_response = self.supabase.table("members").select("*").execute()
-        
-        # Transform member data
-        members_data = []
-        for member in members_response.data:
-            # Get clubs for this member
-            member_clubs_response = self.supabase.table("memberclubs").select("club_id").eq("member_id", member["id"]).execute()
-            club_ids = [item["club_id"] for item in member_clubs_response.data]
-            
-            members_data.append({
-                "id": member["id"],
-                "name": member["name"],
-                "points": member["points"],
-                "clubs": club_ids,
-                "numberOfBooksRead": member["numberofbooksread"]
-            })
-        
-        # Get session data
-        sessions_response = self.supabase.table("sessions").select("*").execute()
-        
-        # Transform session data
-        session_data = None
-        if sessions_response.data:
-            session = sessions_response.data[0]  # Assuming one active session
-            
-            # Get book for this session
-            book_response = self.supabase.table("books").select("*").eq("id", session["book_id"]).execute()
-            book = book_response.data[0] if book_response.data else None
-            
-            # Get discussions for this session
-            discussions_response = self.supabase.table("discussions").select("*").eq("session_id", session["id"]).execute()
-            
-            session_data = {
-                "id": session["id"],
-                "club_id": session["club_id"],
-                "book": {
-                    "title": book["title"],
-                    "author": book["author"],
-                    "edition": book["edition"],
-                    "year": book["year"],
-                    "ISBN": book["isbn"]
-                },
-                "dueDate": session["duedate"],
-                "defaultChannel": session["defaultchannel"],
-                "shameList": [],
-                "discussions": [
-                    {
-                        "id": discussion["id"],
-                        "session_id": discussion["session_id"],
-                        "title": discussion["title"],
-                        "date": discussion["date"],
-                        "location": discussion["location"]
-                    } for discussion in discussions_response.data
-                ]
-            }
         
         # Return the full reconstructed club data
+        sessions = club.get("sessions") or []
         return {
             "id": club["id"],
             "name": club["name"],
-            "members": members_data,
-            "activeSession": session_data,
+            "members": list(self.iter_members(club["id"])),
+            "activeSession": self._session_data(sessions[0]) if sessions else None,
             "pastSessions": []
-        }
\ No newline at end of file
+        }
+
+    def get_active_session(self, club_id):
+        """
+        Retrieve a club's active session, the one due last, with book and discussions.
+
+        Args:
+            club_id: The club's ID
+
+        Returns:
+            The session data, or None if the club has no session
+        """
+        sessions_response = self.supabase.table("sessions").select(SESSION_COLUMNS).eq("club_id", club_id) \
+            .order("duedate", desc=True).limit(1).execute()
+        if not sessions_response.data:
+            return None
+        return self._session_data(sessions_response.data[0])
+
+    def _session_data(self, session):
+        """Shape a session row, with its book and discussions embedded, like the local database does."""
+        book = session.get("books") or {}
+        return {
+            "id": session["id"],
+            "club_id": session["club_id"],
+            "book": {
+                "title": book.get("title"),
+                "author": book.get("author"),
+                "edition": book.get("edition"),
+                "year": book.get("year"),
+                "ISBN": book.get("isbn")
+            },
+            "dueDate": session["duedate"],
+            "defaultChannel": session["defaultchannel"],
+            "shameList": [],
+            "discussions": [
+                {
+                    "id": discussion["id"],
+                    "session_id": discussion["session_id"],
+                    "title": discussion["title"],
+                    "date": discussion["date"],
+                    "location": discussion["location"]
+                } for discussion in session.get("discussions") or []
+            ]
+        }
+
+    def iter_members(self, club_id, page_size=500):
+        """
+        Iterate over a club's members in ID order, a page at a time.
+
+        Each page is filtered past the last member ID of the previous one
+        (keyset pagination), so deep pages cost no more than the first.
+
+        Args:
+            club_id: The club's ID
+            page_size: Members to read per page
+
+        Yields:
+            Member data, as in get_club
+        """
+        after = None
+        while True:
+            # Page through the club's memberships, each with its member and every club they belong to
+            query = self.supabase.table("memberclubs").select(MEMBERSHIP_COLUMNS).eq("club_id", club_id)
+            if after is not None:
+                query = query.gt("member_id", after)
+            page = query.order("member_id").limit(page_size).execute().data
+            if not page:
+                return
+            
+            for item in page:
+                member = item["members"]
+                yield {
+                    "id": member["id"],
+                    "name": member["name"],
+                    "points": member["points"],
+                    "clubs": sorted(link["club_id"] for link in member.get("memberclubs") or []),
+                    "numberOfBooksRead": member["numberofbooksread"]
+                }
+            
+            if len(page) < page_size:
+                return
+            after = page[-1]["member_id"]
@@ -0,0 +1,734 @@
+"""
+Offline stand-in for the Supabase edge functions, backed by the local SQLite database.
+
+Serves /functions/v1/club, /member and /session (GET/POST/PUT/DELETE) with the
+same JSON shapes as the real functions, including include= projection, ETags,
+the batch endpoints described in api/batch.py and the club change feed
+described in api/delta.py. Latency and failures can be
+injected, which makes it a target for load tests, latency benchmarks and
+resilience tests on a machine with no network:
+
+    python -m database.edge_function_stub --port 8787 --latency 0.05 --error-rate 0.01
+
+and point the client at it with BookClubAPI("http://127.0.0.1:8787", "any-key").
+"""
+import argparse
+import hashlib
+import json
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from api.projection import project
+from database.local_database import DISCUSSIONS_QUERY, Database, iso_date
+
+FUNCTIONS_PREFIX = "/functions/v1/"
+RESOURCE_TYPES = ("club", "member", "session")
+
+Response = Tuple[int, Optional[Dict[str, Any]]]
+
+class NotFound(Exception):
+    """The requested resource does not exist."""
+
+class BadRequest(Exception):
+    """The request is missing or has invalid fields."""
+
+class EdgeFunctionStub:
+    """
+    HTTP server implementing the club, member and session edge functions on top of a local Database.
+
+    The database keeps its own camelCase schema; payloads are translated to and
+    from the API's snake_case on the way through. Requests are serialized with a
+    lock, and each runs in one Database.transaction(), reads included, so it sees
+    and writes one consistent state and fails as a whole. The database must be
+    opened with check_same_thread=False.
+    The club's session due last is its active session, as in Database.get_active_session;
+    the others are past sessions.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        api_key: Optional[str] = None,
+        rand: Callable[[], float] = random.random
+    ):
+        """
+        Initialize the stub; call start() to begin serving.
+
+        Args:
+            db: The database to serve, opened with check_same_thread=False
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free one (see url)
+            latency: Seconds added to every request
+            jitter: Up to this many extra seconds, drawn at random, added to every request
+            error_rate: Fraction of requests, from 0 to 1, answered with error_status instead
+            error_status: Status code of injected failures
+            api_key: If set, requests must send it as a Bearer token
+            rand: Random source in [0, 1), injectable for tests
+        """
+        self.db = db
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.api_key = api_key
+        self.rand = rand
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None  # The transaction of the request being handled
+        self._stats_lock = threading.Lock()
+        self.requests: Dict[str, int] = {}
+        self.injected_errors = 0
+        self.not_modified = 0
+        # Change feed (see api/delta.py): versions start at the startup time in milliseconds, so a version
+        # handed out by an earlier run is always older than the feed and gets a resync
+        self._base_version = int(time.time() * 1000)
+        self.version = self._base_version
+        self._changes: Dict[str, Dict[Tuple[str, Any], int]] = {}
+        # The socket is bound on first use, so a stub used only through call() never listens
+        self._address = (host, port)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def server(self) -> ThreadingHTTPServer:
+        """The HTTP server, bound to its address on first use."""
+        if self._server is None:
+            self._server = ThreadingHTTPServer(self._address, _Handler)
+            self._server.daemon_threads = True
+            self._server.stub = self
+        return self._server
+
+    @property
+    def url(self) -> str:
+        """Base URL to give the API clients."""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "EdgeFunctionStub":
+        """Start serving on a background thread."""
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, name="edge-function-stub", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread.join()
+            self._thread = None
+        if self._server is not None:
+            self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the stub's counters.
+
+        Returns:
+            Dict with requests by 'METHOD resource', injected errors and 304 responses
+        """
+        with self._stats_lock:
+            return {
+                "requests": dict(self.requests),
+                "injected_errors": self.injected_errors,
+                "not_modified": self.not_modified,
+            }
+
+    # Request handling
+
+    def handle(self, method: str, path: str, headers: Dict[str, str], body: Optional[Dict]) -> Tuple[int, Optional[bytes], Dict[str, str]]:
+        """
+        Answer one request.
+
+        Args:
+            method: The HTTP verb
+            path: The request path, with its query string
+            headers: The request headers
+            body: The decoded JSON body, if any
+
+        Returns:
+            Tuple of status code, encoded body (None for none) and response headers
+        """
+        url = urlparse(path)
+        resource_type = url.path[len(FUNCTIONS_PREFIX):] if url.path.startswith(FUNCTIONS_PREFIX) else None
+        with self._stats_lock:
+            key = f"{method} {resource_type}"
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+        delay = self.latency + (self.jitter * self.rand() if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        if self.error_rate and self.rand() < self.error_rate:
+            with self._stats_lock:
+                self.injected_errors += 1
+            return _encode(self.error_status, {"error": "Injected failure"})
+        if self.api_key and headers.get("Authorization") != f"Bearer {self.api_key}":
+            return _encode(401, {"error": "Invalid API key"})
+
+        if resource_type not in RESOURCE_TYPES or not hasattr(self, f"_{method.lower()}_{resource_type}"):
+            return _encode(404, {"error": f"No such function: {url.path}"})
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        status, payload = self.call(method, resource_type, query, body)
+
+        if method == "GET" and status == 200:
+            payload = project(payload, _include(query))
+            status, encoded, response_headers = _encode(status, payload)
+            response_headers["ETag"] = f'"{hashlib.sha1(encoded).hexdigest()[:16]}"'
+            if headers.get("If-None-Match") == response_headers["ETag"]:
+                with self._stats_lock:
+                    self.not_modified += 1
+                return 304, None, {"ETag": response_headers["ETag"]}
+            return status, encoded, response_headers
+        return _encode(status, payload)
+
+    def call(self, method: str, resource_type: str, query: Dict[str, Any], body: Optional[Dict] = None) -> Response:
+        """
+        Run an edge function in-process, without HTTP, latency or failure injection.
+
+        Args:
+            method: The HTTP verb
+            resource_type: 'club', 'member' or 'session'
+            query: The query parameters
+            body: The JSON body, if any
+
+        Returns:
+            Tuple of status code and payload, which for GETs is not projected by include=
+        """
+        handler = getattr(self, f"_{method.lower()}_{resource_type}")
+        try:
+            with self._lock, self.db.transaction() as connection:
+                self._connection = connection
+                try:
+                    return handler(query, body or {})
+                finally:
+                    self._connection = None
+        except NotFound as e:
+            return 404, {"error": str(e)}
+        except (BadRequest, sqlite3.IntegrityError) as e:
+            return 400, {"error": str(e)}
+
+    def _batch_read(self, resource_type: str, ids: str, read: Callable[[Any], Optional[Dict]]) -> Response:
+        """Answer GET ?ids=..., leaving out the IDs that were not found."""
+        payloads = [read(resource_id) for resource_id in ids.split(",") if resource_id]
+        return 200, {f"{resource_type}s": [payload for payload in payloads if payload is not None]}
+
+    def _batch_write(self, resource_type: str, body: Dict, write: Callable[[Dict, bool], None]) -> Response:
+        """Answer PUT {'<type>s': [...], 'upsert': bool} with a per-item outcome; a failed item is undone alone."""
+        results = []
+        for item in body.get(f"{resource_type}s") or ():
+            self._connection.execute("SAVEPOINT batch_item")
+            try:
+                write(item, bool(body.get("upsert")))
+                results.append({"id": item.get("id"), "success": True})
+            except NotFound as e:
+                self._connection.execute("ROLLBACK TO batch_item")
+                results.append({"id": item.get("id"), "status": 404, "error": str(e)})
+            except (BadRequest, sqlite3.IntegrityError) as e:
+                self._connection.execute("ROLLBACK TO batch_item")
+                results.append({"id": item.get("id"), "status": 400, "error": str(e)})
+            self._connection.execute("RELEASE batch_item")
+        return 200, {"results": results}
+
+    # Clubs
+
+    def _get_club(self, query: Dict, body: Dict) -> Response:
+        if "ids" in query:
+            return self._batch_read("club", query["ids"], self._club)
+        if "updated_since" in query:
+            return 200, self._club_changes(_required(query, "id"), query["updated_since"])
+        club = self._club(_required(query, "id"))
+        if club is None:
+            raise NotFound("Club not found")
+        return 200, club
+
+    def _post_club(self, query: Dict, body: Dict) -> Response:
+        name = _required(body, "name")
+        club_id = body.get("id") or str(uuid.uuid4())
+        if self._club_exists(club_id):
+            raise BadRequest(f"Club {club_id} already exists")
+        self._connection.execute("INSERT INTO Clubs (id, name) VALUES (?, ?)", (club_id, name))
+        for member in body.get("members") or ():
+            # Members who already exist keep their details and join the club
+            self._connection.execute(
+                "INSERT OR IGNORE INTO Members (id, name, points, numberOfBooksRead) VALUES (?, ?, ?, ?)",
+                (member["id"], member.get("name"), member.get("points", 0), member.get("books_read", 0))
+            )
+            self._link_clubs(member["id"], [club_id])
+        if body.get("active_session"):
+            self._insert_session(club_id, body["active_session"], body.get("discord_channel"))
+        return 200, {"success": True, "message": "Club created successfully", "club": self._club(club_id)}
+
+    def _put_club(self, query: Dict, body: Dict) -> Response:
+        club_id = _required(body, "id")
+        if not self._club_exists(club_id):
+            raise NotFound("Club not found")
+        if body.get("name"):
+            self._connection.execute("UPDATE Clubs SET name = ? WHERE id = ?", (body["name"], club_id))
+        if "discord_channel" in body:
+            self._connection.execute(
+                "UPDATE Sessions SET defaultChannel = ? WHERE club_id = ?", (body["discord_channel"], club_id)
+            )
+        self._touch(club_id, "club", club_id)
+        return 200, {"success": True, "message": "Club updated successfully", "club": self._club(club_id)}
+
+    def _delete_club(self, query: Dict, body: Dict) -> Response:
+        club_id = _required(query, "id")
+        if not self._club_exists(club_id):
+            raise NotFound("Club not found")
+        for (session_id,) in self._connection.execute("SELECT id FROM Sessions WHERE club_id = ?", (club_id,)).fetchall():
+            self._delete_session_rows(session_id)
+        self._connection.execute("DELETE FROM MemberClubs WHERE club_id = ?", (club_id,))
+        self._connection.execute("DELETE FROM Clubs WHERE id = ?", (club_id,))
+        self._changes.pop(club_id, None)
+        return 200, {"success": True, "message": "Club deleted successfully"}
+
+    def _club_exists(self, club_id: str) -> bool:
+        return self._connection.execute("SELECT 1 FROM Clubs WHERE id = ?", (club_id,)).fetchone() is not None
+
+    def _club(self, club_id: str) -> Optional[Dict]:
+        """Build a club's API payload, or return None if it does not exist."""
+        row = self._connection.execute("SELECT id, name FROM Clubs WHERE id = ?", (club_id,)).fetchone()
+        if row is None:
+            return None
+        members = self._connection.execute("""
+            SELECT m.id, m.name, m.points, m.numberOfBooksRead
+            FROM Members m JOIN MemberClubs mc ON mc.member_id = m.id
+            WHERE mc.club_id = ? ORDER BY m.id
+        """, (club_id,)).fetchall()
+        session_ids = [
+            session_id for (session_id,) in
+            self._connection.execute(
+                "SELECT id FROM Sessions WHERE club_id = ? ORDER BY dueDate, rowid", (club_id,)
+            ).fetchall()
+        ]
+        sessions = [self._session(session_id) for session_id in session_ids]
+        active = sessions[-1] if sessions else None
+        return {
+            "id": row[0],
+            "name": row[1],
+            "version": self.version,
+            "discord_channel": active.pop("discord_channel") if active else None,
+            "members": [
+                {"id": member[0], "name": member[1], "points": member[2], "books_read": member[3]}
+                for member in members
+            ],
+            "active_session": active,
+            "past_sessions": [
+                {"id": session["id"], "book": session["book"], "due_date": session["due_date"]}
+                for session in reversed(sessions[:-1])
+            ],
+            "shame_list": active["shame_list"] if active else [],
+        }
+
+    # Change feed
+
+    def _touch(self, club_id: str, kind: str, entity_id: Any) -> None:
+        """Record that a club's club fields, member, session or discussion changed, at a new version."""
+        self.version += 1
+        self._changes.setdefault(club_id, {})[(kind, entity_id)] = self.version
+
+    def _club_changes(self, club_id: str, since: str) -> Dict:
+        """
+        Build the change-feed response for a club, in the format described in api/delta.py.
+
+        Only what changed is recorded; the payloads are read as they are now, and
+        anything no longer in the club is reported deleted.
+        """
+        try:
+            since = int(since)
+        except ValueError:
+            raise BadRequest("updated_since must be a version number")
+        if not self._club_exists(club_id):
+            raise NotFound("Club not found")
+        if not self._base_version <= since <= self.version:
+            return {"id": club_id, "resync": True}
+
+        delta = {
+            "id": club_id,
+            "version": self.version,
+            "members": [],
+            "sessions": [],
+            "discussions": [],
+            "deleted": {"members": [], "sessions": [], "discussions": []},
+        }
+        for (kind, entity_id), version in self._changes.get(club_id, {}).items():
+            if version <= since:
+                continue
+            if kind == "club":
+                club = self._club(club_id)
+                active = club["active_session"]
+                delta["club"] = {
+                    "name": club["name"],
+                    "discord_channel": club["discord_channel"],
+                    "active_session_id": active["id"] if active else None,
+                    "shame_list": club["shame_list"],
+                }
+                continue
+            payload = self._changed_item(club_id, kind, entity_id)
+            if payload is None:
+                delta["deleted"][f"{kind}s"].append(entity_id)
+            else:
+                delta[f"{kind}s"].append(payload)
+        return delta
+
+    def _changed_item(self, club_id: str, kind: str, entity_id: Any) -> Optional[Dict]:
+        """Get the payload of a changed member, session or discussion, or None if it is no longer in the club."""
+        if kind == "member":
+            row = self._connection.execute("""
+                SELECT m.id, m.name, m.points, m.numberOfBooksRead
+                FROM Members m JOIN MemberClubs mc ON mc.member_id = m.id
+                WHERE m.id = ? AND mc.club_id = ?
+            """, (entity_id, club_id)).fetchone()
+            return {"id": row[0], "name": row[1], "points": row[2], "books_read": row[3]} if row else None
+        if kind == "session":
+            session = self._session(entity_id)
+            if session is None:
+                return None
+            session.pop("discord_channel")
+            session.pop("discussions")
+            return session
+        row = self._connection.execute("""
+            SELECT d.id, d.session_id, d.title, d.date, d.location
+            FROM Discussions d JOIN Sessions s ON s.id = d.session_id
+            WHERE d.id = ? AND s.club_id = ?
+        """, (entity_id, club_id)).fetchone()
+        return {"id": row[0], "session_id": row[1], "title": row[2], "date": row[3], "location": row[4]} if row else None
+
+    # Members
+
+    def _get_member(self, query: Dict, body: Dict) -> Response:
+        if "ids" in query:
+            return self._batch_read("member", query["ids"], self._member)
+        member = self._member(_required(query, "id"))
+        if member is None:
+            raise NotFound("Member not found")
+        return 200, member
+
+    def _post_member(self, query: Dict, body: Dict) -> Response:
+        member_id = self._insert_member(body)
+        return 200, {"success": True, "message": "Member created successfully", "member": self._member(member_id)}
+
+    def _put_member(self, query: Dict, body: Dict) -> Response:
+        if "members" in body:
+            return self._batch_write("member", body, self._write_member)
+        self._write_member(body, upsert=False)
+        return 200, {"success": True, "message": "Member updated successfully", "member": self._member(body["id"])}
+
+    def _delete_member(self, query: Dict, body: Dict) -> Response:
+        member_id = _required(query, "id")
+        if not self._member_exists(member_id):
+            raise NotFound("Member not found")
+        for club_id in self._member_club_ids(member_id):
+            self._touch(club_id, "member", int(member_id))
+            self._touch(club_id, "club", club_id)  # The member leaves the club's shame list too
+        self._connection.execute("DELETE FROM MemberClubs WHERE member_id = ?", (member_id,))
+        self._connection.execute("DELETE FROM ShameList WHERE member_id = ?", (member_id,))
+        self._connection.execute("DELETE FROM Members WHERE id = ?", (member_id,))
+        return 200, {"success": True, "message": "Member deleted successfully"}
+
+    def _member_exists(self, member_id: Any) -> bool:
+        return self._connection.execute("SELECT 1 FROM Members WHERE id = ?", (member_id,)).fetchone() is not None
+
+    def _insert_member(self, member: Dict) -> int:
+        """Insert a member and link it to its clubs, within the caller's transaction."""
+        name = _required(member, "name")
+        member_id = member.get("id")
+        if member_id is None:
+            member_id = self._connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM Members").fetchone()[0]
+        elif self._member_exists(member_id):
+            raise BadRequest(f"Member {member_id} already exists")
+        self._connection.execute(
+            "INSERT INTO Members (id, name, points, numberOfBooksRead) VALUES (?, ?, ?, ?)",
+            (member_id, name, member.get("points", 0), member.get("books_read", 0))
+        )
+        self._link_clubs(member_id, member.get("clubs") or ())
+        for club_id in self._member_club_ids(member_id):
+            self._touch(club_id, "member", member_id)
+        return member_id
+
+    def _write_member(self, member: Dict, upsert: bool) -> None:
+        """Update a member, or create it if upsert is set and it does not exist, within the caller's transaction."""
+        member_id = _required(member, "id")
+        if not self._member_exists(member_id):
+            if not upsert:
+                raise NotFound(f"Member {member_id} not found")
+            self._insert_member(member)
+            return
+        club_ids = self._member_club_ids(member_id)
+        # Columns are set explicitly rather than through Database.update_member, which skips zeroes
+        columns = {"name": "name", "points": "points", "books_read": "numberOfBooksRead"}
+        for field, column in columns.items():
+            if field in member:
+                self._connection.execute(f"UPDATE Members SET {column} = ? WHERE id = ?", (member[field], member_id))
+        if "clubs" in member:
+            self._connection.execute("DELETE FROM MemberClubs WHERE member_id = ?", (member_id,))
+            self._link_clubs(member_id, member["clubs"])
+        for club_id in set(club_ids) | set(self._member_club_ids(member_id)):
+            self._touch(club_id, "member", member_id)
+
+    def _member_club_ids(self, member_id: Any) -> List[str]:
+        return [
+            club_id for (club_id,) in
+            self._connection.execute("SELECT club_id FROM MemberClubs WHERE member_id = ?", (member_id,)).fetchall()
+        ]
+
+    def _link_clubs(self, member_id: int, clubs: List[Any]) -> None:
+        for club in clubs:
+            club_id = club["id"] if isinstance(club, dict) else club
+            self._connection.execute(
+                "INSERT OR IGNORE INTO MemberClubs (member_id, club_id) VALUES (?, ?)", (member_id, club_id)
+            )
+
+    def _member(self, member_id: Any) -> Optional[Dict]:
+        """Build a member's API payload, or return None if they do not exist."""
+        row = self._connection.execute(
+            "SELECT id, name, points, numberOfBooksRead FROM Members WHERE id = ?", (member_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        clubs = self._connection.execute("""
+            SELECT c.id, c.name FROM Clubs c JOIN MemberClubs mc ON mc.club_id = c.id
+            WHERE mc.member_id = ? ORDER BY c.name
+        """, (row[0],)).fetchall()
+        shame_clubs = self._connection.execute("""
+            SELECT DISTINCT c.id, c.name FROM ShameList sl
+            JOIN Sessions s ON s.id = sl.session_id JOIN Clubs c ON c.id = s.club_id
+            WHERE sl.member_id = ? ORDER BY c.name
+        """, (row[0],)).fetchall()
+        return {
+            "id": row[0],
+            "name": row[1],
+            "points": row[2],
+            "books_read": row[3],
+            "clubs": [{"id": club[0], "name": club[1]} for club in clubs],
+            "shame_clubs": [{"id": club[0], "name": club[1]} for club in shame_clubs],
+        }
+
+    # Sessions
+
+    def _get_session(self, query: Dict, body: Dict) -> Response:
+        session = self._session(_required(query, "id"), with_club=True)
+        if session is None:
+            raise NotFound("Session not found")
+        session.pop("discord_channel")
+        return 200, session
+
+    def _post_session(self, query: Dict, body: Dict) -> Response:
+        club_id = _required(body, "club_id")
+        if not self._club_exists(club_id):
+            raise NotFound("Club not found")
+        session_id = self._insert_session(club_id, body)
+        session = self._session(session_id, with_club=True)
+        session.pop("discord_channel")
+        return 200, {"success": True, "message": "Session created successfully", "session": session}
+
+    def _put_session(self, query: Dict, body: Dict) -> Response:
+        session_id = _required(body, "id")
+        row = self._connection.execute("SELECT book_id, club_id FROM Sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None:
+            raise NotFound("Session not found")
+        club_id = row[1]
+        updates = {"book": False, "session": False, "discussions": False}
+        if body.get("book"):
+            book = body["book"]
+            columns = {"title": "title", "author": "author", "edition": "edition", "year": "year", "isbn": "ISBN"}
+            for field, column in columns.items():
+                if field in book:
+                    self._connection.execute(f"UPDATE Books SET {column} = ? WHERE id = ?", (book[field], row[0]))
+            updates["book"] = True
+            self._touch(club_id, "session", session_id)
+        if body.get("due_date"):
+            self._connection.execute("UPDATE Sessions SET dueDate = ? WHERE id = ?", (iso_date(body["due_date"]), session_id))
+            updates["session"] = True
+            self._touch(club_id, "session", session_id)
+        for discussion in body.get("discussions") or ():
+            if discussion.get("id") and self._connection.execute(
+                "SELECT 1 FROM Discussions WHERE id = ? AND session_id = ?", (discussion["id"], session_id)
+            ).fetchone():
+                for field in ("title", "date", "location"):
+                    if field in discussion:
+                        self._connection.execute(
+                            f"UPDATE Discussions SET {field} = ? WHERE id = ?", (discussion[field], discussion["id"])
+                        )
+                self._touch(club_id, "discussion", discussion["id"])
+            else:
+                self._insert_discussion(club_id, session_id, discussion)
+            updates["discussions"] = True
+        for discussion_id in body.get("discussion_ids_to_delete") or ():
+            self._connection.execute(
+                "DELETE FROM Discussions WHERE id = ? AND session_id = ?", (discussion_id, session_id)
+            )
+            self._touch(club_id, "discussion", discussion_id)
+            updates["discussions"] = True
+        return 200, {"success": True, "message": "Session updated successfully", "updates": updates}
+
+    def _delete_session(self, query: Dict, body: Dict) -> Response:
+        session_id = _required(query, "id")
+        if self._connection.execute("SELECT 1 FROM Sessions WHERE id = ?", (session_id,)).fetchone() is None:
+            raise NotFound("Session not found")
+        self._delete_session_rows(session_id)
+        return 200, {"success": True, "message": "Session deleted successfully"}
+
+    def _delete_session_rows(self, session_id: str) -> None:
+        club_id = self._connection.execute("SELECT club_id FROM Sessions WHERE id = ?", (session_id,)).fetchone()[0]
+        for (discussion_id,) in self._connection.execute(
+            "SELECT id FROM Discussions WHERE session_id = ?", (session_id,)
+        ).fetchall():
+            self._touch(club_id, "discussion", discussion_id)
+        self._touch(club_id, "session", session_id)
+        self._touch(club_id, "club", club_id)  # The active session may have been the one deleted
+        self._connection.execute("DELETE FROM Discussions WHERE session_id = ?", (session_id,))
+        self._connection.execute("DELETE FROM ShameList WHERE session_id = ?", (session_id,))
+        self._connection.execute("DELETE FROM Sessions WHERE id = ?", (session_id,))
+
+    def _insert_session(self, club_id: str, session: Dict, discord_channel: Optional[int] = None) -> str:
+        """Insert a session with its book and discussions, within the caller's transaction."""
+        book = _required(session, "book")
+        book_id = self._connection.execute(
+            "INSERT INTO Books (title, author, edition, year, ISBN) VALUES (?, ?, ?, ?, ?)",
+            (_required(book, "title"), _required(book, "author"), book.get("edition"), book.get("year"), book.get("isbn"))
+        ).lastrowid
+        session_id = session.get("id") or str(uuid.uuid4())
+        self._connection.execute(
+            "INSERT INTO Sessions (id, club_id, book_id, dueDate, defaultChannel) VALUES (?, ?, ?, ?, ?)",
+            (session_id, club_id, book_id, iso_date(session.get("due_date")), discord_channel)
+        )
+        for discussion in session.get("discussions") or ():
+            self._insert_discussion(club_id, session_id, discussion)
+        for member_id in session.get("shame_list") or ():
+            self._connection.execute(
+                "INSERT OR IGNORE INTO ShameList (session_id, member_id) VALUES (?, ?)", (session_id, member_id)
+            )
+        self._touch(club_id, "session", session_id)
+        self._touch(club_id, "club", club_id)  # The new session may become the active one
+        return session_id
+
+    def _insert_discussion(self, club_id: str, session_id: str, discussion: Dict) -> None:
+        discussion_id = discussion.get("id") or str(uuid.uuid4())
+        self._connection.execute(
+            "INSERT INTO Discussions (id, session_id, title, date, location) VALUES (?, ?, ?, ?, ?)",
+            (
+                discussion_id, session_id,
+                _required(discussion, "title"), _required(discussion, "date"), discussion.get("location")
+            )
+        )
+        self._touch(club_id, "discussion", discussion_id)
+
+    def _session(self, session_id: str, with_club: bool = False) -> Optional[Dict]:
+        """Build a session's API payload, or return None if it does not exist."""
+        row = self._connection.execute("""
+            SELECT s.id, s.club_id, s.dueDate, s.defaultChannel, b.id, b.title, b.author, b.edition, b.year, b.ISBN
+            FROM Sessions s LEFT JOIN Books b ON b.id = s.book_id
+            WHERE s.id = ?
+        """, (session_id,)).fetchone()
+        if row is None:
+            return None
+        discussions = self._connection.execute(DISCUSSIONS_QUERY, (session_id,)).fetchall()
+        shame_list = self._connection.execute(
+            "SELECT member_id FROM ShameList WHERE session_id = ? ORDER BY member_id", (session_id,)
+        ).fetchall()
+        session = {
+            "id": row[0],
+            "book": {
+                "id": row[4],
+                "title": row[5],
+                "author": row[6],
+                "edition": row[7],
+                "year": row[8],
+                "isbn": row[9],
+            } if row[4] is not None else None,
+            "due_date": row[2],
+            "discord_channel": row[3],
+            "discussions": [
+                {"id": discussion[0], "title": discussion[2], "date": discussion[3], "location": discussion[4]}
+                for discussion in discussions
+            ],
+            "shame_list": [member_id for (member_id,) in shame_list],
+        }
+        if with_club:
+            club = self._connection.execute("SELECT id, name FROM Clubs WHERE id = ?", (row[1],)).fetchone()
+            session["club"] = {"id": club[0], "name": club[1]} if club else None
+        return session
+
+def _required(data: Dict, field: str) -> Any:
+    if data.get(field) in (None, ""):
+        raise BadRequest(f"Missing required field: {field}")
+    return data[field]
+
+def _include(query: Dict[str, str]) -> Optional[List[str]]:
+    return query["include"].split(",") if query.get("include") else None
+
+def _encode(status: int, payload: Optional[Dict]) -> Tuple[int, bytes, Dict[str, str]]:
+    return status, json.dumps(payload).encode("utf-8"), {"Content-Type": "application/json"}
+
+class _Handler(BaseHTTPRequestHandler):
+    """Hands every request to the server's EdgeFunctionStub."""
+    protocol_version = "HTTP/1.1"
+
+    def _dispatch(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            status, encoded, headers = _encode(400, {"error": "Invalid JSON body"})
+        else:
+            status, encoded, headers = self.server.stub.handle(self.command, self.path, dict(self.headers), body)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(encoded or b"")))
+        self.end_headers()
+        if encoded:
+            self.wfile.write(encoded)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _dispatch
+
+    def log_message(self, format, *args):
+        pass  # Load tests would drown in access logs
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the book club edge functions from a local SQLite database")
+    parser.add_argument("--db", default="local_bookclub.db", help="SQLite database file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many random extra seconds per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503, help="Status code of injected failures")
+    parser.add_argument("--api-key", default=None, help="Require this Bearer token")
+    args = parser.parse_args(argv)
+
+    stub = EdgeFunctionStub(
+        Database(args.db, check_same_thread=False), args.host, args.port,
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        error_status=args.error_status, api_key=args.api_key
+    )
+    print(f"Serving edge functions at {stub.url}{FUNCTIONS_PREFIX}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server.server_close()
+
+if __name__ == "__main__":
+    main()
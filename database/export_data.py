@@ -1,6 +1,21 @@
+import argparse
+import gzip
+import io
 import sqlite3
 import json
 import os
+import time
+
+try:
+    import zstandard
+except ImportError:  # zstd compression is optional
+    zstandard = None
+
+# Rows held in memory at a time by the streaming export
+STREAM_BATCH_SIZE = 1000
+
+# File extension of each compression the streaming export supports
+COMPRESSIONS = {None: "", "gzip": ".gz", "zstd": ".zst"}
 
 def export_sqlite_data(db_path="local_bookclub.db"):
     # Print current working directory
@@ -54,6 +69,86 @@ def export_sqlite_data(db_path="local_bookclub.db"):
     except Exception as e:
         print(f"Error: {e}")
 
+def _open_output(path, compression):
+    """Open a text file for writing, compressed as asked."""
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8")
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd compression needs the zstandard package (pip install zstandard)")
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(open(path, "wb")), encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+def export_sqlite_stream(db_path="local_bookclub.db", output_dir="database_export", compression=None, batch_size=STREAM_BATCH_SIZE):
+    """
+    Export every table to its own JSON Lines file, one row per line.
+
+    Rows are read batch_size at a time and written as they are read, so memory
+    use stays flat however large the tables are.
+
+    Args:
+        db_path: The SQLite database to export
+        output_dir: Directory to write <table>.jsonl files to
+        compression: None, 'gzip' or 'zstd' (needs the zstandard package)
+        batch_size: Rows fetched per read
+
+    Returns:
+        Dict with the rows exported per table, the total rows, the seconds taken
+        and the rows per second, or None if the database does not exist
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression}")
+    if not os.path.exists(db_path):
+        print(f"ERROR: Database file '{db_path}' not found!")
+        return None
+    
+    os.makedirs(output_dir, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    try:
+        tables = [
+            table for (table,) in
+            conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';").fetchall()
+        ]
+        print(f"Found tables: {tables}")
+        
+        counts = {}
+        start = time.perf_counter()
+        for table in tables:
+            table_start = time.perf_counter()
+            path = os.path.join(output_dir, f"{table}.jsonl{COMPRESSIONS[compression]}")
+            cursor = conn.execute(f'SELECT * FROM "{table}"')
+            columns = [column[0] for column in cursor.description]
+            count = 0
+            with _open_output(path, compression) as f:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    f.writelines(json.dumps(dict(zip(columns, row))) + "\n" for row in rows)
+                    count += len(rows)
+            counts[table] = count
+            seconds = time.perf_counter() - table_start
+            print(f"Exported {count} rows from table '{table}' to {path} ({count / seconds if seconds else 0:,.0f} rows/sec)")
+        
+        seconds = time.perf_counter() - start
+        rows = sum(counts.values())
+        rate = rows / seconds if seconds else 0.0
+        print(f"Exported {rows} rows in {seconds:.2f}s ({rate:,.0f} rows/sec) to: {os.path.abspath(output_dir)}")
+        return {"tables": counts, "rows": rows, "seconds": seconds, "rows_per_second": rate}
+    finally:
+        conn.close()
+
 # Run the export function
 if __name__ == "__main__":
-    export_sqlite_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Export the local SQLite database")
+    parser.add_argument("--db", default="local_bookclub.db", help="SQLite database file")
+    parser.add_argument("--stream", action="store_true", help="Write one JSON Lines file per table, in constant memory")
+    parser.add_argument("--output-dir", default="database_export", help="Directory for the streamed files")
+    parser.add_argument("--compression", choices=["gzip", "zstd"], default=None, help="Compress the streamed files")
+    parser.add_argument("--batch-size", type=int, default=STREAM_BATCH_SIZE, help="Rows read at a time when streaming")
+    args = parser.parse_args()
+    
+    if args.stream:
+        export_sqlite_stream(args.db, args.output_dir, args.compression, args.batch_size)
+    else:
+        export_sqlite_data(args.db)
\ No newline at end of file
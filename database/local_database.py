@@ -1,17 +1,237 @@
 import sqlite3
 import json
+import queue
+import threading
+from contextlib import contextmanager
+
+from api.models import parse_date
+
+def iso_date(value):
+    """
+    Normalize a due date to the ISO form ('2025-03-31') it is stored in, so dates sort as text.
+
+    Args:
+        value: A date, or a date string in a form parse_date reads (e.g. '3/31/2025')
+
+    Returns:
+        The ISO date string, or the value unchanged if it is not a recognizable date
+    """
+    parsed = parse_date(value)
+    return parsed.isoformat() if parsed is not None else value
+
+# Schema upgrades, in order: applying MIGRATIONS[n] takes a database from
+# PRAGMA user_version n to n + 1. Append new ones; never edit applied ones.
+MIGRATIONS = (
+    # 1: index the columns rows are looked up by besides their primary keys
+    (
+        "CREATE INDEX IF NOT EXISTS idx_MemberClubs_club_id ON MemberClubs (club_id, member_id)",
+        "CREATE INDEX IF NOT EXISTS idx_Sessions_club_id ON Sessions (club_id)",
+        "CREATE INDEX IF NOT EXISTS idx_Discussions_session_id ON Discussions (session_id)",
+        "CREATE INDEX IF NOT EXISTS idx_ShameList_member_id ON ShameList (member_id)",
+    ),
+    # 2: find a club's active session by due date without sorting its sessions
+    (
+        "CREATE INDEX IF NOT EXISTS idx_Sessions_club_id_dueDate ON Sessions (club_id, dueDate)",
+    ),
+    # 3: store due dates saved as M/D/Y in ISO form, which sorts correctly as text
+    (
+        "UPDATE Sessions SET dueDate = iso_date(dueDate) WHERE dueDate LIKE '%/%'",
+    ),
+)
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+# Read queries, kept verbatim so every call hits the connection's prepared-statement cache.
+# Each one seeks through an index on the club or session, so costs grow with the club, not the database.
+
+# A club's members after a member ID, in ID order, with every club each belongs to
+MEMBERS_QUERY = """
+    SELECT m.id, m.name, m.points, m.numberOfBooksRead, group_concat(other.club_id, char(31))
+    FROM MemberClubs mc
+    JOIN Members m ON m.id = mc.member_id
+    JOIN MemberClubs other ON other.member_id = m.id
+    WHERE mc.club_id = ? AND mc.member_id > ?
+    GROUP BY mc.member_id
+    ORDER BY mc.member_id
+    LIMIT ?
+"""
+
+# A club's active session, with its book: the one due last, as in the Supabase client, and the
+# newest of those due the same day. Due dates compare as text, so every write stores them with iso_date
+ACTIVE_SESSION_QUERY = """
+    SELECT s.id, s.club_id, s.dueDate, s.defaultChannel, b.title, b.author, b.edition, b.year, b.ISBN
+    FROM Sessions s LEFT JOIN Books b ON b.id = s.book_id
+    WHERE s.club_id = ?
+    ORDER BY s.dueDate DESC, s.rowid DESC
+    LIMIT 1
+"""
+
+DISCUSSIONS_QUERY = """
+    SELECT id, session_id, title, date, location FROM Discussions
+    WHERE session_id = ?
+    ORDER BY rowid
+"""
+
+class StorageProfile:
+    """How a Database tunes its SQLite connections, and how many readers it pools."""
+
+    def __init__(
+        self,
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        mmap_size=64 * 1024 * 1024,
+        cache_size=-8192,
+        temp_store="MEMORY",
+        cached_statements=256,
+        busy_timeout=5.0,
+        readers=4
+    ):
+        """
+        Initialize the profile.
+
+        Args:
+            journal_mode: Journal mode; WAL lets readers run while a write is in progress
+            synchronous: Sync level; NORMAL only syncs at WAL checkpoints, which is safe in WAL mode
+            mmap_size: Bytes of the database file to memory-map; 0 disables it
+            cache_size: Page cache per connection, in pages, or in KiB if negative
+            temp_store: Where temporary tables and indexes live
+            cached_statements: Prepared statements kept per connection
+            busy_timeout: Seconds to wait for a lock before failing
+            readers: Read-only connections to pool; 0 reads through the writer connection
+        """
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.mmap_size = mmap_size
+        self.cache_size = cache_size
+        self.temp_store = temp_store
+        self.cached_statements = cached_statements
+        self.busy_timeout = busy_timeout
+        self.readers = readers
+
+    def pragmas(self):
+        """The PRAGMA statements to run on every new connection."""
+        return [
+            f"PRAGMA journal_mode = {self.journal_mode}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA mmap_size = {int(self.mmap_size)}",
+            f"PRAGMA cache_size = {int(self.cache_size)}",
+            f"PRAGMA temp_store = {self.temp_store}",
+        ]
 
 class Database:
-    def __init__(self, db_name="local_bookclub.db"):
-        # Initialize a connection to the SQLite database
-        self.connection = sqlite3.connect(db_name)
+    def __init__(self, db_name="local_bookclub.db", check_same_thread=False, profile=None):
+        # One writer connection, serialized by a lock so any thread may use it, plus a pool of
+        # read-only connections so reads neither wait for each other nor for writes. In-memory
+        # databases can't be shared between connections, so they read through the writer.
+        self.profile = profile or StorageProfile()
+        self._write_lock = threading.RLock()
+        self._write_depth = 0
+        self._write_owner = None
+        self._local = threading.local()  # The reader lent to each thread, so nested reads share it
+        self.connection = self._connect(db_name, check_same_thread)
         self.create_tables()  # Create necessary tables
+        self.upgrade_schema()  # Bring older databases up to date
+
+        self._readers = queue.LifoQueue()
+        if db_name not in (":memory:", ""):
+            for _ in range(self.profile.readers):
+                reader = self._connect(db_name, check_same_thread=False)
+                reader.execute("PRAGMA query_only = ON")
+                self._readers.put(reader)
+        self._reader_count = self._readers.qsize()
+
+    def _connect(self, db_name, check_same_thread):
+        connection = sqlite3.connect(
+            db_name,
+            timeout=self.profile.busy_timeout,
+            check_same_thread=check_same_thread,
+            cached_statements=self.profile.cached_statements
+        )
+        for pragma in self.profile.pragmas():
+            connection.execute(pragma)
+        connection.create_function("iso_date", 1, iso_date, deterministic=True)
+        return connection
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run statements on the writer in one transaction, committed at the end or rolled back on error.
+
+        Nested calls, including the write methods called inside one, join the outermost
+        transaction, so several writes compose into one. Reads made through snapshot()
+        on the same thread see the transaction's uncommitted writes.
+
+        Yields:
+            The writer connection
+        """
+        with self._write_lock:
+            if self._write_depth:
+                self._write_depth += 1
+                try:
+                    yield self.connection
+                finally:
+                    self._write_depth -= 1
+                return
+
+            self._write_depth = 1
+            self._write_owner = threading.get_ident()
+            try:
+                self.connection.execute("BEGIN IMMEDIATE")
+                try:
+                    yield self.connection
+                    self.connection.commit()
+                except BaseException:
+                    # Also covers a failed COMMIT, which leaves the transaction open
+                    self.connection.rollback()
+                    raise
+            finally:
+                self._write_depth = 0
+                self._write_owner = None
+
+    @contextmanager
+    def snapshot(self):
+        """
+        Lend a reader for a consistent snapshot of the database; nested snapshots share it.
+
+        Without pooled readers, or inside a transaction() on this thread, reads go
+        through the writer, and see the transaction's writes.
+
+        Yields:
+            A connection to read from
+        """
+        if not self._reader_count or self._write_owner == threading.get_ident():
+            with self._write_lock:
+                yield self.connection
+            return
+        reader = getattr(self._local, "reader", None)
+        if reader is not None:
+            yield reader
+            return
+
+        reader = self._local.reader = self._readers.get()
+        try:
+            reader.execute("BEGIN")
+            try:
+                yield reader
+            finally:
+                reader.rollback()
+        finally:
+            self._local.reader = None
+            self._readers.put(reader)
+
+    def close(self):
+        """Close the writer and every pooled reader."""
+        with self._write_lock:
+            self.connection.close()
+        for _ in range(self._reader_count):
+            self._readers.get().close()
+        self._reader_count = 0
 
     def create_tables(self):
         # Create tables for the schema if they don't already exist
-        with self.connection:
+        with self.transaction() as connection:
             # Create 'Clubs' table
-            self.connection.execute("""
+            connection.execute("""
                 CREATE TABLE IF NOT EXISTS Clubs (
                     id TEXT PRIMARY KEY,
                     name TEXT NOT NULL
@@ -19,7 +239,7 @@ class Database:
             """)
 
             # Create 'Members' table
-            self.connection.execute("""
+            connection.execute("""
                 CREATE TABLE IF NOT EXISTS Members (
                     id INTEGER PRIMARY KEY,
                     name TEXT NOT NULL,
@@ -29,7 +249,7 @@ class Database:
             """)
 
             # Create 'MemberClubs' table
-            self.connection.execute("""
+            connection.execute("""
                 CREATE TABLE IF NOT EXISTS MemberClubs (
                     member_id INTEGER,
                     club_id TEXT,
@@ -40,7 +260,7 @@ class Database:
             """)
 
             # Create 'Sessions' table
-            self.connection.execute("""
+            connection.execute("""
                 CREATE TABLE IF NOT EXISTS Sessions (
                     id TEXT PRIMARY KEY,
                     club_id TEXT NOT NULL,
@@ -52,7 +272,7 @@ class Database:
             """)
 
             # Create 'Books' table
-            self.connection.execute("""
+            connection.execute("""
                 CREATE TABLE IF NOT EXISTS Books (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     title TEXT NOT NULL,
@@ -64,7 +284,7 @@ class Database:
             """)
 
             # Create 'Discussions' table
-            self.connection.execute("""
+            connection.execute("""
                 CREATE TABLE IF NOT EXISTS Discussions (
                     id TEXT PRIMARY KEY,
                     session_id TEXT NOT NULL,
@@ -76,7 +296,7 @@ class Database:
             """)
 
             # Create 'ShameList' table
-            self.connection.execute("""
+            connection.execute("""
                 CREATE TABLE IF NOT EXISTS ShameList (
                     session_id TEXT,
                     member_id INTEGER,
@@ -86,67 +306,149 @@ class Database:
                 );
             """)
 
+    def upgrade_schema(self):
+        """Apply the migrations a database has not had yet, each in its own transaction."""
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        for number, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+            with self.transaction() as connection:
+                for statement in statements:
+                    connection.execute(statement)
+                connection.execute(f"PRAGMA user_version = {number}")
+
     def save_club(self, data):
-        with self.connection:
+        with self.transaction() as connection:
             # Insert club data
-            self.connection.execute("INSERT OR IGNORE INTO Clubs (id, name) VALUES (?, ?)", (data['id'], data['name']))
-
-            # Insert member data
-            for member in data['members']:
-                self.connection.execute("""
-                    INSERT OR IGNORE INTO Members (id, name, points, numberOfBooksRead)
-                    VALUES (?, ?, ?, ?)
-                """, (member['id'], member['name'], member['points'], member['numberOfBooksRead']))
+            connection.execute("INSERT OR IGNORE INTO Clubs (id, name) VALUES (?, ?)", (data['id'], data['name']))
 
-                # Link members to clubs in the MemberClubs table
-                for club_id in member['clubs']:
-                    self.connection.execute("INSERT OR IGNORE INTO MemberClubs (member_id, club_id) VALUES (?, ?)", (member['id'], club_id))
+            # Insert member data, leaving members already saved as they are, and link them to their clubs
+            self.upsert_members(data['members'], overwrite=False)
+            self.link_members((member['id'], club_id) for member in data['members'] for club_id in member['clubs'])
 
             # Insert book data and retrieve the auto-generated book ID
             book = data['activeSession']['book']
-            book_id = self.connection.execute("""
+            book_id = connection.execute("""
                 INSERT INTO Books (title, author, edition, year, ISBN)
                 VALUES (?, ?, ?, ?, ?)
             """, (book['title'], book['author'], book['edition'], book['year'], book['ISBN'])).lastrowid
 
             # Insert session data
             session = data['activeSession']
-            self.connection.execute("""
+            connection.execute("""
                 INSERT OR IGNORE INTO Sessions (id, club_id, book_id, dueDate, defaultChannel)
                 VALUES (?, ?, ?, ?, ?)
-            """, (session['id'], session['club_id'], book_id, session['dueDate'], session['defaultChannel']))
+            """, (session['id'], session['club_id'], book_id, iso_date(session['dueDate']), session['defaultChannel']))
 
             # Insert discussion data
-            for discussion in session['discussions']:
-                self.connection.execute("""
-                    INSERT OR IGNORE INTO Discussions (id, session_id, title, date, location)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (discussion['id'], session['id'], discussion['title'], discussion['date'], discussion['location']))
+            self.upsert_discussions(
+                (dict(discussion, session_id=session['id']) for discussion in session['discussions']),
+                overwrite=False
+            )
+
+    def upsert_members(self, members, overwrite=True):
+        """
+        Insert or update members in one transaction.
+
+        Args:
+            members: Iterable of member dicts (id, name, points, numberOfBooksRead); a generator
+                is consumed one row at a time, so rosters of any size stream through
+            overwrite: Whether members that already exist take the new values or are left as they are
+
+        Returns:
+            The number of members inserted or updated
+        """
+        rows = (
+            (member['id'], member['name'], member.get('points', 0), member.get('numberOfBooksRead', 0))
+            for member in members
+        )
+        on_conflict = """UPDATE SET
+            name = excluded.name,
+            points = excluded.points,
+            numberOfBooksRead = excluded.numberOfBooksRead
+        """ if overwrite else "NOTHING"
+        with self.transaction() as connection:
+            return connection.executemany(f"""
+                INSERT INTO Members (id, name, points, numberOfBooksRead)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (id) DO {on_conflict}
+            """, rows).rowcount
+
+    def upsert_discussions(self, discussions, overwrite=True):
+        """
+        Insert or update discussions in one transaction.
+
+        Args:
+            discussions: Iterable of discussion dicts (id, session_id, title, date, location),
+                consumed one row at a time
+            overwrite: Whether discussions that already exist take the new values or are left as they are
+
+        Returns:
+            The number of discussions inserted or updated
+        """
+        rows = (
+            (discussion['id'], discussion['session_id'], discussion['title'], discussion['date'], discussion.get('location'))
+            for discussion in discussions
+        )
+        on_conflict = """UPDATE SET
+            session_id = excluded.session_id,
+            title = excluded.title,
+            date = excluded.date,
+            location = excluded.location
+        """ if overwrite else "NOTHING"
+        with self.transaction() as connection:
+            return connection.executemany(f"""
+                INSERT INTO Discussions (id, session_id, title, date, location)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO {on_conflict}
+            """, rows).rowcount
+
+    def link_members(self, pairs):
+        """
+        Add members to clubs in one transaction; existing links are left alone.
+
+        Args:
+            pairs: Iterable of (member_id, club_id) pairs, consumed one at a time
+
+        Returns:
+            The number of new links
+        """
+        with self.transaction() as connection:
+            return connection.executemany("""
+                INSERT INTO MemberClubs (member_id, club_id) VALUES (?, ?)
+                ON CONFLICT (member_id, club_id) DO NOTHING
+            """, pairs).rowcount
+
+    def _update(self, table, row_id, values):
+        # Set every column given a value in a single UPDATE
+        values = {column: value for column, value in values.items() if value is not None}
+        if not values:
+            return
+        assignments = ", ".join(f"{column} = ?" for column in values)
+        with self.transaction() as connection:
+            connection.execute(f"UPDATE {table} SET {assignments} WHERE id = ?", (*values.values(), row_id))
 
     def update_club(self, club_id, name):
         """Update the name of a club."""
-        with self.connection:
-            self.connection.execute("UPDATE Clubs SET name = ? WHERE id = ?", (name, club_id))
+        with self.transaction() as connection:
+            connection.execute("UPDATE Clubs SET name = ? WHERE id = ?", (name, club_id))
 
     def add_member(self, member_id, name, points, number_of_books_read, clubs):
         """Add a new member and associate them with clubs."""
-        with self.connection:
-            self.connection.execute("""
-                INSERT OR IGNORE INTO Members (id, name, points, numberOfBooksRead)
-                VALUES (?, ?, ?, ?)
-            """, (member_id, name, points, number_of_books_read))
-            for club_id in clubs:
-                self.connection.execute("INSERT OR IGNORE INTO MemberClubs (member_id, club_id) VALUES (?, ?)", (member_id, club_id))
+        with self.transaction():
+            self.upsert_members(
+                [{"id": member_id, "name": name, "points": points, "numberOfBooksRead": number_of_books_read}],
+                overwrite=False
+            )
+            self.link_members((member_id, club_id) for club_id in clubs)
 
     def get_session_details(self, session_id):
         """Retrieve session details, including book and discussions."""
-        with self.connection:
-            session = self.connection.execute("SELECT * FROM Sessions WHERE id = ?", (session_id,)).fetchone()
+        with self.snapshot() as connection:
+            session = connection.execute("SELECT * FROM Sessions WHERE id = ?", (session_id,)).fetchone()
             if not session:
                 return None
 
-            book = self.connection.execute("SELECT * FROM Books WHERE id = ?", (session[2],)).fetchone()
-            discussions = self.connection.execute("SELECT * FROM Discussions WHERE session_id = ?", (session_id,)).fetchall()
+            book = connection.execute("SELECT * FROM Books WHERE id = ?", (session[2],)).fetchone()
+            discussions = connection.execute("SELECT * FROM Discussions WHERE session_id = ?", (session_id,)).fetchall()
 
             return {
                 "id": session[0],
@@ -172,77 +474,89 @@ class Database:
 
     def add_to_shame_list(self, session_id, member_id):
         """Add a member to the shame list for a session."""
-        with self.connection:
-            self.connection.execute("INSERT OR IGNORE INTO ShameList (session_id, member_id) VALUES (?, ?)", (session_id, member_id))
+        with self.transaction() as connection:
+            connection.execute("INSERT OR IGNORE INTO ShameList (session_id, member_id) VALUES (?, ?)", (session_id, member_id))
 
     def update_session(self, session_id, club_id=None, book_id=None, dueDate=None, defaultChannel=None):
         """Update session details."""
-        with self.connection:
-            if club_id:
-                self.connection.execute("UPDATE Sessions SET club_id = ? WHERE id = ?", (club_id, session_id))
-            if book_id:
-                self.connection.execute("UPDATE Sessions SET book_id = ? WHERE id = ?", (book_id, session_id))
-            if dueDate:
-                self.connection.execute("UPDATE Sessions SET dueDate = ? WHERE id = ?", (dueDate, session_id))
-            if defaultChannel:
-                self.connection.execute("UPDATE Sessions SET defaultChannel = ? WHERE id = ?", (defaultChannel, session_id))
+        self._update("Sessions", session_id, {
+            "club_id": club_id, "book_id": book_id, "dueDate": iso_date(dueDate), "defaultChannel": defaultChannel
+        })
 
     def update_discussion(self, discussion_id, session_id=None, title=None, date=None, location=None):
         """Update discussion details."""
-        with self.connection:
-            if session_id:
-                self.connection.execute("UPDATE Discussions SET session_id = ? WHERE id = ?", (session_id, discussion_id))
-            if title:
-                self.connection.execute("UPDATE Discussions SET title = ? WHERE id = ?", (title, discussion_id))
-            if date:
-                self.connection.execute("UPDATE Discussions SET date = ? WHERE id = ?", (date, discussion_id))
-            if location:
-                self.connection.execute("UPDATE Discussions SET location = ? WHERE id = ?", (location, discussion_id))
+        self._update("Discussions", discussion_id, {
+            "session_id": session_id, "title": title, "date": date, "location": location
+        })
 
     def update_member(self, member_id, name=None, points=None, numberOfBooksRead=None):
         """Update member details."""
-        with self.connection:
-            if name:
-                self.connection.execute("UPDATE Members SET name = ? WHERE id = ?", (name, member_id))
-            if points:
-                self.connection.execute("UPDATE Members SET points = ? WHERE id = ?", (points, member_id))
-            if numberOfBooksRead:
-                self.connection.execute("UPDATE Members SET numberOfBooksRead = ? WHERE id = ?", (numberOfBooksRead, member_id))
-
-    def get_club(self):
-        with self.connection:
-            # Fetch club details
-            club = self.connection.execute("SELECT * FROM Clubs").fetchone()
-            # Fetch all members
-            members = self.connection.execute("SELECT * FROM Members").fetchall()
-            # Fetch session details
-            sessions = self.connection.execute("SELECT * FROM Sessions").fetchall()
-            # Fetch books associated with sessions
-            books = self.connection.execute("SELECT * FROM Books").fetchall()
-            # Fetch discussions associated with sessions
-            discussions = self.connection.execute("SELECT * FROM Discussions").fetchall()
-
-        # Transform member data into the required format
-        members_data = []
-        for member in members:
-            # Fetch all clubs the member belongs to
-            clubs = self.connection.execute("SELECT club_id FROM MemberClubs WHERE member_id = ?", (member[0],)).fetchall()
-            members_data.append({
-                "id": member[0],
-                "name": member[1],
-                "points": member[2],
-                "clubs": [club_id[0] for club_id in clubs],
-                "numberOfBooksRead": member[3]
-            })
-
-        # Transform session data into the required format
-        session_data = None
-        if sessions:
-            session = sessions[0]  # Assuming only one active session
-            # Fetch book details for the session
-            book = self.connection.execute("SELECT * FROM Books WHERE id = ?", (session[2],)).fetchone()
-            # Fetch discussions for the session
-            session_discussions = [
+        self._update("Members", member_id, {"name": name, "points": points, "numberOfBooksRead": numberOfBooksRead})
+
+    def get_club(self, club_id=None):
+        """
+        Reconstruct a club with its members and active session.
+
+        Reads only the club's own rows, in one snapshot, with a query each for
+        the club, its members (and every club they belong to), its session and
+        book, and the session's discussions, whatever the size of the database.
+
+        Args:
+            club_id: The club to read; defaults to the first club in the database
+
+        Returns:
+            The club data, or None if there is no such club
+        """
+        with self.snapshot() as connection:
+            if club_id is None:
+                club = connection.execute("SELECT id, name FROM Clubs ORDER BY rowid LIMIT 1").fetchone()
+            else:
+                club = connection.execute("SELECT id, name FROM Clubs WHERE id = ?", (club_id,)).fetchone()
+            if club is None:
+                return None
+
+            members = self._members_page(connection, club[0], None, -1)
+            session = self.get_active_session(club[0])
+
+        # Return the full reconstructed club data
+        return {
+            "id": club[0],
+            "name": club[1],
+            "members": members,
+            "activeSession": session,
+            "pastSessions": []
+        }
+
+    def get_active_session(self, club_id):
+        """
+        Retrieve a club's active session, the one due last, with book and discussions.
+
+        Args:
+            club_id: The club's ID
+
+        Returns:
+            The session data, or None if the club has no session
+        """
+        with self.snapshot() as connection:
+            session = connection.execute(ACTIVE_SESSION_QUERY, (club_id,)).fetchone()
+            if session is None:
+                return None
+            discussions = connection.execute(DISCUSSIONS_QUERY, (session[0],)).fetchall()
+
+        return {
+            "id": session[0],
+            "club_id": session[1],
+            "book": {
+                "title": session[4],
+                "author": session[5],
+                "edition": session[6],
+                "year": session[7],
+                "ISBN": session[8]
+            },
+            "dueDate": session[2],
+            "defaultChannel": session[3],
+            "shameList": [],
+            "discussions": [
                 {
                     "id": discussion[0],
                     "session_id": discussion[1],
@@ -250,33 +564,47 @@ class Database:
                     "date": discussion[3],
                     "location": discussion[4]
                 }
-                for discussion in discussions if discussion[1] == session[0]
+                for discussion in discussions
             ]
+        }
 
-            session_data = {
-                "id": session[0],
-                "club_id": session[1],
-                "book": {
-                    "title": book[1],
-                    "author": book[2],
-                    "edition": book[3],
-                    "year": book[4],
-                    "ISBN": book[5]
-                },
-                "dueDate": session[3],
-                "defaultChannel": session[4],
-                "shameList": [],
-                "discussions": session_discussions
-            }
+    def iter_members(self, club_id, page_size=500):
+        """
+        Iterate over a club's members in ID order, a page at a time.
 
-        # Return the full reconstructed club data
-        return {
-            "id": club[0],
-            "name": club[1],
-            "members": members_data,
-            "activeSession": session_data,
-            "pastSessions": []
-        }
+        Each page seeks past the last member of the previous one (keyset
+        pagination), so every page costs the same however deep into the club
+        it is, and no connection is held between pages.
+
+        Args:
+            club_id: The club's ID
+            page_size: Members to read per query
+
+        Yields:
+            Member data, as in get_club
+        """
+        after = None
+        while True:
+            with self.snapshot() as connection:
+                page = self._members_page(connection, club_id, after, page_size)
+            yield from page
+            if len(page) < page_size:
+                return
+            after = page[-1]["id"]
+
+    def _members_page(self, connection, club_id, after, limit):
+        # Member IDs are Discord IDs, which are never negative; a limit of -1 reads to the end
+        rows = connection.execute(MEMBERS_QUERY, (club_id, -1 if after is None else after, limit)).fetchall()
+        return [
+            {
+                "id": member[0],
+                "name": member[1],
+                "points": member[2],
+                "clubs": sorted(member[4].split(chr(31))),
+                "numberOfBooksRead": member[3]
+            }
+            for member in rows
+        ]
 
 if __name__ == "__main__":
     # JSON data provided by the user
@@ -0,0 +1,399 @@
+"""
+Local SQLite mirror of a club kept in Supabase.
+
+ClubMirror stands in for an AsyncBookClubAPI. It keeps a copy of one club
+in the local database: the copy is hydrated at startup, and a ClubSync pull
+(see api/delta.py) updates it whenever the club changes. Reads of the club
+and its sessions are then answered from SQLite without a network round
+trip:
+
+    mirror = ClubMirror(api, Database("local_bookclub.db"), club_id)
+    await mirror.hydrate()
+    club = await mirror.get_club(club_id)     # Local
+    await mirror.update_member(1, {"points": 5})  # Supabase, then pulled into the copy
+
+Writes go to Supabase first. The change is then pulled back and applied
+locally, so the copy only ever holds what Supabase accepted. If Supabase is
+down, reads keep working from the last copy, and so does a restart with
+hydrate(). Writes fail as they would without the mirror.
+
+The copy lives in the local database's own tables, plus a MirroredClubs
+row recording the active session and the club's channel. A full read of
+the club replaces its rows, and a delta writes only the rows it changed,
+each in a single transaction, so a copy is never left half written. Book
+IDs are assigned by the local copy and do not match Supabase's.
+"""
+import asyncio
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from api.bookclub_api import ResourceNotFoundError
+from api.delta import ClubDelta, ClubSync
+from api.models import Book, Club, Discussion, Member, Session, parse_date
+from database.local_database import DISCUSSIONS_QUERY, Database, iso_date
+
+# What the club's rows do not say: which session is the active one, and the club's channel
+MIRROR_TABLE = """
+    CREATE TABLE IF NOT EXISTS MirroredClubs (
+        club_id TEXT PRIMARY KEY,
+        active_session_id TEXT,
+        discord_channel INTEGER
+    )
+"""
+
+# A session with its book; the local book IDs are the copy's own and do not match Supabase's
+SESSIONS_QUERY = """
+    SELECT s.id, s.dueDate, b.id, b.title, b.author, b.edition, b.year, b.ISBN
+    FROM Sessions s LEFT JOIN Books b ON b.id = s.book_id
+"""
+
+# Writes after which the change is pulled into the local copy; every other API method is passed through
+WRITE_METHODS = (
+    "update_club", "delete_club",
+    "create_member", "update_member", "delete_member", "update_members", "upsert_members",
+    "create_session", "update_session", "delete_session",
+)
+
+class ClubMirror:
+    """Serves one club's reads from a local copy, kept current through the change feed of an AsyncBookClubAPI."""
+
+    def __init__(self, api: Any, db: Database, club_id: str, club_sync: Optional[ClubSync] = None):
+        """
+        Initialize the mirror; the local copy is only updated from hydrate() on.
+
+        Args:
+            api: The AsyncBookClubAPI that reaches Supabase
+            db: The local database holding the copy
+            club_id: The ID of the club to mirror
+            club_sync: The sync to keep the copy current with; a new one by default.
+                Its on_change hook is taken over by the mirror
+        """
+        self.api = api
+        self.db = db
+        self.club_id = club_id
+        self.club_sync = club_sync or ClubSync(api, club_id)
+        self.club_sync.on_change = self.store
+        with db.transaction() as connection:
+            connection.execute(MIRROR_TABLE)
+        self.local_reads = 0
+        self.stores = 0
+        self.write_throughs = 0
+        self.pull_failures = 0
+
+    async def close(self) -> None:
+        """Close the API client and the local database."""
+        await self.api.close()
+        self.db.close()
+
+    async def __aenter__(self) -> "ClubMirror":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def __getattr__(self, name: str) -> Any:
+        # Called only for what the mirror does not define itself: pass reads through, and pull after writes
+        attribute = getattr(self.api, name)
+        if name not in WRITE_METHODS:
+            return attribute
+
+        async def write_through(*args, **kwargs):
+            result = await attribute(*args, **kwargs)
+            self.write_throughs += 1
+            await self.pull()
+            return result
+        return write_through
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the mirror's counters.
+
+        Returns:
+            Dict with reads served locally, stores of the club, writes passed
+            through to Supabase, failed pulls after them, and the sync's counters
+        """
+        return {
+            "local_reads": self.local_reads,
+            "stores": self.stores,
+            "write_throughs": self.write_throughs,
+            "pull_failures": self.pull_failures,
+            "sync": self.club_sync.stats(),
+        }
+
+    # Keeping the copy
+
+    async def hydrate(self) -> Club:
+        """
+        Read the club from Supabase into the local copy, or fall back on the copy if that fails.
+
+        Returns:
+            The club
+
+        Raises:
+            The error reading from Supabase, if there is no local copy to fall back on
+        """
+        try:
+            return await self.club_sync.refresh()
+        except Exception:
+            club = await self._run(self._read_club)
+            if club is None:
+                raise
+            # Without a version the next sync() reads the club whole, and stores it
+            self.club_sync.club = club.replace(version=None)
+            return self.club_sync.club
+
+    async def pull(self) -> None:
+        """Bring the local copy up to date; failures are counted and left to the next sync."""
+        try:
+            await self.club_sync.sync()
+        except Exception:
+            self.pull_failures += 1
+
+    async def store(self, club: Club, delta: Optional[ClubDelta] = None) -> None:
+        """
+        Bring the local copy up to date with a club; ClubSync calls this whenever the club changes.
+
+        Args:
+            club: The club as it now is
+            delta: The changes that made it so, of which only the rows they name are
+                written; without one the copy is replaced whole
+        """
+        try:
+            await self._run(self._store, club, delta)
+        except Exception:
+            if delta is not None:
+                # The copy missed these changes; without a version the next sync() reads the club whole
+                self.club_sync.club = self.club_sync.club.replace(version=None)
+            raise
+        self.stores += 1
+
+    def _store(self, club: Club, delta: Optional[ClubDelta]) -> None:
+        # One transaction: if any row is refused, the previous copy is left whole
+        with self.db.transaction() as connection:
+            if delta is None:
+                self._replace_copy(connection, club)
+            else:
+                self._apply_delta(connection, club, delta)
+
+    def _replace_copy(self, connection, club: Club) -> None:
+        self._delete_copy(connection)
+        connection.execute(
+            "INSERT INTO Clubs (id, name) VALUES (?, ?) ON CONFLICT (id) DO UPDATE SET name = excluded.name",
+            (self.club_id, club.name)
+        )
+        self._upsert_members(club.members)
+
+        # Oldest first, so that of sessions due the same day the active one is the newest row
+        sessions = list(reversed(club.past_sessions)) + ([club.active_session] if club.active_session else [])
+        for session in sessions:
+            self._upsert_session(connection, session, club.discord_channel)
+            self._upsert_discussions(session.id, session.discussions)
+        self._store_club_fields(connection, club)
+
+    def _apply_delta(self, connection, club: Club, delta: ClubDelta) -> None:
+        """Write only the rows a delta changed, taking the club fields from the club it was applied to."""
+        self._upsert_members(delta.members)
+        connection.executemany(
+            "DELETE FROM MemberClubs WHERE club_id = ? AND member_id = ?",
+            ((self.club_id, member_id) for member_id in delta.deleted_members)
+        )
+
+        for session in delta.sessions:
+            self._upsert_session(connection, session, club.discord_channel)
+        self._delete_sessions(connection, delta.deleted_sessions)
+
+        # Discussions of sessions no longer in the club are dropped, as apply_delta drops them
+        session_ids = {session.id for session in club.past_sessions} | (
+            {club.active_session.id} if club.active_session else set()
+        )
+        for session_id, discussion in delta.discussions:
+            if session_id in session_ids:
+                self._upsert_discussions(session_id, (discussion,))
+        connection.executemany(
+            "DELETE FROM Discussions WHERE id = ? AND session_id IN (SELECT id FROM Sessions WHERE club_id = ?)",
+            ((discussion_id, self.club_id) for discussion_id in delta.deleted_discussions)
+        )
+
+        if delta.club:
+            connection.execute("UPDATE Clubs SET name = ? WHERE id = ?", (club.name, self.club_id))
+            if "discord_channel" in delta.club:
+                connection.execute(
+                    "UPDATE Sessions SET defaultChannel = ? WHERE club_id = ?", (club.discord_channel, self.club_id)
+                )
+            self._store_club_fields(connection, club)
+
+    def _delete_copy(self, connection) -> None:
+        """Delete the club's sessions, with their discussions, shame lists and books, and its memberships."""
+        session_ids = [
+            session_id for (session_id,) in
+            connection.execute("SELECT id FROM Sessions WHERE club_id = ?", (self.club_id,)).fetchall()
+        ]
+        self._delete_sessions(connection, session_ids)
+        connection.execute("DELETE FROM MemberClubs WHERE club_id = ?", (self.club_id,))
+
+    def _delete_sessions(self, connection, session_ids: Iterable[str]) -> None:
+        """Delete sessions of the club with their discussions, shame lists and books."""
+        for session_id in session_ids:
+            row = connection.execute(
+                "SELECT book_id FROM Sessions WHERE id = ? AND club_id = ?", (session_id, self.club_id)
+            ).fetchone()
+            if row is None:
+                continue
+            connection.execute("DELETE FROM Discussions WHERE session_id = ?", (session_id,))
+            connection.execute("DELETE FROM ShameList WHERE session_id = ?", (session_id,))
+            connection.execute("DELETE FROM Sessions WHERE id = ?", (session_id,))
+            _delete_orphaned_book(connection, row[0])
+
+    def _upsert_members(self, members: Iterable[Member]) -> None:
+        members = tuple(members)
+        self.db.upsert_members(
+            {"id": member.id, "name": member.name, "points": member.points, "numberOfBooksRead": member.books_read}
+            for member in members
+        )
+        self.db.link_members((member.id, self.club_id) for member in members)
+
+    def _upsert_session(self, connection, session: Session, discord_channel: Optional[int]) -> None:
+        """Insert or update a session's row and its book, leaving its discussions and shame list alone."""
+        row = connection.execute("SELECT book_id FROM Sessions WHERE id = ?", (session.id,)).fetchone()
+        old_book_id = row[0] if row else None
+        book_id = None
+        if session.book is not None:
+            book = session.book
+            values = (book.title, book.author, book.edition, book.year, book.isbn)
+            if old_book_id is not None:
+                # The copy gives each session a book row of its own, so it is updated in place
+                connection.execute(
+                    "UPDATE Books SET title = ?, author = ?, edition = ?, year = ?, ISBN = ? WHERE id = ?",
+                    (*values, old_book_id)
+                )
+                book_id = old_book_id
+            else:
+                book_id = connection.execute(
+                    "INSERT INTO Books (title, author, edition, year, ISBN) VALUES (?, ?, ?, ?, ?)", values
+                ).lastrowid
+        connection.execute("""
+            INSERT INTO Sessions (id, club_id, book_id, dueDate, defaultChannel) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET
+                club_id = excluded.club_id,
+                book_id = excluded.book_id,
+                dueDate = excluded.dueDate,
+                defaultChannel = excluded.defaultChannel
+        """, (session.id, self.club_id, book_id, iso_date(session.due_date), discord_channel))
+        if old_book_id is not None and old_book_id != book_id:
+            _delete_orphaned_book(connection, old_book_id)
+
+    def _upsert_discussions(self, session_id: str, discussions: Iterable[Discussion]) -> None:
+        self.db.upsert_discussions(
+            {
+                "id": discussion.id, "session_id": session_id, "title": discussion.title,
+                "date": iso_date(discussion.date), "location": discussion.location
+            }
+            for discussion in discussions
+        )
+
+    def _store_club_fields(self, connection, club: Club) -> None:
+        """Record the active session, its shame list and the club's channel."""
+        active_id = club.active_session.id if club.active_session else None
+        if active_id is not None:
+            connection.execute("DELETE FROM ShameList WHERE session_id = ?", (active_id,))
+            connection.executemany(
+                "INSERT OR IGNORE INTO ShameList (session_id, member_id) VALUES (?, ?)",
+                ((active_id, member_id) for member_id in club.shame_list)
+            )
+        connection.execute(
+            "INSERT OR REPLACE INTO MirroredClubs (club_id, active_session_id, discord_channel) VALUES (?, ?, ?)",
+            (self.club_id, active_id, club.discord_channel)
+        )
+
+    # Local reads
+
+    async def get_club(self, club_id: str, include: Optional[Iterable[str]] = None, timeout: Any = None) -> Club:
+        """Get the mirrored club from the local copy, or any other club from Supabase. See AsyncBookClubAPI.get_club."""
+        if club_id != self.club_id:
+            return await self.api.get_club(club_id, include=include, timeout=timeout)
+        club = await self._run(self._read_club)
+        if club is None:
+            raise ResourceNotFoundError(f"Club {club_id} is not in the local copy")
+        return club
+
+    async def get_session(self, session_id: str, include: Optional[Iterable[str]] = None, timeout: Any = None) -> Session:
+        """Get a session of the mirrored club from the local copy, or from Supabase. See AsyncBookClubAPI.get_session."""
+        session = await self._run(self._read_session, session_id)
+        if session is None:
+            return await self.api.get_session(session_id, include=include, timeout=timeout)
+        return session
+
+    def _read_club(self) -> Optional[Club]:
+        with self.db.snapshot() as connection:
+            row = connection.execute("""
+                SELECT c.name, mc.active_session_id, mc.discord_channel
+                FROM Clubs c JOIN MirroredClubs mc ON mc.club_id = c.id
+                WHERE c.id = ?
+            """, (self.club_id,)).fetchone()
+            if row is None:
+                return None
+            name, active_id, discord_channel = row
+            members = connection.execute("""
+                SELECT m.id, m.name, m.points, m.numberOfBooksRead
+                FROM MemberClubs mc JOIN Members m ON m.id = mc.member_id
+                WHERE mc.club_id = ? ORDER BY mc.member_id
+            """, (self.club_id,)).fetchall()
+            sessions = connection.execute(
+                SESSIONS_QUERY + " WHERE s.club_id = ? ORDER BY s.dueDate DESC, s.rowid DESC", (self.club_id,)
+            ).fetchall()
+            active = next((_session(row) for row in sessions if row[0] == active_id), None)
+            if active is not None:
+                active = active.replace(
+                    discussions=_discussions(connection, active_id), shame_list=_shame_list(connection, active_id)
+                )
+        self.local_reads += 1
+        return Club(
+            id=self.club_id,
+            name=name,
+            discord_channel=discord_channel,
+            members=tuple(
+                Member(id=member[0], name=member[1], points=member[2], books_read=member[3]) for member in members
+            ),
+            active_session=active,
+            past_sessions=tuple(_session(row) for row in sessions if row[0] != active_id),
+            shame_list=active.shame_list if active else (),
+            version=self.club_sync.club.version if self.club_sync.club else None
+        )
+
+    def _read_session(self, session_id: str) -> Optional[Session]:
+        with self.db.snapshot() as connection:
+            row = connection.execute(SESSIONS_QUERY + " WHERE s.id = ? AND s.club_id = ?", (session_id, self.club_id)).fetchone()
+            if row is None:
+                return None
+            club_name = connection.execute("SELECT name FROM Clubs WHERE id = ?", (self.club_id,)).fetchone()[0]
+            session = _session(row).replace(
+                discussions=_discussions(connection, session_id),
+                club=Club(id=self.club_id, name=club_name),
+                shame_list=_shame_list(connection, session_id)
+            )
+        self.local_reads += 1
+        return session
+
+    async def _run(self, method, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(None, method, *args)
+
+def _delete_orphaned_book(connection, book_id: Optional[int]) -> None:
+    connection.execute(
+        "DELETE FROM Books WHERE id = ? AND NOT EXISTS (SELECT 1 FROM Sessions WHERE book_id = Books.id)", (book_id,)
+    )
+
+def _session(row: tuple) -> Session:
+    """Build a session, without its discussions and shame list, from a row of SESSIONS_QUERY."""
+    book = Book(id=row[2], title=row[3], author=row[4], edition=row[5], year=row[6], isbn=row[7]) if row[2] else None
+    return Session(id=row[0], book=book, due_date=parse_date(row[1]))
+
+def _discussions(connection, session_id: str) -> Tuple[Discussion, ...]:
+    return tuple(
+        Discussion(id=row[0], title=row[2], date=parse_date(row[3]), location=row[4])
+        for row in connection.execute(DISCUSSIONS_QUERY, (session_id,)).fetchall()
+    )
+
+def _shame_list(connection, session_id: str) -> Tuple[int, ...]:
+    return tuple(
+        member_id for (member_id,) in
+        connection.execute("SELECT member_id FROM ShameList WHERE session_id = ? ORDER BY member_id", (session_id,))
+    )
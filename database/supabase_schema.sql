@@ -53,4 +53,10 @@ CREATE TABLE IF NOT EXISTS ShameList (
     PRIMARY KEY (club_id, member_id),
     FOREIGN KEY (club_id) REFERENCES Sessions(id),
     FOREIGN KEY (member_id) REFERENCES Members(id)
-);
\ No newline at end of file
+);
+
+-- Indexes for the club-scoped reads (a club's members, sessions and discussions)
+CREATE INDEX IF NOT EXISTS idx_memberclubs_club_id ON MemberClubs (club_id, member_id);
+CREATE INDEX IF NOT EXISTS idx_sessions_club_id ON Sessions (club_id);
+CREATE INDEX IF NOT EXISTS idx_discussions_session_id ON Discussions (session_id);
+CREATE INDEX IF NOT EXISTS idx_shamelist_member_id ON ShameList (member_id);
@@ -52,9 +52,6 @@ def setup_message_handlers(bot):
             )
             await channel.send(embed=embed)
         
-        # Save new member to the database
-        bot.db.save_club({
-            "id": 0,  # Assuming club_id is 0
-            "name": "Quill's Bookclub",
-            "members": [{"id": member.id, "name": member.name, "points": 0, "number_of_books_read": 0}]
-        })
\ No newline at end of file
+        # Record the new member in the default club, off the event loop, if the local database is enabled
+        if bot.db is not None:
+            await bot.db.add_member(member.id, member.name, 0, 0, [bot.config.DEFAULT_CLUB_ID])
\ No newline at end of file
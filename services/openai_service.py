@@ -1,6 +1,12 @@
 """
 Service for interfacing with OpenAI's API
 """
+import asyncio
+
+from utils.deadline import DeadlineExceeded, run_within_deadline
+
+# Seconds a single completion attempt may take, when no tighter deadline applies
+REQUEST_TIMEOUT = 30.0
 
 class OpenAIService:
     """Wrapper for OpenAI client to handle API interactions"""
@@ -31,13 +37,19 @@ class OpenAIService:
             messages = [
                 {"role": "user", "content": f"{prompt}"}
             ]
-            response = self.client.create_chat_completion(messages)
+            # The client blocks, so run it off the event loop where the deadline can abandon it
+            response = await run_within_deadline(asyncio.to_thread(
+                self.client.create_chat_completion, messages, timeout=REQUEST_TIMEOUT
+            ))
             if response:
                 print("GPT-3.5 Response:", response)
                 return response
             else:
                 print("Failed to get response after all retries")
                 return "I couldn't generate a response at this time. Please try again later."
+        except DeadlineExceeded as e:
+            print(f"OpenAI response timed out: {str(e)}")
+            return "I took too long to think about that. Please try again later."
         except ValueError as e:
             print(f"Configuration error: {str(e)}")
             return "I'm having trouble accessing my AI services right now."
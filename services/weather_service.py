@@ -1,8 +1,14 @@
 """
 Service for interfacing with weather API
 """
+import asyncio
 import requests
 
+from utils.deadline import DeadlineExceeded, run_within_deadline, timeout_for
+
+# (connect, read) timeout in seconds, when no tighter deadline applies
+REQUEST_TIMEOUT = (3.05, 10)
+
 class WeatherService:
     """Service to handle weather API interactions"""
     
@@ -31,7 +37,10 @@ class WeatherService:
         print(f"Fetching weather for location: {location}")
         try:
             url = f"https://api.weatherbit.io/v2.0/current?city={location}&key={self.api_key}"
-            response = requests.get(url)
+            # requests blocks, so run it off the event loop where the deadline can abandon it
+            response = await run_within_deadline(asyncio.to_thread(
+                requests.get, url, timeout=timeout_for(REQUEST_TIMEOUT)
+            ))
             response.raise_for_status()
             data = response.json()
             
@@ -51,6 +60,9 @@ class WeatherService:
             
             print(f"Weather fetched successfully: {message}")
             return message
+        except DeadlineExceeded as e:
+            print(f"Weather request timed out: {str(e)}")
+            return f"The weather service took too long to answer for '{location}'. Please try again later."
         except Exception as e:
             print(f"Error fetching weather: {str(e)}")
             return f"Error getting weather for '{location}': {str(e)}"
\ No newline at end of file
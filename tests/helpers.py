@@ -0,0 +1,24 @@
+"""
+Helpers shared by the API client tests
+"""
+from unittest.mock import Mock
+
+class FakeClock:
+    """Manually advanced monotonic clock, which a fake sleep also advances"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+def ok(payload):
+    """Build a mock successful requests response"""
+    response = Mock()
+    response.status_code = 200
+    response.headers = {}
+    response.json.return_value = payload
+    response.raise_for_status = Mock()
+    return response
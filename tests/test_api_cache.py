@@ -0,0 +1,113 @@
+"""
+Tests for the API client's TTL cache
+"""
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.cache import TTLCache, MISSING, conditional_headers
+from helpers import FakeClock
+
+class TestTTLCache(unittest.TestCase):
+    """Test cases for TTLCache"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TTLCache(ttl=10, maxsize=3, clock=self.clock)
+
+    def test_hit_and_miss(self):
+        """Test fresh entries are hits and unknown keys are misses"""
+        self.assertIs(self.cache.get(("club", "club-1")), MISSING)
+        self.cache.set(("club", "club-1"), {"id": "club-1"})
+        self.assertEqual(self.cache.get(("club", "club-1")), {"id": "club-1"})
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["stale"], 0)
+
+    def test_expiry_counts_as_stale(self):
+        """Test an expired entry is a miss and is counted as stale"""
+        self.cache.set(("club", "club-1"), {"id": "club-1"})
+        self.clock.now = 10
+
+        self.assertIs(self.cache.get(("club", "club-1")), MISSING)
+        stats = self.cache.stats()
+        self.assertEqual(stats["stale"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted when full"""
+        for i in range(3):
+            self.cache.set(("member", str(i)), i)
+        self.cache.get(("member", "0"))  # Touch 0 so 1 becomes the oldest
+        self.cache.set(("member", "3"), 3)
+
+        self.assertIs(self.cache.get(("member", "1")), MISSING)
+        self.assertEqual(self.cache.get(("member", "0")), 0)
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+        self.assertEqual(self.cache.stats()["size"], 3)
+
+    def test_invalidate(self):
+        """Test invalidating one resource or a whole resource type"""
+        self.cache.set(("club", "club-1"), 1)
+        self.cache.set(("club", "club-2"), 2)
+        self.cache.set(("member", "1"), 3)
+
+        self.assertEqual(self.cache.invalidate("club", "club-1"), 1)
+        self.assertIs(self.cache.get(("club", "club-1")), MISSING)
+        self.assertEqual(self.cache.get(("club", "club-2")), 2)
+
+        self.assertEqual(self.cache.invalidate("club"), 1)
+        self.assertEqual(self.cache.get(("member", "1")), 3)
+
+    def test_invalidate_for_write(self):
+        """Test a write drops the resource and every payload that embeds it"""
+        self.cache.set(("club", "club-1"), 1)
+        self.cache.set(("member", "1"), 2)
+        self.cache.set(("member", "2"), 3)
+        self.cache.set(("session", "session-1"), 4)
+
+        self.cache.invalidate_for_write("member", "1")
+
+        self.assertIs(self.cache.get(("member", "1")), MISSING)
+        self.assertIs(self.cache.get(("club", "club-1")), MISSING)
+        self.assertEqual(self.cache.get(("member", "2")), 3)
+        self.assertEqual(self.cache.get(("session", "session-1")), 4)
+
+    def test_disabled(self):
+        """Test a TTL of 0 disables caching"""
+        cache = TTLCache(ttl=0)
+        cache.set(("club", "club-1"), 1)
+        self.assertIs(cache.get(("club", "club-1")), MISSING)
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_refresh(self):
+        """Test refreshing an expired entry makes it fresh again, unless it was invalidated"""
+        self.cache.set(("club", "club-1"), 1, etag='"v1"')
+        self.clock.now = 10
+        version = self.cache.version
+
+        self.assertEqual(self.cache.peek(("club", "club-1")).etag, '"v1"')
+        self.assertIsNotNone(self.cache.refresh(("club", "club-1"), version=version))
+        self.assertEqual(self.cache.get(("club", "club-1")), 1)
+
+        self.cache.invalidate("member")
+        self.assertIsNone(self.cache.refresh(("club", "club-1"), version=version))
+
+    def test_conditional_headers(self):
+        """Test validators become conditional request headers"""
+        self.cache.set(("club", "club-1"), 1, etag='"v1"', last_modified="Tue, 01 Apr 2025 00:00:00 GMT")
+        self.cache.set(("club", "club-2"), 2)
+
+        self.assertEqual(
+            conditional_headers(self.cache.peek(("club", "club-1"))),
+            {"If-None-Match": '"v1"', "If-Modified-Since": "Tue, 01 Apr 2025 00:00:00 GMT"}
+        )
+        self.assertIsNone(conditional_headers(self.cache.peek(("club", "club-2"))))
+        self.assertIsNone(conditional_headers(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,216 @@
+import unittest
+from unittest.mock import patch, MagicMock, AsyncMock
+import asyncio
+import os
+import sys
+import aiohttp
+import json
+
+# Add parent directory to path to import the AsyncBookClubAPI class
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.async_bookclub_api import AsyncBookClubAPI, _client_timeout
+from api.bookclub_api import ResourceNotFoundError, ValidationError, AuthenticationError, APIError
+from api.resilience import RetryPolicy
+
+def mock_response(status=200, payload=None, text="", headers=None):
+    """Build a mock aiohttp response, wrapped in the async context manager request() returns."""
+    response = MagicMock()
+    response.status = status
+    response.headers = headers or {}
+    response.json = AsyncMock(return_value=payload)
+    response.text = AsyncMock(return_value=text)
+    response.read = AsyncMock(return_value=text.encode() if status >= 400 else json.dumps(payload).encode())
+
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=response)
+    context.__aexit__ = AsyncMock(return_value=False)
+    return context
+
+def mock_session(status=200, payload=None, text="", side_effect=None):
+    """Build a mock aiohttp session whose request() yields a single response."""
+    session = MagicMock()
+    if side_effect:
+        session.request.side_effect = side_effect
+    else:
+        session.request.return_value = mock_response(status, payload, text)
+    return session
+
+class TestAsyncBookClubAPI(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.api = AsyncBookClubAPI(
+            base_url="http://test-url.supabase.co",
+            api_key="test-key",
+            retry=RetryPolicy(rand=lambda: 0.0)  # Retry without actually backing off
+        )
+
+        self.assertEqual(self.api.headers["Authorization"], "Bearer test-key")
+        self.assertEqual(self.api.functions_url, "http://test-url.supabase.co/functions/v1")
+
+    def test_get_club(self):
+        """Test get_club method."""
+        session = mock_session(payload={"id": "club-1", "name": "Test Club", "members": []})
+
+        with patch.object(self.api, '_get_session', return_value=session):
+            result = asyncio.run(self.api.get_club("club-1"))
+
+        self.assertEqual(result.name, "Test Club")
+        session.request.assert_called_once_with(
+            "GET",
+            "http://test-url.supabase.co/functions/v1/club",
+            params={"id": "club-1"},
+            json=None,
+            headers=None,
+            timeout=_client_timeout(self.api.timeout)
+        )
+
+    def test_update_member(self):
+        """Test update_member method."""
+        session = mock_session(payload={"success": True})
+
+        with patch.object(self.api, '_get_session', return_value=session):
+            result = asyncio.run(self.api.update_member(1, {"points": 150}, timeout=2))
+
+        self.assertTrue(result["success"])
+        args, kwargs = session.request.call_args
+        self.assertEqual(args, ("PUT", "http://test-url.supabase.co/functions/v1/member"))
+        self.assertEqual(kwargs["json"], {"id": 1, "points": 150})
+        self.assertEqual(kwargs["timeout"].total, 2)
+
+    def test_create_session(self):
+        """Test create_session method."""
+        session_data = {"club_id": "club-1", "book": {"title": "New Book", "author": "Author Name"}}
+        session = mock_session(payload={"success": True, "session": {"id": "new-session"}})
+
+        with patch.object(self.api, '_get_session', return_value=session):
+            result = asyncio.run(self.api.create_session(session_data))
+
+        self.assertEqual(result["session"]["id"], "new-session")
+        self.assertEqual(session.request.call_args.kwargs["json"], session_data)
+
+    def test_get_club_is_cached(self):
+        """Test repeated reads are served from cache and writes invalidate them."""
+        session = mock_session(payload={"id": "club-1", "name": "Test Club"})
+
+        async def run():
+            await self.api.get_club("club-1")
+            await self.api.get_club("club-1")
+            await self.api.delete_member(1)
+            await self.api.get_club("club-1")
+
+        with patch.object(self.api, '_get_session', return_value=session):
+            asyncio.run(run())
+
+        self.assertEqual(
+            [call.args[0] for call in session.request.call_args_list],
+            ["GET", "DELETE", "GET"]
+        )
+        self.assertEqual(self.api.stats()["cache"]["hits"], 1)
+
+    def test_conditional_get(self):
+        """Test an expired entry is revalidated and a 304 returns the cached object undecoded."""
+        now = [0.0]
+        self.api.cache.clock = lambda: now[0]
+        full = mock_response(payload={"id": "club-1"}, headers={"ETag": '"v1"'})
+        not_modified = mock_response(status=304)
+        session = MagicMock()
+        session.request.side_effect = [full, not_modified]
+
+        async def run():
+            first = await self.api.get_club("club-1")
+            now[0] = self.api.cache.ttl + 1
+            second = await self.api.get_club("club-1")
+            return first, second
+
+        with patch.object(self.api, '_get_session', return_value=session):
+            first, second = asyncio.run(run())
+
+        self.assertIs(first, second)
+        self.assertEqual(session.request.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+        not_modified.__aenter__.return_value.json.assert_not_called()
+        self.assertEqual(self.api.stats()["cache"]["revalidations"], 1)
+
+    def test_conditional_get_invalidated_meanwhile(self):
+        """Test a 304 for an entry invalidated while it was revalidated is not trusted, and the resource is read whole."""
+        now = [0.0]
+        self.api.cache.clock = lambda: now[0]
+        not_modified = mock_response(status=304)
+        responses = iter([
+            mock_response(payload={"id": "club-1", "name": "Old Name"}, headers={"ETag": '"v1"'}),
+            not_modified,
+            mock_response(payload={"id": "club-1", "name": "New Name"}, headers={"ETag": '"v2"'}),
+        ])
+
+        def request(*args, **kwargs):
+            response = next(responses)
+            if response is not_modified:
+                self.api.cache.invalidate("club", "club-1")  # A write lands while the 304 is in flight
+            return response
+
+        session = MagicMock()
+        session.request.side_effect = request
+
+        async def run():
+            await self.api.get_club("club-1")
+            now[0] = self.api.cache.ttl + 1
+            return await self.api.get_club("club-1"), await self.api.get_club("club-1")
+
+        with patch.object(self.api, '_get_session', return_value=session):
+            result, cached = asyncio.run(run())
+
+        self.assertEqual(result.name, "New Name")
+        self.assertIs(cached, result)
+        self.assertEqual(session.request.call_count, 3)
+        self.assertIsNone(session.request.call_args.kwargs.get("headers"))
+
+    # Error handling tests
+    def test_status_errors(self):
+        """Test HTTP error statuses map onto the same exceptions as the sync client."""
+        cases = [
+            (404, ResourceNotFoundError),
+            (400, ValidationError),
+            (401, AuthenticationError),
+            (403, AuthenticationError),
+            (500, APIError),
+        ]
+        for status, error_class in cases:
+            with self.subTest(status=status):
+                session = mock_session(status=status, text="error")
+                with patch.object(self.api, '_get_session', return_value=session):
+                    with self.assertRaises(error_class):
+                        asyncio.run(self.api.get_club("club-1"))
+
+    def test_connection_error(self):
+        """Test connection error handling."""
+        session = mock_session(side_effect=aiohttp.ClientConnectionError("Connection refused"))
+
+        with patch.object(self.api, '_get_session', return_value=session):
+            with self.assertRaises(APIError) as context:
+                asyncio.run(self.api.get_club("club-1"))
+
+        self.assertIn("Connection error", str(context.exception))
+
+    def test_timeout_error(self):
+        """Test a timed out call is reported as a connection error."""
+        session = mock_session(side_effect=asyncio.TimeoutError())
+
+        with patch.object(self.api, '_get_session', return_value=session):
+            with self.assertRaises(APIError) as context:
+                asyncio.run(self.api.get_club("club-1"))
+
+        self.assertIn("Connection error", str(context.exception))
+
+    def test_session_is_shared(self):
+        """Test the pooled session is created once and closed by close()."""
+        async def run():
+            session = self.api._get_session()
+            self.assertIs(self.api._get_session(), session)
+            self.assertEqual(session.connector.limit, self.api.pool_maxsize)
+            await self.api.close()
+            self.assertTrue(session.closed)
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Tests for the asyncio front end of the local database
+"""
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.async_database import AsyncDatabase
+from database.local_database import Database
+from test_local_database import club_data, member_data
+
+class TestAsyncDatabase(unittest.TestCase):
+    """Test cases for AsyncDatabase"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "bookclub.db")
+        db = Database(self.path)
+        db.save_club(club_data("club-1", "Quill's Bookclub", [member_data(1, "Alice", ["club-1"])], "session-1"))
+        db.close()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_with_db(self, test, **options):
+        async def run():
+            async with AsyncDatabase(Database(self.path), **options) as db:
+                return await test(db)
+        return asyncio.run(run())
+
+    def test_reads_and_writes(self):
+        """Test writes are awaited until committed and reads see them"""
+        async def test(db):
+            await db.add_member(2, "Bob", 0, 0, ["club-1"])
+            await db.update_member(2, points=15)
+            club = await db.get_club("club-1")
+            session = await db.get_active_session("club-1")
+            members = [member async for member in db.iter_members("club-1", page_size=1)]
+            return club, session, members
+
+        club, session, members = self.run_with_db(test)
+
+        self.assertEqual([(member["id"], member["points"]) for member in club["members"]], [(1, 10), (2, 15)])
+        self.assertEqual(session["id"], "session-1")
+        self.assertEqual([member["id"] for member in members], [1, 2])
+
+    def test_queued_writes_commit_together(self):
+        """Test writes queued at once share a transaction, and a failing one does not sink the others"""
+        async def test(db):
+            writes = [db.add_member(i, f"Member {i}", 0, 0, ["club-1"]) for i in range(10, 60)]
+            writes.append(db.save_club({"id": "club-2"}))  # Missing fields
+            results = await asyncio.gather(*writes, return_exceptions=True)
+            return results, db.stats(), await db.get_club("club-1")
+
+        results, stats, club = self.run_with_db(test)
+
+        self.assertIsInstance(results[-1], KeyError)
+        self.assertEqual(results[:-1], [None] * 50)
+        self.assertEqual(len(club["members"]), 51)
+        self.assertEqual(stats["writes"], 51)
+        self.assertLess(stats["batches"], 51)
+
+    def test_event_loop_is_not_blocked(self):
+        """Test database calls run off the event loop's thread"""
+        threads = []
+        db = Database(self.path)
+        get_club = db.get_club
+        db.get_club = lambda club_id=None: threads.append(threading.get_ident()) or get_club(club_id)
+
+        async def run():
+            async with AsyncDatabase(db) as async_db:
+                await async_db.get_club("club-1")
+                await async_db.update_club("club-1", "Renamed")
+
+        asyncio.run(run())
+
+        self.assertNotIn(threading.get_ident(), threads)
+        self.assertEqual(Database(self.path).get_club("club-1")["name"], "Renamed")
+
+    def test_close_commits_queued_writes(self):
+        """Test writes still queued when closing are committed, and later calls are refused"""
+        async def run():
+            db = AsyncDatabase(Database(self.path), batch_window=0.05)
+            write = asyncio.ensure_future(db.update_club("club-1", "Renamed"))
+            await asyncio.sleep(0)
+            await db.close()
+            await write
+            with self.assertRaises(RuntimeError):
+                await db.update_club("club-1", "Again")
+
+        asyncio.run(run())
+
+        self.assertEqual(Database(self.path).get_club("club-1")["name"], "Renamed")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+Tests for the API clients' batch methods
+"""
+import unittest
+from unittest.mock import patch, Mock, MagicMock
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.batch import chunked
+from api.bookclub_api import BookClubAPI, ResourceNotFoundError, ValidationError
+from api.async_bookclub_api import AsyncBookClubAPI
+from api.resilience import RetryPolicy
+from test_async_bookclub_api import mock_response
+from helpers import ok
+
+def not_found():
+    """Build a mock requests response failing with a 404"""
+    response = Mock()
+    response.status_code = 404
+    response.text = "Not found"
+    response.headers = {}
+    response.raise_for_status.side_effect = requests.exceptions.HTTPError("404 Error", response=response)
+    return response
+
+class TestBatchHelpers(unittest.TestCase):
+    """Test cases for batch helpers"""
+
+    def test_chunked(self):
+        """Test items are split into chunks of at most the given size"""
+        self.assertEqual(list(chunked([1, 2, 3, 4, 5], 2)), [[1, 2], [3, 4], [5]])
+        self.assertEqual(list(chunked([], 2)), [])
+
+class TestFanOut(unittest.TestCase):
+    """Test cases for batch methods without batch endpoints"""
+
+    def setUp(self):
+        self.api = BookClubAPI(
+            "http://test-url.supabase.co", "test-key",
+            retry=RetryPolicy(rand=lambda: 0.0), batch_concurrency=3
+        )
+
+    @patch('requests.Session.request')
+    def test_get_members_reports_per_item(self, mock_request):
+        """Test each member is fetched concurrently, with errors kept per item"""
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def request(method, url, params=None, **kwargs):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            if params["id"] == 3:
+                return not_found()
+            return ok({"id": params["id"], "name": f"Member {params['id']}"})
+        mock_request.side_effect = request
+
+        batch = self.api.get_members([1, 2, 3, 4, 5, 6, 1])
+
+        self.assertEqual(sorted(batch.results), [1, 2, 4, 5, 6])
+        self.assertEqual(batch.results[2].name, "Member 2")
+        self.assertIsInstance(batch.errors[3], ResourceNotFoundError)
+        self.assertFalse(batch.ok)
+        self.assertEqual(mock_request.call_count, 6)
+        self.assertLessEqual(peak[0], 3)
+
+    @patch('requests.Session.request')
+    def test_upsert_creates_missing_members(self, mock_request):
+        """Test an upsert falls back on create when the member doesn't exist"""
+        def request(method, url, json=None, **kwargs):
+            if method == "PUT" and json["id"] == 2:
+                return not_found()
+            return ok({"success": True, "method": method})
+        mock_request.side_effect = request
+
+        batch = self.api.upsert_members([{"id": 1, "name": "Old"}, {"id": 2, "name": "New"}])
+
+        self.assertTrue(batch.ok)
+        self.assertEqual(batch.results[1]["method"], "PUT")
+        self.assertEqual(batch.results[2]["method"], "POST")
+
+    def test_items_need_ids(self):
+        """Test a batch write rejects items without an ID"""
+        with self.assertRaises(ValueError):
+            self.api.update_members([{"name": "No ID"}])
+
+class TestBatchEndpoints(unittest.TestCase):
+    """Test cases for batch methods with batch endpoints"""
+
+    def setUp(self):
+        self.api = BookClubAPI(
+            "http://test-url.supabase.co", "test-key",
+            retry=RetryPolicy(rand=lambda: 0.0), batch_size=2, batch_endpoints=True
+        )
+
+    @patch('requests.Session.request')
+    def test_get_members_in_chunks(self, mock_request):
+        """Test reads are chunked, missing IDs fail, and found members are cached"""
+        def request(method, url, params=None, **kwargs):
+            ids = [int(member_id) for member_id in params["ids"].split(",")]
+            return ok({"members": [{"id": member_id} for member_id in ids if member_id != 3]})
+        mock_request.side_effect = request
+
+        batch = self.api.get_members([1, 2, 3])
+
+        self.assertEqual(sorted(batch.results), [1, 2])
+        self.assertIsInstance(batch.errors[3], ResourceNotFoundError)
+        self.assertEqual(sorted(call.kwargs["params"]["ids"] for call in mock_request.call_args_list), ["1,2", "3"])
+
+        self.api.get_member(1)
+        self.assertEqual(mock_request.call_count, 2)
+
+    @patch('requests.Session.request')
+    def test_update_members_outcomes(self, mock_request):
+        """Test per-item outcomes of a batch write become results and errors"""
+        def request(method, url, json=None, **kwargs):
+            return ok({"results": [
+                {"id": member["id"], "success": True} if member["id"] != 2
+                else {"id": 2, "status": 400, "error": "Bad points"}
+                for member in json["members"]
+            ]})
+        mock_request.side_effect = request
+
+        batch = self.api.update_members([{"id": 1, "points": 5}, {"id": 2, "points": -1}, {"id": 3, "points": 1}])
+
+        self.assertEqual(sorted(batch.results), [1, 3])
+        self.assertIsInstance(batch.errors[2], ValidationError)
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertFalse(mock_request.call_args.kwargs["json"]["upsert"])
+
+class TestAsyncBatch(unittest.TestCase):
+    """Test cases for AsyncBookClubAPI batch methods"""
+
+    def test_get_clubs_fan_out(self):
+        """Test clubs are fetched concurrently with errors kept per item"""
+        api = AsyncBookClubAPI("http://test-url.supabase.co", "test-key", retry=RetryPolicy(max_retries=0))
+        session = MagicMock()
+
+        def request(method, url, params=None, **kwargs):
+            if params["id"] == "club-2":
+                return mock_response(status=404, text="Not found")
+            return mock_response(payload={"id": params["id"], "name": "Test Club"})
+        session.request.side_effect = request
+
+        with patch.object(api, '_get_session', return_value=session):
+            batch = asyncio.run(api.get_clubs(["club-1", "club-2"]))
+
+        self.assertEqual(batch.results["club-1"].name, "Test Club")
+        self.assertIsInstance(batch.errors["club-2"], ResourceNotFoundError)
+
+
+if __name__ == '__main__':
+    unittest.main()
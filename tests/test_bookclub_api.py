@@ -8,13 +8,15 @@ import requests
 # Add parent directory to path to import the BookClubAPI class
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from api.bookclub_api import BookClubAPI, ResourceNotFoundError, ValidationError, AuthenticationError, APIError
+from api.resilience import RetryPolicy
 
 class TestBookClubAPI(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures before each test method."""
         self.api = BookClubAPI(
             base_url="http://test-url.supabase.co",
-            api_key="test-key"
+            api_key="test-key",
+            retry=RetryPolicy(rand=lambda: 0.0)  # Retry without actually backing off
         )
         
         # Verify the headers are set correctly
@@ -23,7 +25,7 @@ class TestBookClubAPI(unittest.TestCase):
         self.assertEqual(self.api.functions_url, "http://test-url.supabase.co/functions/v1")
 
     # Club endpoint tests
-    @patch('requests.get')
+    @patch('requests.Session.request')
     def test_get_club(self, mock_get):
         """Test get_club method."""
         # Set up mock response
@@ -42,15 +44,18 @@ class TestBookClubAPI(unittest.TestCase):
         result = self.api.get_club("club-1")
         
         # Assertions
-        self.assertEqual(result["name"], "Test Club")
-        self.assertEqual(len(result["members"]), 1)
+        self.assertEqual(result.name, "Test Club")
+        self.assertEqual(len(result.members), 1)
         mock_get.assert_called_once_with(
+            "GET",
             "http://test-url.supabase.co/functions/v1/club",
-            headers=self.api.headers,
-            params={"id": "club-1"}
+            params={"id": "club-1"},
+            json=None,
+            headers=None,
+            timeout=self.api.timeout
         )
 
-    @patch('requests.post')
+    @patch('requests.Session.request')
     def test_create_club(self, mock_post):
         """Test create_club method."""
         # Set up mock response
@@ -76,12 +81,15 @@ class TestBookClubAPI(unittest.TestCase):
         self.assertTrue(result["success"])
         self.assertEqual(result["club"]["name"], "New Club")
         mock_post.assert_called_once_with(
+            "POST",
             "http://test-url.supabase.co/functions/v1/club",
-            headers=self.api.headers,
-            json=club_data
+            params=None,
+            json=club_data,
+            headers=None,
+            timeout=self.api.timeout
         )
 
-    @patch('requests.put')
+    @patch('requests.Session.request')
     def test_update_club(self, mock_put):
         """Test update_club method."""
         # Set up mock response
@@ -102,12 +110,15 @@ class TestBookClubAPI(unittest.TestCase):
         self.assertTrue(result["success"])
         self.assertEqual(result["club"]["name"], "Updated Club Name")
         mock_put.assert_called_once_with(
+            "PUT",
             "http://test-url.supabase.co/functions/v1/club",
-            headers=self.api.headers,
-            json={"id": "club-1", **update_data}
+            params=None,
+            json={"id": "club-1", **update_data},
+            headers=None,
+            timeout=self.api.timeout
         )
 
-    @patch('requests.delete')
+    @patch('requests.Session.request')
     def test_delete_club(self, mock_delete):
         """Test delete_club method."""
         # Set up mock response
@@ -125,13 +136,16 @@ class TestBookClubAPI(unittest.TestCase):
         # Assertions
         self.assertTrue(result["success"])
         mock_delete.assert_called_once_with(
+            "DELETE",
             "http://test-url.supabase.co/functions/v1/club",
-            headers=self.api.headers,
-            params={"id": "club-1"}
+            params={"id": "club-1"},
+            json=None,
+            headers=None,
+            timeout=self.api.timeout
         )
 
     # Member endpoint tests
-    @patch('requests.get')
+    @patch('requests.Session.request')
     def test_get_member(self, mock_get):
         """Test get_member method."""
         # Set up mock response
@@ -151,15 +165,18 @@ class TestBookClubAPI(unittest.TestCase):
         result = self.api.get_member(1)
         
         # Assertions
-        self.assertEqual(result["name"], "Test Member")
-        self.assertEqual(result["points"], 100)
+        self.assertEqual(result.name, "Test Member")
+        self.assertEqual(result.points, 100)
         mock_get.assert_called_once_with(
+            "GET",
             "http://test-url.supabase.co/functions/v1/member",
-            headers=self.api.headers,
-            params={"id": 1}
+            params={"id": 1},
+            json=None,
+            headers=None,
+            timeout=self.api.timeout
         )
 
-    @patch('requests.post')
+    @patch('requests.Session.request')
     def test_create_member(self, mock_post):
         """Test create_member method."""
         # Set up mock response
@@ -187,12 +204,15 @@ class TestBookClubAPI(unittest.TestCase):
         self.assertTrue(result["success"])
         self.assertEqual(result["member"]["name"], "New Member")
         mock_post.assert_called_once_with(
+            "POST",
             "http://test-url.supabase.co/functions/v1/member",
-            headers=self.api.headers,
-            json=member_data
+            params=None,
+            json=member_data,
+            headers=None,
+            timeout=self.api.timeout
         )
 
-    @patch('requests.put')
+    @patch('requests.Session.request')
     def test_update_member(self, mock_put):
         """Test update_member method."""
         # Set up mock response
@@ -221,12 +241,15 @@ class TestBookClubAPI(unittest.TestCase):
         self.assertEqual(result["member"]["name"], "Updated Member")
         self.assertTrue(result["clubs_updated"])
         mock_put.assert_called_once_with(
+            "PUT",
             "http://test-url.supabase.co/functions/v1/member",
-            headers=self.api.headers,
-            json={"id": 1, **update_data}
+            params=None,
+            json={"id": 1, **update_data},
+            headers=None,
+            timeout=self.api.timeout
         )
 
-    @patch('requests.delete')
+    @patch('requests.Session.request')
     def test_delete_member(self, mock_delete):
         """Test delete_member method."""
         # Set up mock response
@@ -244,13 +267,16 @@ class TestBookClubAPI(unittest.TestCase):
         # Assertions
         self.assertTrue(result["success"])
         mock_delete.assert_called_once_with(
+            "DELETE",
             "http://test-url.supabase.co/functions/v1/member",
-            headers=self.api.headers,
-            params={"id": 1}
+            params={"id": 1},
+            json=None,
+            headers=None,
+            timeout=self.api.timeout
         )
 
     # Session endpoint tests
-    @patch('requests.get')
+    @patch('requests.Session.request')
     def test_get_session(self, mock_get):
         """Test get_session method."""
         # Set up mock response
@@ -270,15 +296,18 @@ class TestBookClubAPI(unittest.TestCase):
         result = self.api.get_session("session-1")
         
         # Assertions
-        self.assertEqual(result["book"]["title"], "Test Book")
-        self.assertEqual(len(result["discussions"]), 1)
+        self.assertEqual(result.book.title, "Test Book")
+        self.assertEqual(len(result.discussions), 1)
         mock_get.assert_called_once_with(
+            "GET",
             "http://test-url.supabase.co/functions/v1/session",
-            headers=self.api.headers,
-            params={"id": "session-1"}
+            params={"id": "session-1"},
+            json=None,
+            headers=None,
+            timeout=self.api.timeout
         )
 
-    @patch('requests.post')
+    @patch('requests.Session.request')
     def test_create_session(self, mock_post):
         """Test create_session method."""
         # Set up mock response
@@ -312,12 +341,15 @@ class TestBookClubAPI(unittest.TestCase):
         self.assertTrue(result["success"])
         self.assertEqual(result["session"]["book"]["title"], "New Book")
         mock_post.assert_called_once_with(
+            "POST",
             "http://test-url.supabase.co/functions/v1/session",
-            headers=self.api.headers,
-            json=session_data
+            params=None,
+            json=session_data,
+            headers=None,
+            timeout=self.api.timeout
         )
 
-    @patch('requests.put')
+    @patch('requests.Session.request')
     def test_update_session(self, mock_put):
         """Test update_session method."""
         # Set up mock response
@@ -348,12 +380,15 @@ class TestBookClubAPI(unittest.TestCase):
         self.assertTrue(result["updates"]["book"])
         self.assertTrue(result["updates"]["session"])
         mock_put.assert_called_once_with(
+            "PUT",
             "http://test-url.supabase.co/functions/v1/session",
-            headers=self.api.headers,
-            json={"id": "session-1", **update_data}
+            params=None,
+            json={"id": "session-1", **update_data},
+            headers=None,
+            timeout=self.api.timeout
         )
 
-    @patch('requests.delete')
+    @patch('requests.Session.request')
     def test_delete_session(self, mock_delete):
         """Test delete_session method."""
         # Set up mock response
@@ -371,13 +406,16 @@ class TestBookClubAPI(unittest.TestCase):
         # Assertions
         self.assertTrue(result["success"])
         mock_delete.assert_called_once_with(
+            "DELETE",
             "http://test-url.supabase.co/functions/v1/session",
-            headers=self.api.headers,
-            params={"id": "session-1"}
+            params={"id": "session-1"},
+            json=None,
+            headers=None,
+            timeout=self.api.timeout
         )
 
     # Error handling tests
-    @patch('requests.get')
+    @patch('requests.Session.request')
     def test_resource_not_found_error(self, mock_get):
         """Test ResourceNotFoundError handling."""
         # Set up mock to raise a 404 error
@@ -393,7 +431,7 @@ class TestBookClubAPI(unittest.TestCase):
         with self.assertRaises(ResourceNotFoundError):
             self.api.get_club("non-existent-club")
 
-    @patch('requests.post')
+    @patch('requests.Session.request')
     def test_validation_error(self, mock_post):
         """Test ValidationError handling."""
         # Set up mock to raise a 400 error
@@ -409,7 +447,7 @@ class TestBookClubAPI(unittest.TestCase):
         with self.assertRaises(ValidationError):
             self.api.create_club({"invalid": "data"})
 
-    @patch('requests.get')
+    @patch('requests.Session.request')
     def test_authentication_error(self, mock_get):
         """Test AuthenticationError handling."""
         # Set up mock to raise a 401 error
@@ -425,7 +463,7 @@ class TestBookClubAPI(unittest.TestCase):
         with self.assertRaises(AuthenticationError):
             self.api.get_club("club-1")
 
-    @patch('requests.get')
+    @patch('requests.Session.request')
     def test_connection_error(self, mock_get):
         """Test connection error handling."""
         # Set up mock to raise a ConnectionError
@@ -439,7 +477,7 @@ class TestBookClubAPI(unittest.TestCase):
         self.assertIn("Connection error", str(context.exception))
         self.assertIn("server is running", str(context.exception))
 
-    @patch('requests.get')
+    @patch('requests.Session.request')
     def test_general_api_error(self, mock_get):
         """Test general API error handling."""
         # Set up mock to raise a 500 error
@@ -458,6 +496,220 @@ class TestBookClubAPI(unittest.TestCase):
         # Verify the error message contains the status code
         self.assertIn("500", str(context.exception))
 
+    @patch('requests.Session.request')
+    def test_timeout_error(self, mock_request):
+        """Test that a timed out call is reported as a connection error."""
+        mock_request.side_effect = requests.exceptions.ReadTimeout("Read timed out")
+        
+        with self.assertRaises(APIError) as context:
+            self.api.get_club("club-1")
+        
+        self.assertIn("Connection error", str(context.exception))
+
+    # Session pooling tests
+    def test_session_is_pooled(self):
+        """Test the client keeps one keep-alive session with a sized connection pool."""
+        api = BookClubAPI(
+            base_url="http://test-url.supabase.co",
+            api_key="test-key",
+            pool_connections=2,
+            pool_maxsize=25
+        )
+        
+        adapter = api.session.get_adapter("https://test-url.supabase.co")
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 25)
+        self.assertEqual(api.session.headers["Connection"], "keep-alive")
+        self.assertEqual(api.session.headers["Authorization"], "Bearer test-key")
+
+    @patch('requests.Session.request')
+    def test_session_is_reused(self, mock_request):
+        """Test every verb goes through the same session."""
+        mock_response = Mock()
+        mock_response.json.return_value = {"success": True}
+        mock_response.raise_for_status = Mock()
+        mock_request.return_value = mock_response
+        
+        session = self.api.session
+        self.api.get_club("club-1")
+        self.api.update_member(1, {"points": 5})
+        self.api.delete_session("session-1")
+        
+        self.assertIs(self.api.session, session)
+        self.assertEqual(
+            [call.args[0] for call in mock_request.call_args_list],
+            ["GET", "PUT", "DELETE"]
+        )
+
+    @patch('requests.Session.request')
+    def test_per_call_timeout(self, mock_request):
+        """Test a per-call timeout overrides the client default."""
+        mock_response = Mock()
+        mock_response.json.return_value = {"id": "club-1"}
+        mock_response.raise_for_status = Mock()
+        mock_request.return_value = mock_response
+        
+        self.api.get_club("club-1", timeout=1.5)
+        
+        self.assertEqual(mock_request.call_args.kwargs["timeout"], 1.5)
+
+    def test_close(self):
+        """Test the client can be used as a context manager that closes its session."""
+        api = BookClubAPI("http://test-url.supabase.co", "test-key")
+        with patch.object(api.session, 'close') as mock_close:
+            with api:
+                pass
+        mock_close.assert_called_once()
+
+    # Cache tests
+    @patch('requests.Session.request')
+    def test_get_club_is_cached(self, mock_request):
+        """Test repeated reads are served from cache."""
+        mock_response = Mock()
+        mock_response.json.return_value = {"id": "club-1", "name": "Test Club"}
+        mock_response.raise_for_status = Mock()
+        mock_request.return_value = mock_response
+        
+        first = self.api.get_club("club-1")
+        second = self.api.get_club("club-1")
+        
+        self.assertIs(first, second)
+        mock_request.assert_called_once()
+        stats = self.api.stats()["cache"]
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    @patch('requests.Session.request')
+    def test_write_invalidates_cache(self, mock_request):
+        """Test a write through the client invalidates the reads it affects."""
+        mock_response = Mock()
+        mock_response.json.return_value = {"id": "club-1", "name": "Test Club"}
+        mock_response.raise_for_status = Mock()
+        mock_request.return_value = mock_response
+        
+        self.api.get_club("club-1")
+        self.api.update_session("session-1", {"due_date": "2025-06-15"})
+        self.api.get_club("club-1")
+        
+        self.assertEqual(
+            [call.args[0] for call in mock_request.call_args_list],
+            ["GET", "PUT", "GET"]
+        )
+
+    @patch('requests.Session.request')
+    def test_cache_disabled(self, mock_request):
+        """Test a cache TTL of 0 always goes to the API."""
+        api = BookClubAPI("http://test-url.supabase.co", "test-key", cache_ttl=0)
+        mock_response = Mock()
+        mock_response.json.return_value = {"id": 1}
+        mock_response.raise_for_status = Mock()
+        mock_request.return_value = mock_response
+        
+        api.get_member(1)
+        api.get_member(1)
+        
+        self.assertEqual(mock_request.call_count, 2)
+
+    # Conditional request tests
+    @patch('requests.Session.request')
+    def test_conditional_get(self, mock_request):
+        """Test an expired entry is revalidated with If-None-Match and a 304 skips decoding."""
+        now = [0.0]
+        self.api.cache.clock = lambda: now[0]
+        
+        full_response = Mock()
+        full_response.status_code = 200
+        full_response.headers = {"ETag": '"v1"', "Last-Modified": "Tue, 01 Apr 2025 00:00:00 GMT"}
+        full_response.json.return_value = {"id": "club-1", "name": "Test Club"}
+        full_response.raise_for_status = Mock()
+        
+        not_modified = Mock()
+        not_modified.status_code = 304
+        not_modified.headers = {}
+        not_modified.raise_for_status = Mock()
+        
+        mock_request.side_effect = [full_response, not_modified]
+        
+        first = self.api.get_club("club-1")
+        now[0] = self.api.cache.ttl + 1
+        second = self.api.get_club("club-1")
+        
+        self.assertIs(first, second)
+        not_modified.json.assert_not_called()
+        self.assertEqual(
+            mock_request.call_args.kwargs["headers"],
+            {"If-None-Match": '"v1"', "If-Modified-Since": "Tue, 01 Apr 2025 00:00:00 GMT"}
+        )
+        self.assertEqual(self.api.stats()["cache"]["revalidations"], 1)
+        
+        # The revalidated entry is fresh again
+        self.api.get_club("club-1")
+        self.assertEqual(mock_request.call_count, 2)
+
+    @patch('requests.Session.request')
+    def test_conditional_get_modified(self, mock_request):
+        """Test a changed resource replaces the cached object and its validators."""
+        now = [0.0]
+        self.api.cache.clock = lambda: now[0]
+        
+        responses = []
+        for etag, name in (('"v1"', "Old Name"), ('"v2"', "New Name")):
+            response = Mock()
+            response.status_code = 200
+            response.headers = {"ETag": etag}
+            response.json.return_value = {"id": "club-1", "name": name}
+            response.raise_for_status = Mock()
+            responses.append(response)
+        mock_request.side_effect = responses
+        
+        self.api.get_club("club-1")
+        now[0] = self.api.cache.ttl + 1
+        result = self.api.get_club("club-1")
+        
+        self.assertEqual(result.name, "New Name")
+        self.assertEqual(self.api.cache.peek(("club", "club-1")).etag, '"v2"')
+
+    @patch('requests.Session.request')
+    def test_conditional_get_invalidated_meanwhile(self, mock_request):
+        """Test a 304 for an entry invalidated while it was revalidated is not trusted, and the resource is read whole."""
+        now = [0.0]
+        self.api.cache.clock = lambda: now[0]
+        
+        full_responses = []
+        for etag, name in (('"v1"', "Old Name"), ('"v2"', "New Name")):
+            response = Mock()
+            response.status_code = 200
+            response.headers = {"ETag": etag}
+            response.json.return_value = {"id": "club-1", "name": name}
+            response.raise_for_status = Mock()
+            full_responses.append(response)
+        not_modified = Mock()
+        not_modified.status_code = 304
+        not_modified.headers = {}
+        not_modified.raise_for_status = Mock()
+        responses = iter([full_responses[0], not_modified, full_responses[1]])
+        
+        def request(*args, **kwargs):
+            response = next(responses)
+            if response is not_modified:
+                self.api.cache.invalidate("club", "club-1")  # A write lands while the 304 is in flight
+            return response
+        
+        mock_request.side_effect = request
+        
+        self.api.get_club("club-1")
+        now[0] = self.api.cache.ttl + 1
+        result = self.api.get_club("club-1")
+        
+        self.assertEqual(result.name, "New Name")
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertIsNone(mock_request.call_args.kwargs.get("headers"))
+        self.assertEqual(self.api.stats()["cache"]["revalidations"], 0)
+        
+        # The full read is cached
+        self.assertIs(self.api.get_club("club-1"), result)
+        self.assertEqual(mock_request.call_count, 3)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
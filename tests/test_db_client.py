@@ -0,0 +1,311 @@
+"""
+Tests for the Supabase database client
+"""
+import unittest
+from unittest.mock import patch
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.db_client import Database
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+def parse_columns(columns):
+    """Parse a PostgREST select list, e.g. '*, sessions(*, books(*))', into its columns and embedded tables."""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(columns):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(columns[start:i])
+            start = i + 1
+    parts.append(columns[start:])
+    fields, embeds = [], {}
+    for part in (part.strip() for part in parts):
+        if "(" in part:
+            name, inner = part.split("(", 1)
+            embeds[name.strip()] = parse_columns(inner[:-1])
+        else:
+            fields.append(part)
+    return fields, embeds
+
+class FakeQuery:
+    """Just enough of a PostgREST query builder to run the client's queries against in-memory rows"""
+
+    def __init__(self, supabase, table):
+        self.supabase = supabase
+        self.table = table
+        self.columns = (["*"], {})
+        self.filters = []
+        self.ordering = {}
+        self.count = {}
+        self.write = None
+
+    def select(self, columns="*"):
+        self.columns = parse_columns(columns)
+        return self
+
+    def insert(self, rows):
+        self.write = (rows if isinstance(rows, list) else [rows], None, False)
+        return self
+
+    def upsert(self, rows, on_conflict="", ignore_duplicates=False):
+        self.write = (rows if isinstance(rows, list) else [rows], on_conflict.split(","), ignore_duplicates)
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def is_(self, column, value):
+        self.filters.append(lambda row: row.get(column) is None if value == "null" else row.get(column) == value)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: row.get(column) > value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def order(self, column, desc=False, foreign_table=None):
+        self.ordering[foreign_table] = (column, desc)
+        return self
+
+    def limit(self, count, foreign_table=None):
+        self.count[foreign_table] = count
+        return self
+
+    def execute(self):
+        self.supabase.queries.append(self.table)
+        if self.table in self.supabase.failing:
+            self.supabase.failing.remove(self.table)
+            raise ConnectionError(f"Request to {self.table} failed")
+        if self.write is not None:
+            return FakeResponse(self.apply_write(*self.write))
+        rows = [row for row in self.supabase.tables.get(self.table, []) if all(f(row) for f in self.filters)]
+        return FakeResponse([self.shape(self.table, row, self.columns) for row in self.arrange(None, rows)])
+
+    def apply_write(self, rows, keys, ignore_duplicates):
+        """Insert rows, or upsert them on their key columns, numbering rows without an ID like a serial column."""
+        table = self.supabase.tables.setdefault(self.table, [])
+        written = []
+        for row in rows:
+            row = dict(row)
+            existing = next(
+                (other for other in table if keys and all(other.get(key) == row[key] for key in keys)), None
+            )
+            if existing is not None:
+                if not ignore_duplicates:
+                    existing.update(row)
+                    written.append(dict(existing))
+                continue
+            if "id" not in row and self.table == "books":
+                row["id"] = max((other["id"] for other in table), default=0) + 1
+            table.append(row)
+            written.append(dict(row))
+        return written
+
+    def arrange(self, table, rows):
+        """Order and limit the top-level rows (table None) or the rows embedded from a table."""
+        if table in self.ordering:
+            column, desc = self.ordering[table]
+            rows = sorted(rows, key=lambda row: row[column], reverse=desc)
+        if table in self.count:
+            rows = rows[:self.count[table]]
+        return rows
+
+    def shape(self, table, row, columns):
+        """Select a row's columns and embed its related rows, following the <table>_id foreign keys."""
+        fields, embeds = columns
+        shaped = dict(row) if "*" in fields else {field: row.get(field) for field in fields}
+        for name, inner in embeds.items():
+            related = self.supabase.tables.get(name, [])
+            if f"{name[:-1]}_id" in row:
+                # The row references one related row
+                match = next((other for other in related if other["id"] == row[f"{name[:-1]}_id"]), None)
+                shaped[name] = self.shape(name, match, inner) if match else None
+            else:
+                # Related rows reference this one
+                key = f"{table[:-1]}_id"
+                children = [other for other in related if other.get(key) == row["id"]]
+                shaped[name] = [self.shape(name, child, inner) for child in self.arrange(name, children)]
+        return shaped
+
+class FakeSupabase:
+    """In-memory stand-in for the Supabase client, counting the queries run through it"""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.queries = []
+        self.failing = []  # Tables whose next request fails
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+def make_tables(clubs=2, members_per_club=5):
+    """Build rows for several clubs, each with members, a couple of sessions and discussions."""
+    tables = {"clubs": [], "members": [], "memberclubs": [], "sessions": [], "books": [], "discussions": []}
+    for c in range(clubs):
+        club_id = f"club-{c}"
+        tables["clubs"].append({"id": club_id, "name": f"Club {c}"})
+        for m in range(members_per_club):
+            member_id = c * 1000 + m
+            tables["members"].append({"id": member_id, "name": f"Member {member_id}", "points": m, "numberofbooksread": 1})
+            tables["memberclubs"].append({"member_id": member_id, "club_id": club_id})
+        for s, due in enumerate(("2025-01-31", "2025-03-31")):
+            book_id = len(tables["books"]) + 1
+            session_id = f"{club_id}-session-{s}"
+            tables["books"].append({
+                "id": book_id, "title": f"Book {book_id}", "author": "Author", "edition": "", "year": 2000, "isbn": "0"
+            })
+            tables["sessions"].append({
+                "id": session_id, "club_id": club_id, "book_id": book_id, "duedate": due, "defaultchannel": 1234
+            })
+            tables["discussions"].append({
+                "id": f"{session_id}-disc", "session_id": session_id, "title": "Discussion", "date": due, "location": None
+            })
+    # One member of club-0 also belongs to club-1
+    tables["memberclubs"].append({"member_id": 0, "club_id": "club-1"})
+    return tables
+
+class TestDatabaseClient(unittest.TestCase):
+    """Test cases for the club-scoped reads of the Supabase client"""
+
+    def setUp(self):
+        self.supabase = FakeSupabase(make_tables())
+        env = {"SUPABASE_URL": "http://test", "SUPABASE_KEY": "key", "DEV_SUPABASE_URL": "http://test", "DEV_SUPABASE_KEY": "key"}
+        with patch.dict(os.environ, env), patch("database.db_client.create_client", return_value=self.supabase):
+            self.db = Database()
+
+    def test_get_club(self):
+        """Test a club is read with only its own members and its active session"""
+        club = self.db.get_club("club-1")
+
+        self.assertEqual(club["name"], "Club 1")
+        self.assertEqual([member["id"] for member in club["members"]], [0, 1000, 1001, 1002, 1003, 1004])
+        self.assertEqual(club["members"][0]["clubs"], ["club-0", "club-1"])
+        session = club["activeSession"]
+        self.assertEqual((session["id"], session["dueDate"]), ("club-1-session-1", "2025-03-31"))
+        self.assertEqual([discussion["id"] for discussion in session["discussions"]], ["club-1-session-1-disc"])
+
+    def test_default_and_missing_club(self):
+        """Test the first club is read by default, and a missing club reads as None"""
+        self.assertEqual(self.db.get_club()["id"], "club-0")
+        self.assertIsNone(self.db.get_club("club-9"))
+        self.assertIsNone(self.db.get_active_session("club-9"))
+
+    def test_iter_members(self):
+        """Test members are paged through by member ID"""
+        members = list(self.db.iter_members("club-0", page_size=2))
+
+        self.assertEqual([member["id"] for member in members], [0, 1, 2, 3, 4])
+        # Three pages of memberships, each with its members and their clubs embedded
+        self.assertEqual(self.supabase.queries, ["memberclubs"] * 3)
+
+    def test_round_trips(self):
+        """Test a club is read in two requests and a session in one"""
+        self.db.get_club("club-1")
+        self.assertEqual(self.supabase.queries, ["clubs", "memberclubs"])
+
+        self.supabase.queries = []
+        session = self.db.get_session_details("club-0-session-0")
+        self.assertEqual(self.supabase.queries, ["sessions"])
+        self.assertEqual((session["club_id"], session["book"]["title"]), ("club-0", "Book 1"))
+        self.assertEqual([discussion["id"] for discussion in session["discussions"]], ["club-0-session-0-disc"])
+        self.assertIsNone(self.db.get_session_details("missing"))
+
+    def test_cost_does_not_grow_with_database(self):
+        """Test reading a club takes the same number of queries however many other clubs there are"""
+        self.db.get_club("club-1")
+        few = len(self.supabase.queries)
+
+        self.supabase.tables = make_tables(clubs=50)
+        self.supabase.queries = []
+        self.db.get_club("club-1")
+
+        self.assertEqual(len(self.supabase.queries), few)
+
+
+class TestDatabaseClientWrites(unittest.TestCase):
+    """Test cases for the bulk writes of the Supabase client"""
+
+    def setUp(self):
+        self.supabase = FakeSupabase({})
+        env = {"SUPABASE_URL": "http://test", "SUPABASE_KEY": "key", "DEV_SUPABASE_URL": "http://test", "DEV_SUPABASE_KEY": "key"}
+        with patch.dict(os.environ, env), patch("database.db_client.create_client", return_value=self.supabase):
+            self.db = Database(chunk_size=100)
+
+    def club(self, members=300):
+        return {
+            "id": "club-1",
+            "name": "Quill's Bookclub",
+            "members": [
+                {"id": i, "name": f"Member {i}", "points": 0, "numberOfBooksRead": 0, "clubs": ["club-1"]}
+                for i in range(members)
+            ],
+            "activeSession": {
+                "id": "session-1",
+                "club_id": "club-1",
+                "book": {"title": "Dune", "author": "Frank Herbert", "edition": None, "year": 1965, "ISBN": None},
+                "dueDate": "2025-04-15",
+                "defaultChannel": 1234,
+                "discussions": [
+                    {"id": f"disc-{d}", "title": f"Part {d}", "date": "2025-03-15", "location": None} for d in range(3)
+                ]
+            }
+        }
+
+    def test_save_club_writes_in_bulk(self):
+        """Test a club is saved a chunk of rows per request, parents first"""
+        self.db.save_club(self.club())
+
+        self.assertEqual(self.supabase.queries, [
+            "clubs", "members", "members", "members", "memberclubs", "memberclubs", "memberclubs",
+            "sessions", "books", "books", "sessions", "discussions"
+        ])
+        self.assertEqual(len(self.supabase.tables["members"]), 300)
+        self.assertEqual(self.supabase.tables["sessions"][0]["book_id"], self.supabase.tables["books"][0]["id"])
+
+    def test_save_club_again_after_failure(self):
+        """Test saving a club again after a failed save completes it without duplicating rows"""
+        self.supabase.failing.append("discussions")
+        with self.assertRaises(ConnectionError):
+            self.db.save_club(self.club())
+        self.supabase.tables["members"][0]["points"] = 50  # Changed since the first save
+
+        self.db.save_club(self.club())
+
+        for table, count in (("clubs", 1), ("members", 300), ("memberclubs", 300), ("books", 1), ("sessions", 1), ("discussions", 3)):
+            self.assertEqual(len(self.supabase.tables[table]), count, table)
+        self.assertEqual(self.supabase.tables["members"][0]["points"], 50)
+
+    def test_save_club_again_after_book_was_saved(self):
+        """Test saving a club whose book was saved by an earlier, failed save reuses that book"""
+        book = dict(self.club()["activeSession"]["book"], id=1)
+        self.supabase.tables["books"] = [book]  # Left behind by a save that failed at the session
+
+        self.db.save_club(self.club(members=1))
+
+        self.assertEqual(self.supabase.tables["books"], [book])
+        self.assertEqual(self.supabase.tables["sessions"][0]["book_id"], 1)
+
+    def test_add_member(self):
+        """Test a member and their club links take one request each, and adding them again is harmless"""
+        self.db.add_member(7, "Grace", 0, 0, ["club-1", "club-2", "club-1"])
+        self.db.add_member(7, "Grace", 0, 0, ["club-1", "club-2"])
+
+        self.assertEqual(self.supabase.queries, ["members", "memberclubs"] * 2)
+        self.assertEqual(len(self.supabase.tables["members"]), 1)
+        self.assertEqual(sorted(link["club_id"] for link in self.supabase.tables["memberclubs"]), ["club-1", "club-2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Tests for deadline propagation to outbound calls
+"""
+import unittest
+from unittest.mock import patch, Mock, MagicMock
+import asyncio
+import os
+import sys
+import time
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.deadline import DeadlineExceeded, deadline, remaining, run_within_deadline, timeout_for
+from api.bookclub_api import BookClubAPI
+from api.resilience import RetryPolicy
+from services.weather_service import WeatherService
+
+class TestDeadline(unittest.TestCase):
+    """Test cases for the deadline helpers"""
+
+    def test_no_deadline(self):
+        """Test calls keep their own timeout when no budget is set"""
+        self.assertIsNone(remaining())
+        self.assertEqual(timeout_for((3.05, 10)), (3.05, 10))
+        self.assertIsNone(timeout_for())
+
+    def test_timeout_is_capped(self):
+        """Test every part of a timeout is capped at the time left"""
+        with deadline(5):
+            connect, read = timeout_for((3.05, 10))
+            self.assertEqual(connect, 3.05)
+            self.assertLessEqual(read, 5)
+            self.assertLessEqual(timeout_for(), 5)
+        self.assertIsNone(remaining())
+
+    def test_nested_deadline_only_shrinks(self):
+        """Test an inner budget cannot outlive the outer one"""
+        with deadline(1):
+            with deadline(60):
+                self.assertLessEqual(remaining(), 1)
+
+    def test_expired_deadline(self):
+        """Test no call is made once the budget has run out"""
+        with deadline(0):
+            with self.assertRaises(DeadlineExceeded):
+                timeout_for(10)
+
+    def test_late_call_is_cancelled(self):
+        """Test a call still running when the budget runs out is cancelled"""
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def run():
+            with deadline(0.05):
+                await run_within_deadline(slow())
+
+        with self.assertRaises(DeadlineExceeded):
+            asyncio.run(run())
+        self.assertEqual(cancelled, [True])
+
+    def test_deadline_follows_threads(self):
+        """Test the budget is visible to blocking calls run off the event loop"""
+        async def run():
+            with deadline(5):
+                return await run_within_deadline(asyncio.to_thread(remaining))
+
+        self.assertLessEqual(asyncio.run(run()), 5)
+
+class TestDeadlinePropagation(unittest.TestCase):
+    """Test cases for deadlines reaching the outbound calls"""
+
+    @patch('requests.Session.request')
+    def test_api_timeout_is_capped(self, mock_request):
+        """Test the API client caps its timeout at the time left"""
+        api = BookClubAPI("http://test-url.supabase.co", "test-key")
+        mock_request.return_value.json.return_value = {"id": "club-1"}
+
+        with deadline(2):
+            api.get_club("club-1")
+
+        connect, read = mock_request.call_args.kwargs["timeout"]
+        self.assertLessEqual(read, 2)
+
+    @patch('requests.Session.request')
+    def test_api_does_not_retry_past_deadline(self, mock_request):
+        """Test a retry that could not finish in time is not attempted"""
+        api = BookClubAPI(
+            "http://test-url.supabase.co", "test-key",
+            retry=RetryPolicy(backoff_base=10, rand=lambda: 1.0)
+        )
+        mock_request.side_effect = requests.exceptions.ConnectionError("reset")
+
+        start = time.monotonic()
+        with deadline(1):
+            with self.assertRaises(Exception):
+                api.get_member(1)
+        self.assertLess(time.monotonic() - start, 1)
+        mock_request.assert_called_once()
+
+    @patch('requests.Session.request')
+    def test_api_timeout_past_deadline(self, mock_request):
+        """Test a timeout caused by the deadline raises DeadlineExceeded"""
+        api = BookClubAPI("http://test-url.supabase.co", "test-key")
+
+        def hang(*args, **kwargs):
+            time.sleep(0.05)
+            raise requests.exceptions.ReadTimeout("timed out")
+        mock_request.side_effect = hang
+
+        with deadline(0.01):
+            with self.assertRaises(DeadlineExceeded):
+                api.get_session("session-1")
+        self.assertEqual(api.breaker.consecutive_failures, 0)
+
+    @patch('requests.get')
+    def test_weather_fallback(self, mock_get):
+        """Test a weather lookup that outlives the budget gets a fallback reply"""
+        def hang(*args, **kwargs):
+            time.sleep(0.2)
+            return MagicMock()
+        mock_get.side_effect = hang
+
+        async def run():
+            with deadline(0.05):
+                return await WeatherService("key").get_weather("Austin")
+
+        self.assertIn("took too long", asyncio.run(run()))
+
+
+if __name__ == '__main__':
+    unittest.main()
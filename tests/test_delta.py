@@ -0,0 +1,222 @@
+"""
+Tests for club delta sync
+"""
+import unittest
+from unittest.mock import patch, Mock, MagicMock, AsyncMock
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.delta import ClubDelta, ClubSync, apply_delta
+from api.models import Club
+from api.async_bookclub_api import AsyncBookClubAPI
+from api.bookclub_api import BookClubAPI
+from api.resilience import RetryPolicy
+from database.edge_function_stub import EdgeFunctionStub
+from database.local_database import Database
+from helpers import FakeClock
+
+CLUB = {
+    "id": "club-1",
+    "name": "Test Club",
+    "version": 10,
+    "discord_channel": 123,
+    "members": [
+        {"id": 1, "name": "Alice", "points": 10, "books_read": 2},
+        {"id": 2, "name": "Bob", "points": 0, "books_read": 0},
+    ],
+    "active_session": {
+        "id": "session-2",
+        "book": {"title": "Dune", "author": "Frank Herbert"},
+        "due_date": "2025-06-01",
+        "discussions": [{"id": "disc-1", "title": "Kickoff", "date": "2025-05-01"}],
+    },
+    "past_sessions": [{"id": "session-1", "book": {"title": "Emma", "author": "Jane Austen"}}],
+    "shame_list": [2],
+}
+
+class TestApplyDelta(unittest.TestCase):
+    """Test cases for patching a club with a delta"""
+
+    def setUp(self):
+        self.club = Club.from_dict(CLUB)
+
+    def test_members_are_patched(self):
+        """Test changed members are replaced, new ones added and deleted ones dropped"""
+        delta = ClubDelta.from_dict({
+            "id": "club-1",
+            "version": 11,
+            "members": [{"id": 2, "name": "Bob", "points": 5}, {"id": 3, "name": "Carol"}],
+            "deleted": {"members": [1]},
+        })
+        club = apply_delta(self.club, delta)
+
+        self.assertEqual([(member.id, member.points) for member in club.members], [(2, 5), (3, 0)])
+        self.assertEqual(club.version, 11)
+        self.assertEqual(delta.changes, 3)
+        # Unchanged parts are shared with the old club
+        self.assertIs(club.active_session, self.club.active_session)
+        self.assertIs(club.past_sessions[0], self.club.past_sessions[0])
+
+    def test_sessions_and_discussions_are_patched(self):
+        """Test session fields and discussions are patched separately"""
+        delta = ClubDelta.from_dict({
+            "id": "club-1",
+            "version": 12,
+            "sessions": [{"id": "session-2", "book": {"title": "Dune", "author": "Frank Herbert"}, "due_date": "2025-06-15"}],
+            "discussions": [
+                {"id": "disc-1", "session_id": "session-2", "title": "Kickoff!", "date": "2025-05-02"},
+                {"id": "disc-2", "session_id": "session-2", "title": "Wrap-up", "date": "2025-06-15"},
+            ],
+        })
+        session = apply_delta(self.club, delta).active_session
+
+        self.assertEqual(session.due_date.isoformat(), "2025-06-15")
+        self.assertEqual([discussion.title for discussion in session.discussions], ["Kickoff!", "Wrap-up"])
+
+        deleted = ClubDelta.from_dict({"id": "club-1", "version": 13, "deleted": {"discussions": ["disc-1"]}})
+        self.assertEqual(apply_delta(self.club, deleted).active_session.discussions, ())
+
+    def test_new_active_session(self):
+        """Test a new active session demotes the old one to the most recent past session"""
+        delta = ClubDelta.from_dict({
+            "id": "club-1",
+            "version": 14,
+            "club": {"name": "Test Club", "active_session_id": "session-3", "shame_list": []},
+            "sessions": [{"id": "session-3", "book": {"title": "Ulysses", "author": "James Joyce"}}],
+        })
+        club = apply_delta(self.club, delta)
+
+        self.assertEqual(club.active_session.id, "session-3")
+        self.assertEqual([session.id for session in club.past_sessions], ["session-2", "session-1"])
+        self.assertEqual(club.shame_list, ())
+        self.assertEqual(club.discord_channel, 123)
+
+class TestClubSync(unittest.TestCase):
+    """Test cases for keeping a club up to date"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.api = MagicMock()
+        self.api.get_club = AsyncMock(return_value=Club.from_dict(CLUB))
+        self.api.get_club_changes = AsyncMock()
+        self.sync = ClubSync(self.api, "club-1", clock=self.clock)
+
+    def test_first_sync_reads_whole_club(self):
+        """Test the club is read whole before there is a version to sync from"""
+        club = asyncio.run(self.sync.sync())
+
+        self.assertEqual(club.version, 10)
+        self.api.get_club_changes.assert_not_called()
+        self.api.cache.invalidate.assert_called_with("club", "club-1")
+        self.assertEqual(self.sync.stats()["full_syncs"], 1)
+
+    def test_delta_sync(self):
+        """Test later syncs pull changes since the club's version, and hand them to on_change"""
+        self.sync.on_change = AsyncMock()
+        asyncio.run(self.sync.refresh())
+        delta = ClubDelta.from_dict({"id": "club-1", "version": 11, "members": [{"id": 1, "name": "Alice", "points": 20}]})
+        self.api.get_club_changes.return_value = delta
+        self.clock.now += 30
+
+        club = asyncio.run(self.sync.sync())
+
+        self.api.get_club_changes.assert_awaited_once_with("club-1", 10)
+        self.assertEqual(club.members[0].points, 20)
+        self.assertEqual(
+            [call.args for call in self.sync.on_change.await_args_list], [(Club.from_dict(CLUB), None), (club, delta)]
+        )
+        self.assertEqual(self.sync.stats()["delta_syncs"], 1)
+        self.assertEqual(self.sync.stats()["changes_applied"], 1)
+        self.assertEqual(self.sync.staleness(), 0)
+
+    def test_resync(self):
+        """Test the club is read whole again when the server asks for it"""
+        asyncio.run(self.sync.refresh())
+        self.api.get_club_changes.return_value = ClubDelta.from_dict({"id": "club-1", "resync": True})
+
+        asyncio.run(self.sync.sync())
+
+        self.assertEqual(self.api.get_club.await_count, 2)
+        self.assertEqual(self.sync.stats()["resyncs"], 1)
+
+    def test_staleness(self):
+        """Test the club is only served while recent enough"""
+        self.assertIsNone(self.sync.fresh(60))
+        asyncio.run(self.sync.refresh())
+        self.assertIs(self.sync.fresh(60), self.sync.club)
+
+        self.api.get_club_changes.side_effect = Exception("Connection error")
+        self.clock.now += 90
+        with self.assertRaises(Exception):
+            asyncio.run(self.sync.sync())
+
+        self.assertIsNone(self.sync.fresh(60))
+        self.assertEqual(self.sync.stats()["failures"], 1)
+        self.assertEqual(self.sync.stats()["staleness"], 90)
+
+class TestDeltaSyncEndToEnd(unittest.TestCase):
+    """Test a synced club matches a fresh read, against the edge function stub"""
+
+    def setUp(self):
+        self.db = Database(":memory:", check_same_thread=False)
+        self.stub = EdgeFunctionStub(self.db).start()
+        self.api = BookClubAPI(self.stub.url, "test-key", retry=RetryPolicy(rand=lambda: 0.0))
+        self.api.create_club({
+            "id": "club-1",
+            "name": "Test Club",
+            "members": [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}],
+            "active_session": {
+                "id": "session-1",
+                "book": {"title": "Emma", "author": "Jane Austen"},
+                "discussions": [{"id": "disc-1", "title": "Kickoff", "date": "2025-05-01"}],
+            },
+        })
+
+    def tearDown(self):
+        self.api.close()
+        self.stub.stop()
+        self.db.connection.close()
+
+    def test_sync_matches_full_read(self):
+        """Test members, sessions and discussions changed since the last sync are patched in"""
+        async def run():
+            async with AsyncBookClubAPI(self.stub.url, "test-key") as api:
+                sync = ClubSync(api, "club-1")
+                await sync.refresh()
+
+                self.api.update_member(1, {"points": 15})
+                self.api.delete_member(2)
+                self.api.create_member({"id": 3, "name": "Carol", "clubs": ["club-1"]})
+                self.api.update_session("session-1", {
+                    "due_date": "2025-06-01",
+                    "discussions": [{"id": "disc-1", "title": "Kickoff!"}, {"title": "Wrap-up", "date": "2025-06-01"}],
+                })
+                self.api.create_session({"club_id": "club-1", "book": {"title": "Dune", "author": "Frank Herbert"}, "due_date": "2025-09-01"})
+
+                synced = await sync.sync()
+                return sync, synced
+
+        sync, synced = asyncio.run(run())
+        expected = self.api.get_club("club-1")
+
+        self.assertEqual(sync.stats()["delta_syncs"], 1)
+        self.assertEqual(synced.version, expected.version)
+        self.assertEqual(synced.name, expected.name)
+        self.assertEqual(sorted(synced.members, key=lambda member: member.id), list(expected.members))
+        self.assertEqual(synced.active_session.id, expected.active_session.id)
+        self.assertEqual(synced.active_session.book, expected.active_session.book)
+        past = synced.past_sessions[0]
+        self.assertEqual(past.id, "session-1")
+        self.assertEqual(past.due_date, expected.past_sessions[0].due_date)
+        self.assertEqual([discussion.title for discussion in past.discussions], ["Kickoff!", "Wrap-up"])
+
+    def test_unknown_version_resyncs(self):
+        """Test a version from before the stub started asks for a resync"""
+        delta = self.api.get_club_changes("club-1", 1)
+        self.assertTrue(delta.resync)
+
+
+if __name__ == '__main__':
+    unittest.main()
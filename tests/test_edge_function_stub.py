@@ -0,0 +1,215 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+
+# Add parent directory to path to import the stub and the API clients
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.async_bookclub_api import AsyncBookClubAPI
+from api.bookclub_api import APIError, BookClubAPI, ResourceNotFoundError, ValidationError
+from api.resilience import RetryPolicy
+from database.edge_function_stub import EdgeFunctionStub
+from database.local_database import Database
+
+CLUB = {
+    "id": "club-1",
+    "name": "Quill's Bookclub",
+    "discord_channel": 1234,
+    "members": [
+        {"id": 1, "name": "Alice", "points": 10, "books_read": 2},
+        {"id": 2, "name": "Bob", "points": 0, "books_read": 0},
+    ],
+    "active_session": {
+        "id": "session-1",
+        "book": {"title": "Fahrenheit 451", "author": "Ray Bradbury", "year": 1953},
+        "due_date": "2025-04-15",
+        "discussions": [{"id": "disc-1", "title": "First discussion", "date": "2025-03-15", "location": "virtual"}],
+        "shame_list": [2],
+    },
+}
+
+class TestEdgeFunctionStub(unittest.TestCase):
+    """End-to-end tests of the API client against the stub, over real HTTP."""
+
+    def setUp(self):
+        self.db = Database(":memory:", check_same_thread=False)
+        self.stub = EdgeFunctionStub(self.db, api_key="test-key").start()
+        self.api = BookClubAPI(self.stub.url, "test-key", cache_ttl=60, retry=RetryPolicy(rand=lambda: 0.0))
+        self.api.create_club(CLUB)
+
+    def tearDown(self):
+        self.api.close()
+        self.stub.stop()
+        self.db.connection.close()
+
+    def test_get_club(self):
+        club = self.api.get_club("club-1")
+        self.assertEqual(club.name, "Quill's Bookclub")
+        self.assertEqual(club.discord_channel, 1234)
+        self.assertEqual([member.name for member in club.members], ["Alice", "Bob"])
+        self.assertEqual(club.active_session.book.title, "Fahrenheit 451")
+        self.assertEqual(club.active_session.discussions[0].title, "First discussion")
+        self.assertEqual(club.shame_list, (2,))
+
+    def test_include_projects_the_response(self):
+        club = self.api.get_club("club-1", include=["active_session.due_date"])
+        self.assertEqual(club.id, "club-1")
+        self.assertIsNone(club.name)
+        self.assertEqual(club.members, ())
+        self.assertEqual(club.active_session.due_date.isoformat(), "2025-04-15")
+        self.assertIsNone(club.active_session.book)
+
+    def test_revalidation_answers_not_modified(self):
+        url = f"{self.api.functions_url}/club"
+        first = self.api.session.get(url, params={"id": "club-1"})
+        etag = first.headers["ETag"]
+        response = self.api.session.get(url, params={"id": "club-1"}, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.stub.stats()["not_modified"], 1)
+
+        self.api.update_club("club-1", {"name": "Renamed"})
+        response = self.api.session.get(url, params={"id": "club-1"}, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_writes_invalidate_and_are_visible(self):
+        self.api.get_club("club-1")
+        self.api.update_club("club-1", {"name": "Renamed"})
+        self.assertEqual(self.api.get_club("club-1").name, "Renamed")
+
+        self.api.update_member(2, {"points": 5, "books_read": 1})
+        member = self.api.get_member(2)
+        self.assertEqual((member.points, member.books_read), (5, 1))
+        self.assertEqual([club.id for club in member.clubs], ["club-1"])
+        self.assertEqual([club.id for club in member.shame_clubs], ["club-1"])
+
+    def test_sessions(self):
+        created = self.api.create_session({
+            "club_id": "club-1",
+            "book": {"title": "Dune", "author": "Frank Herbert"},
+            "due_date": "2025-06-01",
+        })
+        session_id = created["session"]["id"]
+        result = self.api.update_session(session_id, {
+            "due_date": "2025-06-15",
+            "discussions": [{"title": "Kickoff", "date": "2025-05-01"}],
+        })
+        self.assertTrue(result["updates"]["session"])
+
+        session = self.api.get_session(session_id)
+        self.assertEqual(session.due_date.isoformat(), "2025-06-15")
+        self.assertEqual(session.club.name, "Quill's Bookclub")
+        self.assertEqual([discussion.title for discussion in session.discussions], ["Kickoff"])
+
+        club = self.api.get_club("club-1")
+        self.assertEqual(club.active_session.id, session_id)
+        self.assertEqual([past.id for past in club.past_sessions], ["session-1"])
+
+    def test_active_session_compares_dates(self):
+        """Test M/D/Y due dates are stored as dates, so the session due last is the active one"""
+        for session_id, due_date in (("session-2", "12/1/2025"), ("session-3", "6/30/2025")):
+            self.api.create_session({
+                "id": session_id, "club_id": "club-1", "book": {"title": "Dune", "author": "Frank Herbert"}, "due_date": due_date
+            })
+
+        club = self.api.get_club("club-1")
+        self.assertEqual((club.active_session.id, club.active_session.due_date.isoformat()), ("session-2", "2025-12-01"))
+
+        self.api.update_session("session-3", {"due_date": "1/15/2026"})
+        self.assertEqual(self.api.get_club("club-1").active_session.id, "session-3")
+
+    def test_errors_map_to_client_exceptions(self):
+        with self.assertRaises(ResourceNotFoundError):
+            self.api.get_club("missing")
+        with self.assertRaises(ValidationError):
+            self.api.create_member({"id": 3})
+        self.api.delete_member(2)
+        with self.assertRaises(ResourceNotFoundError):
+            self.api.get_member(2)
+
+    def test_failed_request_writes_nothing(self):
+        """Test a request that fails part way through is rolled back whole"""
+        status, _ = self.stub.call("POST", "club", {}, {
+            "id": "club-2", "name": "Half Club", "members": [{"id": 3, "name": "Carol"}],
+            "active_session": {"id": "session-2", "book": {"title": "No Author"}},
+        })
+
+        self.assertEqual(status, 400)
+        with self.assertRaises(ResourceNotFoundError):
+            self.api.get_club("club-2")
+        with self.assertRaises(ResourceNotFoundError):
+            self.api.get_member(3)
+
+    def test_delete_session_without_a_book(self):
+        """Test a session with no book can be read and deleted"""
+        with self.db.transaction() as connection:
+            connection.execute("INSERT INTO Sessions (id, club_id, dueDate) VALUES ('session-0', 'club-1', '2025-01-01')")
+
+        self.assertIsNone(self.api.get_session("session-0").book)
+        self.api.delete_session("session-0")
+        with self.assertRaises(ResourceNotFoundError):
+            self.api.get_session("session-0")
+
+    def test_batch_endpoints(self):
+        api = BookClubAPI(self.stub.url, "test-key", batch_endpoints=True, retry=RetryPolicy(rand=lambda: 0.0))
+        try:
+            result = api.upsert_members([{"id": 2, "points": 7}, {"id": 3, "name": "Carol", "clubs": ["club-1"]}])
+            self.assertTrue(result.ok)
+            members = api.get_members([1, 2, 3, 4])
+            self.assertEqual(sorted(members.results), [1, 2, 3])
+            self.assertEqual(members.results[2].points, 7)
+            self.assertIsInstance(members.errors[4], ResourceNotFoundError)
+        finally:
+            api.close()
+
+    def test_injected_failures(self):
+        self.stub.error_rate = 1.0
+        with self.assertRaises(APIError):
+            self.api.get_member(1)
+        self.assertGreaterEqual(self.stub.stats()["injected_errors"], 1)
+
+    def test_rejects_wrong_api_key(self):
+        api = BookClubAPI(self.stub.url, "wrong-key", retry=RetryPolicy(rand=lambda: 0.0))
+        try:
+            with self.assertRaises(APIError):
+                api.get_club("club-1")
+        finally:
+            api.close()
+
+    def test_async_client(self):
+        async def run():
+            async with AsyncBookClubAPI(self.stub.url, "test-key") as api:
+                return await api.get_club("club-1")
+
+        club = asyncio.run(run())
+        self.assertEqual(club.active_session.id, "session-1")
+
+class TestEdgeFunctionStubOnFile(unittest.TestCase):
+    """Tests of the stub on a file database, whose reads could otherwise go through other connections."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.directory.name, "bookclub.db"), check_same_thread=False)
+        self.stub = EdgeFunctionStub(self.db)
+
+    def tearDown(self):
+        self.db.close()
+        self.directory.cleanup()
+
+    def test_requests_read_their_own_writes(self):
+        """Test each response reflects the write the request just made"""
+        status, created = self.stub.call("POST", "club", {}, CLUB)
+        self.assertEqual(status, 200)
+        self.assertEqual(created["club"]["active_session"]["id"], "session-1")
+
+        status, updated = self.stub.call("PUT", "member", {}, {"id": 2, "points": 5})
+        self.assertEqual((status, updated["member"]["points"]), (200, 5))
+
+        status, session = self.stub.call("POST", "session", {}, {
+            "club_id": "club-1", "book": {"title": "Dune", "author": "Frank Herbert"}, "due_date": "2025-06-01"
+        })
+        self.assertEqual((status, session["session"]["book"]["title"]), (200, "Dune"))
+        self.assertEqual(self.db.get_active_session("club-1")["id"], session["session"]["id"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Tests for the SQLite export
+"""
+import unittest
+import gzip
+import json
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database import export_data
+from database.export_data import export_sqlite_stream
+from database.local_database import Database
+from test_local_database import club_data, member_data
+
+class TestStreamingExport(unittest.TestCase):
+    """Test cases for export_sqlite_stream"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "bookclub.db")
+        self.output = os.path.join(self.directory.name, "export")
+        db = Database(self.path)
+        db.save_club(club_data("club-1", "Quill's Bookclub", [member_data(1, "Alice", ["club-1"])], "session-1"))
+        db.upsert_members({"id": i, "name": f"Member {i}"} for i in range(2, 2500))
+        db.close()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_lines(self, path, opener=open):
+        with opener(path, "rt") as f:
+            return [json.loads(line) for line in f]
+
+    def test_writes_a_file_per_table(self):
+        """Test every row is written, one JSON object per line, across several batches"""
+        with patch("builtins.print"):
+            result = export_sqlite_stream(self.path, self.output, batch_size=100)
+
+        members = self.read_lines(os.path.join(self.output, "Members.jsonl"))
+        self.assertEqual(len(members), 2499)
+        self.assertEqual(members[0], {"id": 1, "name": "Alice", "points": 10, "numberOfBooksRead": 1})
+        self.assertEqual(result["tables"]["Members"], 2499)
+        self.assertEqual(result["rows"], sum(result["tables"].values()))
+        self.assertGreater(result["rows_per_second"], 0)
+
+    def test_gzip(self):
+        """Test gzip output reads back to the same rows"""
+        with patch("builtins.print"):
+            export_sqlite_stream(self.path, self.output, compression="gzip")
+
+        discussions = self.read_lines(os.path.join(self.output, "Discussions.jsonl.gz"), gzip.open)
+        self.assertEqual([discussion["id"] for discussion in discussions], ["session-1-disc-1", "session-1-disc-2"])
+
+    def test_zstd_without_the_package(self):
+        """Test zstd compression fails clearly when zstandard is not installed"""
+        with patch.object(export_data, "zstandard", None), patch("builtins.print"):
+            with self.assertRaises(RuntimeError):
+                export_sqlite_stream(self.path, self.output, compression="zstd")
+
+
+if __name__ == '__main__':
+    unittest.main()
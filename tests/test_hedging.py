@@ -0,0 +1,124 @@
+"""
+Tests for hedged reads in the API clients
+"""
+import unittest
+from unittest.mock import patch, Mock, MagicMock, AsyncMock
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.hedging import HedgePolicy, LatencyTracker
+from api.bookclub_api import BookClubAPI
+from api.async_bookclub_api import AsyncBookClubAPI
+from test_async_bookclub_api import mock_response
+from helpers import ok
+
+def warmed_up_policy(**kwargs):
+    """Build a hedge policy that has seen enough fast reads to start hedging"""
+    policy = HedgePolicy(min_samples=5, min_delay=0.02, max_extra=1.0, **kwargs)
+    for _ in range(5):
+        policy.record(0.01)
+    return policy
+
+class TestHedgePolicy(unittest.TestCase):
+    """Test cases for LatencyTracker and HedgePolicy"""
+
+    def test_percentile(self):
+        """Test percentiles are taken by nearest rank over the window"""
+        tracker = LatencyTracker(window=10)
+        for latency in range(1, 21):
+            tracker.record(latency)
+        self.assertEqual(len(tracker), 10)
+        self.assertEqual(tracker.percentile(50), 15)
+        self.assertEqual(tracker.percentile(100), 20)
+        self.assertIsNone(LatencyTracker().percentile(95))
+
+    def test_waits_for_samples(self):
+        """Test nothing is hedged until enough latencies were recorded"""
+        policy = HedgePolicy(min_samples=3, min_delay=0.01)
+        policy.record(0.5)
+        self.assertIsNone(policy.start())
+        policy.record(0.5)
+        policy.record(0.5)
+        self.assertEqual(policy.start(), 0.5)
+
+    def test_extra_load_cap(self):
+        """Test hedges are capped at a fraction of reads"""
+        policy = HedgePolicy(max_extra=0.25)
+        allowed = []
+        for _ in range(8):
+            policy.start()
+            allowed.append(policy.allow_hedge())
+        self.assertEqual(allowed.count(True), 2)
+        self.assertEqual(policy.stats()["hedged"], 2)
+
+class TestClientHedging(unittest.TestCase):
+    """Test cases for hedged reads in BookClubAPI and AsyncBookClubAPI"""
+
+    @patch('requests.Session.request')
+    def test_slow_read_is_hedged(self, mock_request):
+        """Test a slow read gets a second attempt, which wins, and the loser is closed"""
+        api = BookClubAPI("http://test-url.supabase.co", "test-key", hedge=warmed_up_policy())
+        slow, fast = ok({"id": "club-1", "name": "Slow"}), ok({"id": "club-1", "name": "Fast"})
+        calls = []
+        closed = threading.Event()
+        slow.close.side_effect = lambda: closed.set()
+
+        def request(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.2)
+                return slow
+            return fast
+        mock_request.side_effect = request
+
+        club = api.get_club("club-1")
+
+        self.assertEqual(club.name, "Fast")
+        self.assertEqual(api.stats()["hedging"]["hedge_wins"], 1)
+        self.assertTrue(closed.wait(1))
+        api.close()
+
+    @patch('requests.Session.request')
+    def test_fast_read_is_not_hedged(self, mock_request):
+        """Test a read answering in time is sent once"""
+        api = BookClubAPI("http://test-url.supabase.co", "test-key", hedge=warmed_up_policy())
+        mock_request.return_value = ok({"id": "club-1"})
+
+        api.get_club("club-1")
+
+        mock_request.assert_called_once()
+        self.assertEqual(api.stats()["hedging"]["hedged"], 0)
+        api.close()
+
+    def test_async_loser_is_cancelled(self):
+        """Test the async client cancels the slower attempt"""
+        api = AsyncBookClubAPI("http://test-url.supabase.co", "test-key", hedge=warmed_up_policy())
+        cancelled = []
+
+        async def slow_enter():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        slow = mock_response(payload={"id": "club-1", "name": "Slow"})
+        slow.__aenter__ = AsyncMock(side_effect=slow_enter)
+        fast = mock_response(payload={"id": "club-1", "name": "Fast"})
+        session = MagicMock()
+        session.request.side_effect = [slow, fast]
+
+        with patch.object(api, '_get_session', return_value=session):
+            club = asyncio.run(api.get_club("club-1"))
+
+        self.assertEqual(club.name, "Fast")
+        self.assertEqual(cancelled, [True])
+        self.assertEqual(api.stats()["hedging"]["hedge_wins"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,399 @@
+"""
+Tests for the local SQLite database
+"""
+import unittest
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.local_database import Database, SCHEMA_VERSION, StorageProfile
+
+def club_data(club_id, name, members, session_id):
+    return {
+        "id": club_id,
+        "name": name,
+        "members": members,
+        "activeSession": {
+            "id": session_id,
+            "club_id": club_id,
+            "book": {"title": "Fahrenheit 451", "author": "Ray Bradbury", "edition": "", "year": 1953, "ISBN": 0},
+            "dueDate": "3/31/2025",
+            "defaultChannel": 1234,
+            "shameList": [],
+            "discussions": [
+                {"id": f"{session_id}-disc-1", "title": "First discussion", "date": "1/31/2025", "location": "virtual"},
+                {"id": f"{session_id}-disc-2", "title": "Final discussion", "date": "3/31/2025", "location": "virtual"}
+            ]
+        },
+        "pastSessions": []
+    }
+
+def member_data(member_id, name, clubs):
+    return {"id": member_id, "name": name, "points": member_id * 10, "clubs": clubs, "numberOfBooksRead": 1}
+
+class TestGetClub(unittest.TestCase):
+    """Test cases for reading a club back from the local database"""
+
+    def setUp(self):
+        self.db = Database(":memory:")
+        self.db.save_club(club_data("club-1", "Quill's Bookclub", [
+            member_data(1, "Alice", ["club-1"]),
+            member_data(2, "Bob", ["club-1", "club-2"]),
+        ], "session-1"))
+        self.db.save_club(club_data("club-2", "Other Club", [
+            member_data(2, "Bob", ["club-1", "club-2"]),
+            member_data(3, "Carol", ["club-2"]),
+        ], "session-2"))
+
+    def tearDown(self):
+        self.db.connection.close()
+
+    def test_get_club(self):
+        """Test a club is reconstructed with only its own members, session and discussions"""
+        club = self.db.get_club("club-2")
+
+        self.assertEqual(club["name"], "Other Club")
+        self.assertEqual(club["members"], [
+            {"id": 2, "name": "Bob", "points": 20, "clubs": ["club-1", "club-2"], "numberOfBooksRead": 1},
+            {"id": 3, "name": "Carol", "points": 30, "clubs": ["club-2"], "numberOfBooksRead": 1},
+        ])
+        session = club["activeSession"]
+        self.assertEqual(session["id"], "session-2")
+        self.assertEqual(session["book"]["author"], "Ray Bradbury")
+        self.assertEqual(session["defaultChannel"], 1234)
+        self.assertEqual(
+            [(discussion["id"], discussion["session_id"]) for discussion in session["discussions"]],
+            [("session-2-disc-1", "session-2"), ("session-2-disc-2", "session-2")]
+        )
+        self.assertEqual(club["pastSessions"], [])
+
+    def test_default_club(self):
+        """Test the first club is read when no ID is given"""
+        self.assertEqual(self.db.get_club()["id"], "club-1")
+
+    def test_missing_club(self):
+        """Test reading a club that does not exist"""
+        self.assertIsNone(self.db.get_club("club-3"))
+        self.assertIsNone(Database(":memory:").get_club())
+
+    def test_club_without_session(self):
+        """Test a club with no session has no active session"""
+        with self.db.connection:
+            self.db.connection.execute("INSERT INTO Clubs (id, name) VALUES ('club-3', 'New Club')")
+        self.db.add_member(4, "Dave", 0, 0, ["club-3"])
+
+        club = self.db.get_club("club-3")
+
+        self.assertIsNone(club["activeSession"])
+        self.assertEqual([member["id"] for member in club["members"]], [4])
+
+    def test_query_count_does_not_grow_with_members(self):
+        """Test the read takes the same number of queries however many members the club has"""
+        def count_queries():
+            statements = []
+            self.db.connection.set_trace_callback(statements.append)
+            try:
+                self.db.get_club("club-1")
+            finally:
+                self.db.connection.set_trace_callback(None)
+            return len(statements)
+
+        before = count_queries()
+        for member_id in range(10, 110):
+            self.db.add_member(member_id, f"Member {member_id}", 0, 0, ["club-1"])
+
+        self.assertEqual(count_queries(), before)
+        self.assertEqual(len(self.db.get_club("club-1")["members"]), 102)
+
+    def test_active_session_is_due_last(self):
+        """Test a club's session due last is its active one, comparing M/D/Y dates as dates"""
+        for session_id, due_date in (("session-3", "12/1/2025"), ("session-4", "6/30/2025")):
+            data = club_data("club-1", "Quill's Bookclub", [], session_id)
+            data["activeSession"]["dueDate"] = due_date
+            self.db.save_club(data)
+
+        session = self.db.get_active_session("club-1")
+
+        self.assertEqual((session["id"], session["dueDate"]), ("session-3", "2025-12-01"))
+        self.assertEqual(self.db.get_club("club-1")["activeSession"], session)
+        self.assertEqual(self.db.get_active_session("club-2")["id"], "session-2")
+        self.assertIsNone(self.db.get_active_session("club-3"))
+
+        self.db.update_session("session-4", dueDate="1/15/2026")
+        self.assertEqual(self.db.get_active_session("club-1")["dueDate"], "2026-01-15")
+
+    def test_iter_members(self):
+        """Test a club's members are paged through in ID order"""
+        self.db.upsert_members({"id": member_id, "name": f"Member {member_id}"} for member_id in range(10, 20))
+        self.db.link_members((member_id, "club-2") for member_id in range(10, 20))
+        statements = []
+        self.db.connection.set_trace_callback(statements.append)
+
+        members = list(self.db.iter_members("club-2", page_size=4))
+
+        self.db.connection.set_trace_callback(None)
+        self.assertEqual([member["id"] for member in members], [2, 3] + list(range(10, 20)))
+        self.assertEqual(members[0]["clubs"], ["club-1", "club-2"])
+        self.assertEqual(len([statement for statement in statements if "FROM MemberClubs" in statement]), 4)
+        self.assertEqual(list(self.db.iter_members("club-3")), [])
+
+class TestBulkWrites(unittest.TestCase):
+    """Test cases for bulk upserts"""
+
+    def setUp(self):
+        self.db = Database(":memory:")
+        self.db.save_club(club_data("club-1", "Quill's Bookclub", [member_data(1, "Alice", ["club-1"])], "session-1"))
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_upsert_members(self):
+        """Test members are inserted or updated, and left alone when not overwriting"""
+        count = self.db.upsert_members([{"id": 1, "name": "Alicia", "points": 50}, {"id": 2, "name": "Bob"}])
+        self.db.upsert_members([{"id": 2, "name": "Not Bob", "points": 99}], overwrite=False)
+
+        rows = self.db.connection.execute("SELECT id, name, points, numberOfBooksRead FROM Members ORDER BY id").fetchall()
+        self.assertEqual(count, 2)
+        self.assertEqual(rows, [(1, "Alicia", 50, 0), (2, "Bob", 0, 0)])
+
+    def test_streams_in_one_transaction(self):
+        """Test a generator is written in a single transaction"""
+        statements = []
+        self.db.connection.set_trace_callback(statements.append)
+        self.db.upsert_members({"id": i, "name": f"Member {i}"} for i in range(10, 5010))
+        self.db.link_members((i, "club-1") for i in range(10, 5010))
+        self.db.connection.set_trace_callback(None)
+
+        self.assertEqual(statements.count("COMMIT"), 2)
+        self.assertEqual(len(self.db.get_club("club-1")["members"]), 5001)
+
+    def test_failure_rolls_back(self):
+        """Test a failure part way through a generator writes nothing"""
+        def members():
+            yield {"id": 2, "name": "Bob"}
+            raise ValueError("Bad row")
+
+        with self.assertRaises(ValueError):
+            self.db.upsert_members(members())
+
+        self.assertIsNone(self.db.connection.execute("SELECT * FROM Members WHERE id = 2").fetchone())
+
+    def test_link_members_and_upsert_discussions(self):
+        """Test links are added once and discussions are updated in place"""
+        self.assertEqual(self.db.link_members([(1, "club-1"), (1, "club-2")]), 1)
+        self.db.upsert_discussions([
+            {"id": "session-1-disc-1", "session_id": "session-1", "title": "Kickoff", "date": "1/15/2025", "location": "cafe"}
+        ])
+
+        club = self.db.get_club("club-1")
+        self.assertEqual(club["members"][0]["clubs"], ["club-1", "club-2"])
+        discussion = club["activeSession"]["discussions"][0]
+        self.assertEqual((discussion["title"], discussion["location"]), ("Kickoff", "cafe"))
+
+    def test_update_in_one_statement(self):
+        """Test updates set every given column at once, including falsy values"""
+        statements = []
+        self.db.connection.set_trace_callback(statements.append)
+        self.db.update_member(1, name="Alicia", points=0, numberOfBooksRead=3)
+        self.db.connection.set_trace_callback(None)
+
+        self.assertEqual(len([statement for statement in statements if statement.startswith("UPDATE")]), 1)
+        member = self.db.get_club("club-1")["members"][0]
+        self.assertEqual((member["name"], member["points"], member["numberOfBooksRead"]), ("Alicia", 0, 3))
+
+class TestSchema(unittest.TestCase):
+    """Test cases for schema upgrades and the query plans they enable"""
+
+    # Statements allowed to scan a whole table, and why
+    ALLOWED_SCANS = {
+        "SELECT id, name FROM Clubs ORDER BY rowid LIMIT 1": "stops at the first row",
+    }
+
+    def test_upgrade_existing_database(self):
+        """Test a database created before the indexes is upgraded when opened, once"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bookclub.db")
+            connection = sqlite3.connect(path)
+            connection.execute("CREATE TABLE MemberClubs (member_id INTEGER, club_id TEXT, PRIMARY KEY (member_id, club_id))")
+            connection.execute("INSERT INTO MemberClubs VALUES (1, 'club-1')")
+            connection.commit()
+            connection.close()
+
+            for _ in range(2):
+                db = Database(path)
+                version = db.connection.execute("PRAGMA user_version").fetchone()[0]
+                indexes = {row[0] for row in db.connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+                rows = db.connection.execute("SELECT * FROM MemberClubs").fetchall()
+                db.connection.close()
+
+                self.assertEqual(version, SCHEMA_VERSION)
+                self.assertIn("idx_MemberClubs_club_id", indexes)
+                self.assertEqual(rows, [(1, "club-1")])
+
+    def test_upgrade_converts_due_dates(self):
+        """Test due dates stored as M/D/Y before the upgrade are converted to ISO dates"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bookclub.db")
+            db = Database(path)
+            db.save_club(club_data("club-1", "Quill's Bookclub", [], "session-1"))
+            with db.connection:
+                db.connection.execute("UPDATE Sessions SET dueDate = '12/1/2025'")
+                db.connection.execute("PRAGMA user_version = 2")
+            db.close()
+
+            db = Database(path)
+            due_date = db.connection.execute("SELECT dueDate FROM Sessions").fetchone()[0]
+            db.close()
+
+            self.assertEqual(due_date, "2025-12-01")
+
+    def test_no_full_scans(self):
+        """Test no query the database issues scans a whole table"""
+        db = Database(":memory:")
+        exercises = {
+            "create_tables": lambda: db.create_tables(),
+            "upgrade_schema": lambda: db.upgrade_schema(),
+            "save_club": lambda: db.save_club(club_data("club-1", "Quill's Bookclub", [
+                member_data(1, "Alice", ["club-1"]),
+            ], "session-1")),
+            "update_club": lambda: db.update_club("club-1", "Renamed"),
+            "add_member": lambda: db.add_member(2, "Bob", 0, 0, ["club-1"]),
+            "upsert_members": lambda: db.upsert_members([{"id": 3, "name": "Carol"}, {"id": 2, "name": "Robert"}]),
+            "link_members": lambda: db.link_members([(3, "club-1"), (2, "club-1")]),
+            "upsert_discussions": lambda: db.upsert_discussions([
+                {"id": "session-1-disc-3", "session_id": "session-1", "title": "Extra", "date": "3/1/2025"}
+            ]),
+            "get_session_details": lambda: db.get_session_details("session-1"),
+            "add_to_shame_list": lambda: db.add_to_shame_list("session-1", 2),
+            "update_session": lambda: db.update_session("session-1", "club-1", 1, "4/30/2025", 5678),
+            "update_discussion": lambda: db.update_discussion("session-1-disc-1", "session-1", "First", "2/1/2025", "cafe"),
+            "update_member": lambda: db.update_member(2, "Robert", 5, 1),
+            "get_club": lambda: (db.get_club("club-1"), db.get_club()),
+            "get_active_session": lambda: db.get_active_session("club-1"),
+            "iter_members": lambda: list(db.iter_members("club-1", page_size=1)),
+        }
+        public = {name for name in dir(Database) if not name.startswith("_") and callable(getattr(Database, name))}
+        public -= {"close", "transaction", "snapshot"}  # These issue no queries of their own
+        self.assertEqual(set(exercises), public, "Every public method must be exercised here")
+
+        statements = []
+        db.connection.set_trace_callback(statements.append)
+        for exercise in exercises.values():
+            exercise()
+        db.connection.set_trace_callback(None)
+
+        queries = {
+            " ".join(statement.split()) for statement in statements
+            if statement.lstrip().split(None, 1)[0].upper() in ("SELECT", "INSERT", "UPDATE", "DELETE")
+        }
+        self.assertTrue(queries)
+        for query in sorted(queries):
+            if query in self.ALLOWED_SCANS:
+                continue
+            plan = [row[3] for row in db.connection.execute("EXPLAIN QUERY PLAN " + query)]
+            scans = [step for step in plan if step.startswith("SCAN")]
+            self.assertEqual(scans, [], f"Full scan in: {query}")
+        db.connection.close()
+
+class TestStorage(unittest.TestCase):
+    """Test cases for the storage profile and the connection pool"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.directory.name, "bookclub.db"), profile=StorageProfile(readers=2))
+        self.db.save_club(club_data("club-1", "Quill's Bookclub", [member_data(1, "Alice", ["club-1"])], "session-1"))
+
+    def tearDown(self):
+        self.db.close()
+        self.directory.cleanup()
+
+    def test_profile_is_applied(self):
+        """Test every connection is tuned by the profile"""
+        pragmas = {
+            name: self.db.connection.execute(f"PRAGMA {name}").fetchone()[0]
+            for name in ("journal_mode", "synchronous", "cache_size", "temp_store")
+        }
+        self.assertEqual(pragmas, {"journal_mode": "wal", "synchronous": 1, "cache_size": -8192, "temp_store": 2})
+        with self.db.snapshot() as reader:
+            self.assertIsNot(reader, self.db.connection)
+            self.assertEqual(reader.execute("PRAGMA query_only").fetchone()[0], 1)
+            self.assertEqual(reader.execute("PRAGMA synchronous").fetchone()[0], 1)
+
+    def test_reads_do_not_wait_for_writes(self):
+        """Test reads from other threads see the last commit while a write is in progress"""
+        results = []
+        with self.db.transaction():
+            self.db.add_member(2, "Bob", 0, 0, ["club-1"])
+            reader = threading.Thread(target=lambda: results.append(self.db.get_club("club-1")))
+            reader.start()
+            reader.join(timeout=5)
+            self.assertFalse(reader.is_alive())
+            # The writing thread sees its own uncommitted write
+            self.assertEqual(len(self.db.get_club("club-1")["members"]), 2)
+
+        self.assertEqual([member["id"] for member in results[0]["members"]], [1])
+        self.assertEqual(len(self.db.get_club("club-1")["members"]), 2)
+
+    def test_nested_writes_share_a_transaction(self):
+        """Test a failure anywhere in nested writes rolls all of them back"""
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.db.add_member(2, "Bob", 0, 0, ["club-1"])
+                self.db.update_club("club-1", "Renamed")
+                raise RuntimeError("Abort")
+
+        club = self.db.get_club("club-1")
+        self.assertEqual(club["name"], "Quill's Bookclub")
+        self.assertEqual(len(club["members"]), 1)
+
+    def test_failed_commit_rolls_back(self):
+        """Test a write whose COMMIT fails is rolled back, leaving the writer usable"""
+        self.db.connection.execute("PRAGMA foreign_keys = ON")
+        with self.assertRaises(sqlite3.IntegrityError):
+            with self.db.transaction() as connection:
+                # Deferred, the orphaned discussion only fails the COMMIT
+                connection.execute("PRAGMA defer_foreign_keys = ON")
+                connection.execute(
+                    "INSERT INTO Discussions (id, session_id, title, date) VALUES ('orphan', 'missing', 'Orphan', '2025-01-01')"
+                )
+
+        self.assertFalse(self.db.connection.in_transaction)
+        self.assertIsNone(self.db.connection.execute("SELECT * FROM Discussions WHERE id = 'orphan'").fetchone())
+        self.db.update_club("club-1", "Renamed")
+        self.assertEqual(self.db.get_club("club-1")["name"], "Renamed")
+
+    def test_nested_reads_share_a_reader(self):
+        """Test a read made inside another borrows no second reader"""
+        db = Database(os.path.join(self.directory.name, "bookclub.db"), profile=StorageProfile(readers=1))
+        try:
+            reader = threading.Thread(target=lambda: db.get_club("club-1"))
+            reader.start()
+            reader.join(timeout=5)
+            self.assertFalse(reader.is_alive())
+        finally:
+            db.close()
+
+    def test_concurrent_reads(self):
+        """Test reads from several threads at once all succeed"""
+        errors = []
+
+        def read():
+            try:
+                for _ in range(20):
+                    assert self.db.get_club("club-1")["id"] == "club-1"
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,19 +2,27 @@
 Tests for message and event handlers
 """
 import unittest
+import os
+import sqlite3
+import sys
+import tempfile
 from unittest.mock import patch, MagicMock, AsyncMock
 import discord
 import random
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.async_database import AsyncDatabase
+from database.local_database import Database
 from events.message_handler import setup_message_handlers
 from utils.constants import GREETINGS, REACTIONS
 
-class TestMessageHandler(unittest.TestCase):
+class TestMessageHandler(unittest.IsolatedAsyncioTestCase):
     """Test cases for message handler"""
     
     def setUp(self):
         """Set up common test fixtures"""
         self.bot = MagicMock()
+        self.bot.process_commands = AsyncMock()
         
         # Store event handlers
         self.handlers = {}
@@ -40,7 +48,7 @@ class TestMessageHandler(unittest.TestCase):
     async def test_on_message_from_bot(self):
         """Test message handler ignores bot's own messages"""
         # Create a message from the bot itself
-        message = MagicMock()
+        message = AsyncMock()
         message.author = self.bot.user
         
         # Run the handler
@@ -54,7 +62,7 @@ class TestMessageHandler(unittest.TestCase):
     async def test_on_message_with_bot_mention(self):
         """Test message handler responds to bot mentions"""
         # Create a message with bot mention
-        message = MagicMock()
+        message = AsyncMock()
         message.author = MagicMock()  # Not the bot
         message.content = "Hey @bot, how are you?"
         message.mentions = [self.bot.user]
@@ -73,7 +81,7 @@ class TestMessageHandler(unittest.TestCase):
     async def test_on_message_with_keyword(self):
         """Test message handler responds to keywords"""
         # Create a message with the 'together' keyword
-        message = MagicMock()
+        message = AsyncMock()
         message.author = MagicMock()  # Not the bot
         message.content = "We should read together next week."
         message.mentions = []
@@ -88,7 +96,7 @@ class TestMessageHandler(unittest.TestCase):
     async def test_on_message_random_reaction(self):
         """Test message handler sometimes adds random reactions"""
         # Create a normal message
-        message = MagicMock()
+        message = AsyncMock()
         message.author = MagicMock()  # Not the bot
         message.content = "I'm reading a great book."
         message.mentions = []
@@ -113,8 +121,9 @@ class TestMessageHandler(unittest.TestCase):
         member.id = 12345
         
         # Mock the bot.get_channel method
-        channel = MagicMock()
+        channel = AsyncMock()
         self.bot.get_channel.return_value = channel
+        self.bot.db.add_member = AsyncMock()
         
         # Force a specific greeting choice
         with patch('random.choice', return_value="Welcome"):
@@ -134,13 +143,40 @@ class TestMessageHandler(unittest.TestCase):
             self.assertIn("@NewUser", embed.description)
             
             # Verify the database was updated
-            self.bot.db.save_club.assert_called_once()
-            args, _ = self.bot.db.save_club.call_args
-            club_data = args[0]
-            self.assertEqual(club_data['name'], "Quill's Bookclub")
-            self.assertEqual(len(club_data['members']), 1)
-            self.assertEqual(club_data['members'][0]['id'], 12345)
-            self.assertEqual(club_data['members'][0]['name'], "NewUser")
+            self.bot.db.add_member.assert_awaited_once_with(12345, "NewUser", 0, 0, [self.bot.config.DEFAULT_CLUB_ID])
+
+    async def test_on_member_join_without_local_database(self):
+        """Test the welcome is sent and nothing is recorded when the local database is disabled"""
+        member = MagicMock()
+        member.name = "NewUser"
+        member.id = 12345
+        channel = AsyncMock()
+        self.bot.get_channel.return_value = channel
+        self.bot.db = None
+
+        await self.handlers['on_member_join'](member)
+
+        channel.send.assert_awaited_once()
+
+    async def test_on_member_join_records_member(self):
+        """Test a member who joins is added to the default club in the local database"""
+        member = MagicMock()
+        member.name = "NewUser"
+        member.id = 12345
+        self.bot.get_channel.return_value = None
+        self.bot.config.DEFAULT_CLUB_ID = "club-1"
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "bookclub.db")
+        self.bot.db = AsyncDatabase(Database(path))
+
+        await self.handlers['on_member_join'](member)
+        await self.bot.db.close()  # Commits the queued write
+
+        connection = sqlite3.connect(path)
+        self.assertEqual(connection.execute("SELECT id, name, points FROM Members").fetchall(), [(12345, "NewUser", 0)])
+        self.assertEqual(connection.execute("SELECT member_id, club_id FROM MemberClubs").fetchall(), [(12345, "club-1")])
+        connection.close()
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Tests for the metrics registry and the API clients' instrumentation
+"""
+import unittest
+from unittest.mock import patch, Mock, MagicMock, AsyncMock
+import asyncio
+import os
+import sys
+import urllib.request
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.metrics import MetricsRegistry, body_size, serve_metrics
+from api.bookclub_api import APIError, BookClubAPI, ResourceNotFoundError
+from api.async_bookclub_api import AsyncBookClubAPI
+from api.resilience import RetryPolicy
+from database.edge_function_stub import EdgeFunctionStub
+from database.local_database import Database
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test cases for counters, histograms and their exposition"""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_histogram(self):
+        """Test observations land in the right bucket and are rendered cumulatively"""
+        histogram = self.registry.histogram("latency_seconds", "Latency", ("endpoint",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, "club")
+        histogram.observe(0.5, "club")
+        histogram.observe(5.0, "club")
+
+        self.assertEqual(histogram.count("club"), 3)
+        self.assertAlmostEqual(histogram.sum("club"), 5.55)
+        text = self.registry.render()
+        self.assertIn("# TYPE latency_seconds histogram", text)
+        self.assertIn('latency_seconds_bucket{endpoint="club",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{endpoint="club",le="1"} 2', text)
+        self.assertIn('latency_seconds_bucket{endpoint="club",le="+Inf"} 3', text)
+        self.assertIn('latency_seconds_count{endpoint="club"} 3', text)
+
+    def test_counter(self):
+        """Test counters add up per label set and escape label values"""
+        counter = self.registry.counter("errors_total", "Errors", ("error",))
+        counter.inc("Timeout")
+        counter.inc("Timeout", amount=2)
+        counter.inc('say "hi"')
+
+        self.assertEqual(counter.value("Timeout"), 3)
+        self.assertEqual(counter.value("ConnectionError"), 0)
+        self.assertIn('errors_total{error="say \\"hi\\""} 1', self.registry.render())
+        with self.assertRaises(ValueError):
+            counter.inc("too", "many")
+
+    def test_registration(self):
+        """Test metrics are registered once and conflicting registrations are refused"""
+        counter = self.registry.counter("calls_total", "Calls", ("endpoint",))
+        self.assertIs(self.registry.counter("calls_total", "Calls", ("endpoint",)), counter)
+        with self.assertRaises(ValueError):
+            self.registry.histogram("calls_total", "Calls", ("endpoint",))
+
+    def test_snapshot(self):
+        """Test the registry dumps as JSON-compatible data"""
+        self.registry.histogram("size_bytes", "Size", buckets=(100,)).observe(50)
+        snapshot = self.registry.snapshot()
+
+        self.assertEqual(snapshot["size_bytes"]["type"], "histogram")
+        self.assertEqual(snapshot["size_bytes"]["values"][0]["buckets"], {100: 1, "+Inf": 0})
+
+    def test_body_size(self):
+        """Test body sizes are only reported when they can be told"""
+        self.assertEqual(body_size(b"abc"), 3)
+        self.assertEqual(body_size("é"), 2)
+        self.assertEqual(body_size(None), 0)
+        self.assertIsNone(body_size(Mock()))
+
+    def test_serve_metrics(self):
+        """Test the registry can be scraped over HTTP"""
+        self.registry.counter("scraped_total", "Scrapes").inc()
+        server = serve_metrics(self.registry, port=0)
+        try:
+            host, port = server.server_address[:2]
+            with urllib.request.urlopen(f"http://{host}:{port}/metrics") as response:
+                text = response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertIn("scraped_total 1", text)
+
+class TestClientMetrics(unittest.TestCase):
+    """Test the API clients record every call, against the edge function stub"""
+
+    def setUp(self):
+        self.db = Database(":memory:", check_same_thread=False)
+        self.stub = EdgeFunctionStub(self.db).start()
+        self.registry = MetricsRegistry()
+        self.api = BookClubAPI(self.stub.url, "test-key", retry=RetryPolicy(rand=lambda: 0.0), metrics=self.registry)
+        self.api.create_club({"id": "club-1", "name": "Test Club", "members": [{"id": 1, "name": "Alice"}]})
+
+    def tearDown(self):
+        self.api.close()
+        self.stub.stop()
+        self.db.connection.close()
+
+    def test_sync_client(self):
+        """Test latency, sizes, decode time and errors are recorded per endpoint, verb and status"""
+        self.api.get_club("club-1")
+        with self.assertRaises(ResourceNotFoundError):
+            self.api.get_member(2)
+
+        latency = self.registry.get("bookclub_api_request_seconds")
+        self.assertEqual(latency.count("club", "POST", "200"), 1)
+        self.assertEqual(latency.count("club", "GET", "200"), 1)
+        self.assertEqual(latency.count("member", "GET", "404"), 1)
+        self.assertGreater(self.registry.get("bookclub_api_request_bytes").sum("club", "POST"), 0)
+        self.assertGreater(self.registry.get("bookclub_api_response_bytes").sum("club", "GET", "200"), 0)
+        self.assertEqual(self.registry.get("bookclub_api_decode_seconds").count("club"), 2)
+        self.assertEqual(
+            self.registry.get("bookclub_api_errors_total").value("member", "GET", "ResourceNotFoundError"), 1
+        )
+
+    def test_async_client(self):
+        """Test the async client records the same metrics"""
+        async def run():
+            async with AsyncBookClubAPI(self.stub.url, "test-key", metrics=self.registry) as api:
+                await api.get_club("club-1")
+                await api.update_member(1, {"points": 3})
+
+        asyncio.run(run())
+
+        latency = self.registry.get("bookclub_api_request_seconds")
+        self.assertEqual(latency.count("club", "GET", "200"), 1)
+        self.assertEqual(latency.count("member", "PUT", "200"), 1)
+        self.assertGreater(self.registry.get("bookclub_api_request_bytes").sum("member", "PUT"), 0)
+        self.assertEqual(self.registry.get("bookclub_api_decode_seconds").count("member"), 1)
+
+    def test_connection_errors(self):
+        """Test attempts that get no response are labelled with their error class"""
+        self.stub.stop()
+        api = BookClubAPI(self.stub.url, "test-key", retry=RetryPolicy(rand=lambda: 0.0), metrics=self.registry)
+        try:
+            with self.assertRaises(APIError):
+                api.get_club("club-1")
+        finally:
+            api.close()
+
+        errors = self.registry.get("bookclub_api_errors_total")
+        self.assertEqual(errors.value("club", "GET", "ConnectionError"), api.retry.max_retries + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
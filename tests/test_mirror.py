@@ -0,0 +1,208 @@
+"""
+Tests for the local SQLite mirror of a club
+"""
+import unittest
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.async_bookclub_api import AsyncBookClubAPI
+from api.bookclub_api import APIError
+from api.resilience import RetryPolicy
+from database.edge_function_stub import EdgeFunctionStub
+from database.local_database import Database
+from database.mirror import ClubMirror
+from test_edge_function_stub import CLUB
+
+PAST_SESSION = {
+    "id": "session-0",
+    "book": {"title": "Brave New World", "author": "Aldous Huxley"},
+    "due_date": "2025-01-15",
+}
+
+def without_book_ids(club):
+    """The club with its book IDs cleared, since the local copy assigns its own."""
+    def clear(session):
+        return session.replace(book=session.book.replace(id=None) if session.book else None)
+    return club.replace(
+        active_session=clear(club.active_session) if club.active_session else None,
+        past_sessions=tuple(clear(session) for session in club.past_sessions)
+    )
+
+class TestClubMirror(unittest.TestCase):
+    """Test cases for ClubMirror, with the edge function stub standing in for Supabase"""
+
+    def setUp(self):
+        self.remote_db = Database(":memory:", check_same_thread=False)
+        self.remote = EdgeFunctionStub(self.remote_db)
+        self.remote.call("POST", "club", {}, {key: value for key, value in CLUB.items() if key != "active_session"})
+        self.remote.call("POST", "session", {}, {**PAST_SESSION, "club_id": "club-1"})
+        self.remote.call("POST", "session", {}, {**CLUB["active_session"], "club_id": "club-1"})
+        self.remote.call("PUT", "club", {}, {"id": "club-1", "discord_channel": 1234})
+        self.remote.start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "mirror.db")
+
+    def tearDown(self):
+        self.remote.stop()
+        self.remote_db.close()
+        self.directory.cleanup()
+
+    def run_with_mirror(self, test):
+        async def run():
+            api = AsyncBookClubAPI(self.remote.url, "test-key", retry=RetryPolicy(max_retries=0))
+            async with ClubMirror(api, Database(self.path), "club-1") as mirror:
+                return await test(mirror)
+        return asyncio.run(run())
+
+    def remote_reads(self):
+        return self.remote.stats()["requests"].get("GET club", 0) + self.remote.stats()["requests"].get("GET session", 0)
+
+    def test_reads_are_served_locally(self):
+        """Test a hydrated club and its sessions are read from the local copy, matching Supabase"""
+        async def test(mirror):
+            remote = await mirror.hydrate()
+            reads = self.remote_reads()
+            club = await mirror.get_club("club-1")
+            past = await mirror.get_session("session-0")
+            return remote, club, past, reads
+
+        remote, club, past, reads = self.run_with_mirror(test)
+
+        self.assertEqual(self.remote_reads(), reads)
+        self.assertEqual(club.version, remote.version)
+        self.assertEqual(club.discord_channel, 1234)
+        self.assertEqual([(m.id, m.points, m.books_read) for m in club.members], [(1, 10, 2), (2, 0, 0)])
+        self.assertEqual(club.active_session.id, "session-1")
+        self.assertEqual(club.active_session.book.title, "Fahrenheit 451")
+        self.assertEqual([d.id for d in club.active_session.discussions], ["disc-1"])
+        self.assertEqual(club.shame_list, (2,))
+        self.assertEqual([session.id for session in club.past_sessions], ["session-0"])
+        self.assertEqual(past.book.author, "Aldous Huxley")
+
+    def test_writes_go_through_and_are_applied_locally(self):
+        """Test writes reach Supabase, and the local copy picks them up"""
+        async def test(mirror):
+            await mirror.hydrate()
+            await mirror.update_member(2, {"points": 25})
+            await mirror.create_member({"id": 3, "name": "Carol", "clubs": ["club-1"]})
+            await mirror.update_session("session-1", {"due_date": "2025-05-01"})
+            return await mirror.get_club("club-1"), mirror.stats()
+
+        club, stats = self.run_with_mirror(test)
+
+        self.assertEqual(self.remote_db.get_club("club-1")["members"][1]["points"], 25)
+        self.assertEqual([(m.id, m.points) for m in club.members], [(1, 10), (2, 25), (3, 0)])
+        self.assertEqual(club.active_session.due_date.isoformat(), "2025-05-01")
+        self.assertEqual(stats["write_throughs"], 3)
+        self.assertEqual(stats["pull_failures"], 0)
+        self.assertEqual(stats["sync"]["full_syncs"], 1)
+
+    def test_deltas_write_only_what_changed(self):
+        """Test a pulled delta updates the changed rows instead of rewriting the club"""
+        async def test(mirror):
+            await mirror.hydrate()
+            statements = []
+            mirror.db.connection.set_trace_callback(statements.append)
+            await mirror.update_member(2, {"points": 25})
+            mirror.db.connection.set_trace_callback(None)
+            return statements, await mirror.get_club("club-1")
+
+        statements, club = self.run_with_mirror(test)
+
+        written = [
+            " ".join(statement.split()) for statement in statements
+            if statement.lstrip().startswith(("INSERT", "UPDATE", "DELETE"))
+        ]
+        self.assertTrue(written)
+        self.assertTrue(all("Members" in statement or "MemberClubs" in statement for statement in written), written)
+        self.assertEqual([(m.id, m.points) for m in club.members], [(1, 10), (2, 25)])
+
+    def test_deltas_match_a_full_read(self):
+        """Test a copy kept through deltas reads the same as the club read whole from Supabase"""
+        async def test(mirror):
+            await mirror.hydrate()
+            await mirror.create_session({
+                "id": "session-2", "club_id": "club-1", "due_date": "2025-06-01",
+                "book": {"title": "Dune", "author": "Frank Herbert"},
+                "discussions": [{"id": "disc-2", "title": "Kickoff", "date": "2025-05-01"}],
+            })
+            await mirror.update_session("session-1", {
+                "book": {"title": "Fahrenheit 451 (Annotated)"}, "discussion_ids_to_delete": ["disc-1"]
+            })
+            await mirror.update_session("session-2", {"discussions": [{"id": "disc-2", "title": "Opening night"}]})
+            await mirror.delete_member(2)
+            await mirror.update_club("club-1", {"name": "Renamed", "discord_channel": 5678})
+            await mirror.delete_session("session-0")
+            mirror.api.cache.invalidate("club", "club-1")
+            return await mirror.get_club("club-1"), await mirror.api.get_club("club-1"), mirror.stats()
+
+        local, remote, stats = self.run_with_mirror(test)
+
+        self.assertEqual(without_book_ids(local), without_book_ids(remote))
+        self.assertEqual(local.active_session.discussions[0].title, "Opening night")
+        self.assertEqual(stats["sync"]["full_syncs"], 1)
+        db = Database(self.path)
+        self.assertEqual(db.connection.execute("SELECT COUNT(*) FROM Books").fetchone()[0], 2)
+        db.close()
+
+    def test_reads_survive_an_outage(self):
+        """Test reads, and a restart, are served from the local copy while Supabase is down"""
+        self.run_with_mirror(lambda mirror: mirror.hydrate())
+        self.remote.stop()
+
+        async def test(mirror):
+            club = await mirror.hydrate()
+            await mirror.pull()
+            return club, await mirror.get_club("club-1"), mirror.stats()
+
+        hydrated, club, stats = self.run_with_mirror(test)
+
+        self.assertEqual(hydrated.name, "Quill's Bookclub")
+        self.assertIsNone(hydrated.version)
+        self.assertEqual(club.active_session.id, "session-1")
+        self.assertEqual(stats["pull_failures"], 1)
+
+    def test_stores_replace_the_copy(self):
+        """Test storing the club again replaces its rows instead of adding to them"""
+        async def test(mirror):
+            club = await mirror.hydrate()
+            for _ in range(4):
+                await mirror.store(club)
+            return await mirror.get_club("club-1")
+
+        club = self.run_with_mirror(test)
+
+        db = Database(self.path)
+        self.assertEqual(db.connection.execute("SELECT COUNT(*) FROM Books").fetchone()[0], 2)
+        self.assertEqual(db.connection.execute("SELECT COUNT(*) FROM Discussions").fetchone()[0], 1)
+        db.close()
+        self.assertEqual([session.id for session in club.past_sessions], ["session-0"])
+
+    def test_failed_store_keeps_the_copy(self):
+        """Test a club that cannot be stored leaves the previous copy whole"""
+        async def test(mirror):
+            club = await mirror.hydrate()
+            before = await mirror.get_club("club-1")
+            broken = club.active_session.replace(book=club.active_session.book.replace(title=None))
+            with self.assertRaises(sqlite3.IntegrityError):
+                await mirror.store(club.replace(name="Renamed", active_session=broken))
+            return before, await mirror.get_club("club-1")
+
+        before, after = self.run_with_mirror(test)
+
+        self.assertEqual(after, before)
+
+    def test_hydrate_without_a_copy_fails(self):
+        """Test hydrating with Supabase down and nothing stored locally raises"""
+        self.remote.stop()
+
+        with self.assertRaises(APIError):
+            self.run_with_mirror(lambda mirror: mirror.hydrate())
+
+
+if __name__ == '__main__':
+    unittest.main()
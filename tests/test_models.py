@@ -0,0 +1,103 @@
+"""
+Tests for the API response models
+"""
+import unittest
+from unittest.mock import patch, Mock
+import os
+import sys
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.models import Club, Member, Session, fast_json_loads, parse_date
+from api.bookclub_api import BookClubAPI
+
+CLUB = {
+    "id": "club-1",
+    "name": "Test Club",
+    "discord_channel": 123,
+    "members": [{"id": 1, "name": "Test Member", "points": 10, "books_read": 2}],
+    "active_session": {
+        "id": "session-1",
+        "book": {"title": "Test Book", "author": "Test Author", "year": 1925},
+        "due_date": "2025-05-01",
+        "discussions": [
+            {"id": "disc-2", "title": "Second", "date": "2025-04-20"},
+            {"id": "disc-1", "title": "First", "date": "2025-04-15T18:00:00Z", "location": "Library"}
+        ]
+    },
+    "past_sessions": [],
+    "shame_list": [1]
+}
+
+class TestModels(unittest.TestCase):
+    """Test cases for decoding API payloads into models"""
+
+    def test_club_from_dict(self):
+        """Test a nested club payload is decoded into models with parsed dates"""
+        club = Club.from_dict(CLUB)
+
+        self.assertEqual(club.name, "Test Club")
+        self.assertEqual(club.members[0].points, 10)
+        self.assertEqual(club.active_session.book.title, "Test Book")
+        self.assertEqual(club.active_session.due_date, date(2025, 5, 1))
+        self.assertEqual(club.active_session.discussions[1].date, date(2025, 4, 15))
+        self.assertIsNone(club.active_session.discussions[0].location)
+        self.assertEqual(club.shame_list, (1,))
+
+    def test_missing_fields_default(self):
+        """Test fields left out of a payload get defaults"""
+        member = Member.from_dict({"id": 1})
+        self.assertEqual(member.points, 0)
+        self.assertEqual(member.clubs, ())
+        self.assertIsNone(Club.from_dict({"id": "club-1"}).active_session)
+
+    def test_models_are_immutable(self):
+        """Test models shared through the cache cannot be modified"""
+        club = Club.from_dict(CLUB)
+        with self.assertRaises(AttributeError):
+            club.name = "Renamed"
+        with self.assertRaises(AttributeError):
+            club.extra = True
+        self.assertFalse(hasattr(club, "__dict__"))
+
+    def test_round_trip(self):
+        """Test to_dict gives back the JSON representation"""
+        session = Session.from_dict(CLUB["active_session"])
+        data = session.to_dict()
+
+        self.assertEqual(data["due_date"], "2025-05-01")
+        self.assertEqual(data["book"]["title"], "Test Book")
+        self.assertEqual(Session.from_dict(data), session)
+
+    def test_parse_date(self):
+        """Test the date formats the API sends are parsed"""
+        self.assertEqual(parse_date("2025-04-15"), date(2025, 4, 15))
+        self.assertEqual(parse_date("04/15/2025"), date(2025, 4, 15))
+        self.assertIsNone(parse_date(None))
+        self.assertIsNone(parse_date("soon"))
+
+    def test_unrecognized_date(self):
+        """Test a malformed date is read as missing instead of failing the whole club"""
+        club = Club.from_dict({**CLUB, "active_session": {**CLUB["active_session"], "due_date": "TBD"}})
+
+        self.assertIsNone(club.active_session.due_date)
+        self.assertEqual(club.active_session.book.title, "Test Book")
+
+    @patch('requests.Session.request')
+    def test_fast_json(self, mock_request):
+        """Test the opt-in fast decoder decodes the raw body, when installed"""
+        loads = fast_json_loads()
+        if loads is None:
+            self.skipTest("orjson is not installed")
+        mock_request.return_value = Mock(content=b'{"id": "club-1", "name": "Fast Club"}', headers={})
+
+        api = BookClubAPI("http://test-url.supabase.co", "test-key", fast_json=True)
+        club = api.get_club("club-1")
+
+        self.assertIs(api.json_loads, loads)
+        self.assertEqual(club.name, "Fast Club")
+        mock_request.return_value.json.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
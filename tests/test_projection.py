@@ -0,0 +1,81 @@
+"""
+Tests for field projection (include=) on API reads
+"""
+import unittest
+from unittest.mock import patch, Mock
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.projection import include_param, normalize_include, project
+from api.bookclub_api import BookClubAPI
+
+CLUB = {
+    "id": "club-1",
+    "name": "Test Club",
+    "members": [{"id": 1, "name": "Test Member"}],
+    "active_session": {
+        "id": "session-1",
+        "book": {"title": "Test Book", "author": "Test Author"},
+        "due_date": "2025-05-01",
+        "discussions": [{"id": "disc-1", "title": "First", "date": "2025-04-15"}]
+    }
+}
+
+class TestProjection(unittest.TestCase):
+    """Test cases for projecting payloads"""
+
+    def test_normalize_include(self):
+        """Test equivalent include options normalize to the same paths"""
+        self.assertEqual(normalize_include(["b", "a", "b"]), ("a", "b"))
+        self.assertEqual(normalize_include("a"), ("a",))
+        self.assertIsNone(normalize_include([]))
+        self.assertEqual(include_param(("a", "b.c")), "a,b.c")
+
+    def test_project_nested_path(self):
+        """Test a nested path keeps that subtree and the IDs along the way"""
+        self.assertEqual(
+            project(CLUB, ["active_session.due_date"]),
+            {"id": "club-1", "active_session": {"id": "session-1", "due_date": "2025-05-01"}}
+        )
+
+    def test_project_lists(self):
+        """Test a path applies to every item of a list"""
+        self.assertEqual(
+            project(CLUB, ["members.name"]),
+            {"id": "club-1", "members": [{"id": 1, "name": "Test Member"}]}
+        )
+
+    def test_project_nothing(self):
+        """Test no include keeps the whole payload"""
+        self.assertIs(project(CLUB, None), CLUB)
+
+class TestClientProjection(unittest.TestCase):
+    """Test cases for include= in BookClubAPI"""
+
+    @patch('requests.Session.request')
+    def test_include_is_sent_and_cached_separately(self, mock_request):
+        """Test include= becomes a query parameter and gets its own cache entry"""
+        api = BookClubAPI("http://test-url.supabase.co", "test-key")
+        partial, full = Mock(), Mock()
+        partial.json.return_value = project(CLUB, ["active_session.due_date"])
+        full.json.return_value = CLUB
+        mock_request.side_effect = [partial, full, Mock()]
+
+        club = api.get_club("club-1", include=["active_session.due_date"])
+        api.get_club("club-1", include="active_session.due_date")
+        api.get_club("club-1")
+
+        self.assertEqual(str(club.active_session.due_date), "2025-05-01")
+        self.assertIsNone(club.active_session.book)
+        self.assertEqual(
+            [call.kwargs["params"] for call in mock_request.call_args_list[:2]],
+            [{"id": "club-1", "include": "active_session.due_date"}, {"id": "club-1"}]
+        )
+
+        api.update_club("club-1", {"name": "Renamed"})
+        self.assertEqual(api.stats()["cache"]["size"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
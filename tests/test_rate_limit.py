@@ -0,0 +1,123 @@
+"""
+Tests for the API clients' rate limiter
+"""
+import unittest
+from unittest.mock import patch, Mock, MagicMock
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.rate_limit import BACKGROUND, INTERACTIVE, RateLimiter, TokenBucket, priority, priority_for
+from api.bookclub_api import BookClubAPI
+from api.async_bookclub_api import AsyncBookClubAPI
+from utils.deadline import DeadlineExceeded, deadline
+from test_async_bookclub_api import mock_response
+from helpers import FakeClock
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for TokenBucket"""
+
+    def test_burst_then_refill(self):
+        """Test a full bucket allows a burst, then refills at the rate"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=2, clock=clock)
+
+        self.assertEqual(bucket.take(), 0)
+        self.assertEqual(bucket.take(), 0)
+        self.assertEqual(bucket.take(), 0.5)
+
+        clock.now = 0.5
+        self.assertEqual(bucket.take(), 0)
+
+    def test_disabled(self):
+        """Test a rate of 0 never throttles"""
+        bucket = TokenBucket(rate=0, burst=0)
+        self.assertTrue(all(bucket.take() == 0 for _ in range(100)))
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for RateLimiter"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(
+            interactive_rate=1, interactive_burst=1,
+            background_rate=1, background_burst=1,
+            clock=self.clock
+        )
+
+    def test_waits_and_counts(self):
+        """Test a throttled call waits for a token, and the wait is counted"""
+        self.assertEqual(self.limiter.acquire(INTERACTIVE, sleep=self.clock.sleep), 0)
+        self.assertEqual(self.limiter.acquire(INTERACTIVE, sleep=self.clock.sleep), 1.0)
+
+        stats = self.limiter.stats()
+        self.assertEqual(stats[INTERACTIVE], {"acquired": 2, "throttled": 1, "wait_seconds": 1.0})
+        self.assertEqual(stats[BACKGROUND]["acquired"], 0)
+
+    def test_separate_budgets(self):
+        """Test background calls cannot use up the interactive budget"""
+        self.limiter.acquire(BACKGROUND, sleep=self.clock.sleep)
+        self.assertEqual(self.limiter.acquire(INTERACTIVE, sleep=self.clock.sleep), 0)
+
+    def test_interactive_priority(self):
+        """Test background calls hold back while an interactive call is waiting"""
+        self.limiter._interactive_waiting = 1
+        self.assertGreater(self.limiter._try_acquire(BACKGROUND), 0)
+        self.assertEqual(self.limiter.buckets[BACKGROUND].tokens, 1)
+
+    def test_deadline(self):
+        """Test a wait that would outlast the deadline fails instead"""
+        self.limiter.acquire(INTERACTIVE, sleep=self.clock.sleep)
+        with deadline(0.5):
+            with self.assertRaises(DeadlineExceeded):
+                self.limiter.acquire(INTERACTIVE, sleep=self.clock.sleep)
+
+    def test_priority_for(self):
+        """Test reads are interactive and writes background, unless set explicitly"""
+        self.assertEqual(priority_for("GET"), INTERACTIVE)
+        self.assertEqual(priority_for("PUT"), BACKGROUND)
+        with priority(BACKGROUND):
+            self.assertEqual(priority_for("GET"), BACKGROUND)
+
+class TestClientRateLimit(unittest.TestCase):
+    """Test cases for rate limiting in the API clients"""
+
+    @patch('requests.Session.request')
+    def test_calls_are_limited(self, mock_request):
+        """Test every call takes a token of its priority"""
+        api = BookClubAPI("http://test-url.supabase.co", "test-key")
+        mock_request.return_value.json.return_value = {"id": 1}
+
+        api.get_member(1)
+        api.update_member(1, {"points": 1})
+        api.get_members([2, 3])
+
+        stats = api.stats()["rate_limit"]
+        self.assertEqual(stats[INTERACTIVE]["acquired"], 1)
+        self.assertEqual(stats[BACKGROUND]["acquired"], 3)
+
+    def test_async_calls_are_limited(self):
+        """Test the async client waits for the limiter too"""
+        clock = FakeClock()
+        limiter = RateLimiter(interactive_rate=100, interactive_burst=1, clock=clock)
+        api = AsyncBookClubAPI("http://test-url.supabase.co", "test-key", cache_ttl=0, rate_limiter=limiter)
+        session = MagicMock()
+        session.request.side_effect = lambda *args, **kwargs: mock_response(payload={"id": "club-1"})
+
+        async def run():
+            await api.get_club("club-1")
+            await api.get_club("club-1")
+
+        async def sleep(seconds):
+            clock.sleep(seconds)
+
+        with patch.object(api, '_get_session', return_value=session), \
+                patch('api.rate_limit.asyncio.sleep', side_effect=sleep):
+            asyncio.run(run())
+
+        self.assertEqual(api.stats()["rate_limit"][INTERACTIVE]["throttled"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,293 @@
+"""
+Tests for API client retries and circuit breaking
+"""
+import unittest
+from unittest.mock import patch, Mock, MagicMock
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+
+import aiohttp
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.resilience import CircuitBreaker, RetryPolicy, parse_retry_after
+from api.bookclub_api import BookClubAPI, APIError, CircuitOpenError, ValidationError
+from api.async_bookclub_api import AsyncBookClubAPI
+from test_async_bookclub_api import mock_response
+from helpers import ok
+
+def http_error(status, headers=None):
+    """Build a mock requests response that fails with the given status"""
+    response = Mock()
+    response.status_code = status
+    response.text = "error"
+    response.headers = headers or {}
+    response.raise_for_status.side_effect = requests.exceptions.HTTPError(f"{status} Error", response=response)
+    return response
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test cases for RetryPolicy and Retry-After parsing"""
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test the backoff doubles per attempt up to the cap, scaled by the jitter"""
+        policy = RetryPolicy(max_retries=10, backoff_base=0.5, backoff_max=3.0, rand=lambda: 0.5)
+        self.assertEqual(policy.delay("GET", 0), 0.25)
+        self.assertEqual(policy.delay("GET", 1), 0.5)
+        self.assertEqual(policy.delay("GET", 5), 1.5)
+
+    def test_gives_up(self):
+        """Test non-idempotent verbs and exhausted attempts are not retried"""
+        policy = RetryPolicy(max_retries=2)
+        self.assertIsNone(policy.delay("POST", 0))
+        self.assertIsNone(policy.delay("PUT", 0))
+        self.assertIsNone(policy.delay("DELETE", 0))
+        self.assertIsNone(policy.delay("GET", 2))
+        self.assertIsNone(policy.delay("GET", 0, retry_after=60))
+
+    def test_unsent_writes_are_retried(self):
+        """Test any verb is retried when the request never reached the server"""
+        policy = RetryPolicy(max_retries=2, rand=lambda: 0.0)
+        self.assertEqual(policy.delay("PUT", 0, sent=False), 0.0)
+        self.assertEqual(policy.delay("POST", 1, sent=False), 0.0)
+        self.assertIsNone(policy.delay("POST", 2, sent=False))
+
+    def test_retry_after(self):
+        """Test Retry-After is honored in seconds or as an HTTP date"""
+        policy = RetryPolicy()
+        self.assertEqual(policy.delay("GET", 0, retry_after=2.0), 2.0)
+
+        now = datetime(2025, 4, 1, 12, 0, 0, tzinfo=timezone.utc)
+        self.assertEqual(parse_retry_after("3"), 3.0)
+        self.assertEqual(parse_retry_after("Tue, 01 Apr 2025 12:00:05 GMT", now=now), 5.0)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for CircuitBreaker"""
+
+    def setUp(self):
+        self.now = 0.0
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: self.now)
+
+    def test_opens_after_threshold(self):
+        """Test consecutive failures open the breaker, which then rejects calls"""
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.stats()["rejected"], 1)
+        self.assertEqual(self.breaker.stats()["times_opened"], 1)
+
+    def test_success_resets_failures(self):
+        """Test a success in between failures keeps the breaker closed"""
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open(self):
+        """Test the breaker half-opens after the reset timeout, then closes or re-opens"""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now = 10
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        self.now = 20
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+class TestClientResilience(unittest.TestCase):
+    """Test cases for retries and circuit breaking in BookClubAPI"""
+
+    def setUp(self):
+        self.now = 0.0
+        self.api = BookClubAPI(
+            "http://test-url.supabase.co",
+            "test-key",
+            retry=RetryPolicy(max_retries=2, rand=lambda: 0.0),
+            breaker=CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=lambda: self.now)
+        )
+        self.api.cache.clock = lambda: self.now
+
+    @patch('requests.Session.request')
+    def test_retries_transient_failures(self, mock_request):
+        """Test a GET is retried after a 503 and a dropped connection"""
+        mock_request.side_effect = [
+            http_error(503),
+            requests.exceptions.ConnectionError("reset"),
+            ok({"id": "club-1"})
+        ]
+
+        result = self.api.get_club("club-1")
+
+        self.assertEqual(result.id, "club-1")
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertEqual(self.api.stats()["retry"]["retries"], 2)
+        self.assertEqual(self.api.stats()["circuit_breaker"]["state"], CircuitBreaker.CLOSED)
+
+    @patch('time.sleep')
+    @patch('requests.Session.request')
+    def test_honors_retry_after(self, mock_request, mock_sleep):
+        """Test a 429 waits for as long as the Retry-After header asks"""
+        mock_request.side_effect = [http_error(429, {"Retry-After": "2"}), ok({"id": 1})]
+
+        self.api.get_member(1)
+
+        mock_sleep.assert_called_once_with(2.0)
+
+    @patch('requests.Session.request')
+    def test_post_is_not_retried(self, mock_request):
+        """Test a non-idempotent create is not repeated"""
+        mock_request.side_effect = [http_error(503), ok({"success": True})]
+
+        with self.assertRaises(APIError):
+            self.api.create_member({"name": "New Member"})
+        mock_request.assert_called_once()
+
+    @patch('requests.Session.request')
+    def test_writes_are_retried_only_if_never_sent(self, mock_request):
+        """Test a write is repeated after a refused connection, but not after one dropped mid-request"""
+        refused = requests.exceptions.ConnectionError(
+            MaxRetryError(None, "/functions/v1/member", reason=NewConnectionError(None, "Connection refused"))
+        )
+        mock_request.side_effect = [requests.exceptions.ConnectionError("reset"), refused, ok({"success": True})]
+
+        with self.assertRaises(APIError):
+            self.api.update_member(1, {"points": 5})
+        self.assertEqual(mock_request.call_count, 1)
+
+        self.api.delete_member(1)
+        self.assertEqual(mock_request.call_count, 3)
+
+    @patch('requests.Session.request')
+    def test_writes_are_retried_after_connect_timeouts(self, mock_request):
+        """Test a write is repeated after timing out while connecting, but not while waiting for a reply"""
+        mock_request.side_effect = [
+            requests.exceptions.ReadTimeout("read timed out"),
+            requests.exceptions.ConnectTimeout("connect timed out"),
+            ok({"success": True}),
+        ]
+
+        with self.assertRaises(APIError):
+            self.api.update_member(1, {"points": 5})
+        self.assertEqual(mock_request.call_count, 1)
+
+        self.api.update_member(1, {"points": 5})
+        self.assertEqual(mock_request.call_count, 3)
+
+    @patch('requests.Session.request')
+    def test_client_errors_are_not_retried(self, mock_request):
+        """Test a 400 fails straight away and does not count against the breaker"""
+        mock_request.return_value = http_error(400)
+
+        with self.assertRaises(ValidationError):
+            self.api.update_member(1, {"points": -1})
+        mock_request.assert_called_once()
+        self.assertEqual(self.api.breaker.consecutive_failures, 0)
+
+    @patch('requests.Session.request')
+    def test_open_breaker_fails_fast(self, mock_request):
+        """Test calls fail without touching the network while the breaker is open"""
+        mock_request.side_effect = requests.exceptions.ConnectionError("refused")
+
+        with self.assertRaises(APIError):
+            self.api.get_session("session-1")
+        self.assertEqual(mock_request.call_count, 3)
+
+        with self.assertRaises(CircuitOpenError) as context:
+            self.api.get_session("session-1")
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertIn("Connection error", str(context.exception))
+        self.assertEqual(self.api.stats()["circuit_breaker"]["state"], CircuitBreaker.OPEN)
+
+    @patch('requests.Session.request')
+    def test_open_breaker_serves_stale_cache(self, mock_request):
+        """Test an expired cached read is served while the breaker is open"""
+        self.api.breaker.reset_timeout = 1000
+        mock_request.side_effect = [ok({"id": "club-1"})] + [requests.exceptions.ConnectionError("refused")] * 3
+        club = self.api.get_club("club-1")
+        with self.assertRaises(APIError):
+            self.api.get_member(1)
+
+        self.now = self.api.cache.ttl + 1
+        self.assertIs(self.api.get_club("club-1"), club)
+        self.assertEqual(self.api.stats()["cache"]["stale_served"], 1)
+
+class TestAsyncClientResilience(unittest.TestCase):
+    """Test cases for retries and circuit breaking in AsyncBookClubAPI"""
+
+    def test_retries_then_opens(self):
+        """Test a GET is retried, and repeated failures open the breaker"""
+        api = AsyncBookClubAPI(
+            "http://test-url.supabase.co",
+            "test-key",
+            retry=RetryPolicy(max_retries=1, rand=lambda: 0.0),
+            breaker=CircuitBreaker(failure_threshold=2)
+        )
+        session = MagicMock()
+        session.request.side_effect = lambda *args, **kwargs: mock_response(status=502, text="Bad gateway")
+
+        async def run():
+            with self.assertRaises(APIError):
+                await api.get_club("club-1")
+            with self.assertRaises(CircuitOpenError):
+                await api.get_club("club-1")
+
+        with patch.object(api, '_get_session', return_value=session):
+            asyncio.run(run())
+
+        self.assertEqual(session.request.call_count, 2)
+        self.assertEqual(api.stats()["circuit_breaker"]["state"], CircuitBreaker.OPEN)
+
+    def test_writes_are_retried_only_if_never_sent(self):
+        """Test a write is repeated after failing to connect, but not after a 503"""
+        api = AsyncBookClubAPI("http://test-url.supabase.co", "test-key", retry=RetryPolicy(max_retries=2, rand=lambda: 0.0))
+        session = MagicMock()
+        session.request.side_effect = [
+            aiohttp.ClientConnectorError(MagicMock(), OSError(111, "Connection refused")),
+            mock_response(payload={"success": True}),
+            mock_response(status=503, text="Unavailable"),
+        ]
+
+        async def run():
+            await api.update_member(1, {"points": 5})
+            with self.assertRaises(APIError):
+                await api.delete_member(1)
+
+        with patch.object(api, '_get_session', return_value=session):
+            asyncio.run(run())
+
+        self.assertEqual(session.request.call_count, 3)
+
+    def test_writes_are_retried_after_connect_timeouts(self):
+        """Test a write is repeated after timing out while connecting, but not while waiting for a reply"""
+        api = AsyncBookClubAPI("http://test-url.supabase.co", "test-key", retry=RetryPolicy(max_retries=2, rand=lambda: 0.0))
+        session = MagicMock()
+        session.request.side_effect = [
+            aiohttp.SocketTimeoutError("Timeout on reading data from socket"),
+            aiohttp.ConnectionTimeoutError("Connection timeout to host"),
+            mock_response(payload={"success": True}),
+        ]
+
+        async def run():
+            with self.assertRaises(APIError):
+                await api.update_member(1, {"points": 5})
+            await api.update_member(1, {"points": 5})
+
+        with patch.object(api, '_get_session', return_value=session):
+            asyncio.run(run())
+
+        self.assertEqual(session.request.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
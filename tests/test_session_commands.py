@@ -2,221 +2,185 @@
 Tests for session commands (book, duedate, session, discussions)
 """
 import unittest
-from unittest.mock import patch, MagicMock, AsyncMock
+import os
+import sys
+from datetime import date
+from unittest.mock import MagicMock, AsyncMock
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.models import Book, Club, Discussion, Session
 from cogs.session_commands import setup_session_commands
-from utils.embeds import create_embed
+from utils.deadline import remaining
 
-class TestSessionCommands(unittest.TestCase):
+SESSION = Session(
+    id="session-1",
+    book=Book(title="Test Book Title", author="Test Author", year=1953, edition="First"),
+    due_date=date(2025, 5, 1),
+    discussions=(
+        Discussion(title="Second Discussion", date=date(2025, 4, 22), id="discussion-2"),
+        Discussion(title="First Discussion", date=date(2025, 4, 15), id="discussion-1", location="Library"),
+    )
+)
+CLUB = Club(id="club-1", name="Test Book Club", active_session=SESSION)
+
+class TestSessionCommands(unittest.IsolatedAsyncioTestCase):
     """Test cases for session commands"""
-    
+
     def setUp(self):
         """Set up common test fixtures"""
-        # Create a mock bot
         self.bot = MagicMock()
-        self.bot.tree = MagicMock()
-        
-        # Create mock club data
-        self.bot.club = {
-            'name': 'Test Book Club',
-            'active_session': {
-                'id': 'session-1',
-                'book': {
-                    'title': 'Test Book Title',
-                    'author': 'Test Author'
-                },
-                'due_date': '2025-05-01',
-                'discussions': [
-                    {
-                        'id': 'discussion-1',
-                        'date': '2025-04-15',
-                        'title': 'First Discussion'
-                    }
-                ]
-            }
-        }
-        
-        # Set up mock for OpenAI service
-        self.bot.openai_service = MagicMock()
+        self.bot.config.DEFAULT_CLUB_ID = "club-1"
+        self.bot.config.CLUB_SYNC_MAX_STALENESS = 60
+        self.bot.config.COMMAND_DEADLINE = 5
+
+        # The synced club is fresh unless a test says otherwise; ClubSync.fresh is not a coroutine
+        self.bot.club_sync.fresh = MagicMock(return_value=CLUB)
+        self.bot.api.get_club = AsyncMock(return_value=CLUB)
+
         self.bot.openai_service.get_response = AsyncMock(return_value="This is a test book summary.")
-        
+
         # Store the registered commands
         self.commands = {}
-        
-        # Mock the bot.tree.command decorator
+
         def mock_command(**kwargs):
             def decorator(func):
-                # Store the command and its properties
-                self.commands[kwargs.get('name')] = {
-                    'func': func,
-                    'kwargs': kwargs
-                }
+                self.commands[kwargs.get('name')] = func
                 return func
             return decorator
-        
+
         self.bot.tree.command = mock_command
-        
-        # Register the commands
         setup_session_commands(self.bot)
-        
-        # Verify commands were registered
-        self.assertIn('book', self.commands)
-        self.assertIn('duedate', self.commands)
-        self.assertIn('session', self.commands)
-        self.assertIn('discussions', self.commands)
-        self.assertIn('book_summary', self.commands)
-
-    @patch('utils.embeds.create_embed')
-    async def test_book_command(self, mock_create_embed):
-        """Test the book command"""
-        # Mock an interaction
-        interaction = AsyncMock()
-        interaction.response = AsyncMock()
-        
-        # Mock the embed creation
-        mock_embed = MagicMock()
-        mock_create_embed.return_value = mock_embed
-        
-        # Run the command
-        book_command = self.commands['book']['func']
-        await book_command(interaction)
-        
-        # Verify the embed was created with the right parameters
-        mock_create_embed.assert_called_once()
-        args, kwargs = mock_create_embed.call_args
-        self.assertEqual(kwargs['title'], "📚 Current Book")
-        self.assertEqual(kwargs['description'], "**Test Book Title**")
-        self.assertEqual(kwargs['color_key'], "info")
-        
-        # Verify fields contain book info
-        fields = kwargs.get('fields', [])
-        self.assertTrue(any(field['name'] == 'Author' and field['value'] == 'Test Author' for field in fields))
-        
-        # Verify footer
-        self.assertEqual(kwargs['footer'], "Happy reading! 📖")
-        
-        # Verify the interaction response was sent
-        interaction.response.send_message.assert_called_once_with(embed=mock_embed)
-
-    @patch('utils.embeds.create_embed')
-    async def test_duedate_command(self, mock_create_embed):
+
+        self.interaction = MagicMock()
+        self.interaction.response.defer = AsyncMock()
+        self.interaction.followup.send = AsyncMock()
+
+    async def run_command(self, name):
+        """Run a command and get the embed it sent"""
+        await self.commands[name](self.interaction)
+        self.interaction.response.defer.assert_awaited_once()
+        self.interaction.followup.send.assert_awaited_once()
+        return self.interaction.followup.send.call_args.kwargs.get('embed')
+
+    def fields(self, embed):
+        return [(field.name, field.value) for field in embed.fields]
+
+    def test_commands_are_registered(self):
+        """Test every session command is registered"""
+        self.assertEqual(set(self.commands), {'book', 'duedate', 'session', 'discussions', 'book_summary'})
+
+    async def test_book_command(self):
+        """Test the book command renders the active book from the synced club"""
+        embed = await self.run_command('book')
+
+        self.assertEqual(embed.title, "📚 Current Book")
+        self.assertEqual(embed.description, "**Test Book Title**")
+        self.assertEqual(self.fields(embed), [("Author", "Test Author"), ("Year", "1953"), ("Edition", "First")])
+        self.assertEqual(embed.footer.text, "Happy reading! 📖")
+        self.bot.club_sync.fresh.assert_called_once_with(60)
+        self.bot.api.get_club.assert_not_awaited()
+
+    async def test_stale_club_is_fetched(self):
+        """Test a stale synced club falls back to the API, for only the fields the command renders"""
+        self.bot.club_sync.fresh.return_value = None
+
+        embed = await self.run_command('book')
+
+        self.assertEqual(embed.description, "**Test Book Title**")
+        self.bot.api.get_club.assert_awaited_once_with("club-1", include=["active_session.book"])
+
+    async def test_fetch_runs_within_the_deadline(self):
+        """Test the API fallback is given the command's time budget"""
+        self.bot.club_sync.fresh.return_value = None
+        budgets = []
+
+        async def get_club(club_id, include):
+            budgets.append(remaining())
+            return CLUB
+
+        self.bot.api.get_club.side_effect = get_club
+
+        await self.run_command('duedate')
+
+        self.assertEqual(len(budgets), 1)
+        self.assertTrue(0 < budgets[0] <= 5)
+        self.assertIsNone(remaining())
+
+    async def test_duedate_command(self):
         """Test the duedate command"""
-        # Mock an interaction
-        interaction = AsyncMock()
-        interaction.response = AsyncMock()
-        
-        # Mock the embed creation
-        mock_embed = MagicMock()
-        mock_create_embed.return_value = mock_embed
-        
-        # Run the command
-        duedate_command = self.commands['duedate']['func']
-        await duedate_command(interaction)
-        
-        # Verify the embed was created with the right parameters
-        mock_create_embed.assert_called_once()
-        args, kwargs = mock_create_embed.call_args
-        self.assertEqual(kwargs['title'], "📅 Due Date")
-        self.assertEqual(kwargs['description'], "Session due date: **2025-05-01**")
-        self.assertEqual(kwargs['color_key'], "warning")
-        
-        # Verify the interaction response was sent
-        interaction.response.send_message.assert_called_once_with(embed=mock_embed)
-
-    @patch('utils.embeds.create_embed')
-    async def test_session_command(self, mock_create_embed):
+        self.bot.club_sync.fresh.return_value = None
+
+        embed = await self.run_command('duedate')
+
+        self.assertEqual(embed.title, "📅 Due Date")
+        self.assertEqual(embed.description, "Session due date: **2025-05-01**")
+        self.bot.api.get_club.assert_awaited_once_with("club-1", include=["active_session.due_date"])
+
+    async def test_session_command(self):
         """Test the session command"""
-        # Mock an interaction
-        interaction = AsyncMock()
-        interaction.response = AsyncMock()
-        
-        # Mock the embed creation
-        mock_embed = MagicMock()
-        mock_create_embed.return_value = mock_embed
-        
-        # Run the command
-        session_command = self.commands['session']['func']
-        await session_command(interaction)
-        
-        # Verify the embed was created with the right parameters
-        mock_create_embed.assert_called_once()
-        args, kwargs = mock_create_embed.call_args
-        self.assertEqual(kwargs['title'], "📚 Current Session Details")
-        self.assertEqual(kwargs['color_key'], "info")
-        
-        # Verify fields contain book info, author, and due date
-        fields = kwargs.get('fields', [])
-        self.assertTrue(any(field['name'] == 'Book' and field['value'] == 'Test Book Title' for field in fields))
-        self.assertTrue(any(field['name'] == 'Author' and field['value'] == 'Test Author' for field in fields))
-        self.assertTrue(any(field['name'] == 'Due Date' and field['value'] == '2025-05-01' for field in fields))
-        
-        # Verify footer
-        self.assertEqual(kwargs['footer'], "Keep reading! 📖")
-        
-        # Verify the interaction response was sent
-        interaction.response.send_message.assert_called_once_with(embed=mock_embed)
-
-    @patch('utils.embeds.create_embed')
-    async def test_discussions_command(self, mock_create_embed):
-        """Test the discussions command"""
-        # Mock an interaction
-        interaction = AsyncMock()
-        interaction.response = AsyncMock()
-        
-        # Mock the embed creation
-        mock_embed = MagicMock()
-        mock_create_embed.return_value = mock_embed
-        
-        # Run the command
-        discussions_command = self.commands['discussions']['func']
-        await discussions_command(interaction)
-        
-        # Verify the embed was created with the right parameters
-        mock_create_embed.assert_called_once()
-        args, kwargs = mock_create_embed.call_args
-        self.assertEqual(kwargs['title'], "📚 Book Discussion Details")
-        self.assertEqual(kwargs['color_key'], "info")
-        
-        # Verify fields contain discussion info
-        fields = kwargs.get('fields', [])
-        self.assertTrue(any(field['name'] == 'Number of Discussions' and field['value'] == '#1' for field in fields))
-        self.assertTrue(any(field['name'] == 'Next discussion' and field['value'] == '2025-04-15' for field in fields))
-        
-        # Verify footer
-        self.assertEqual(kwargs['footer'], "Don't stop reading! 📖")
-        
-        # Verify the interaction response was sent
-        interaction.response.send_message.assert_called_once_with(embed=mock_embed)
-
-    @patch('utils.embeds.create_embed')
-    async def test_book_summary_command(self, mock_create_embed):
+        self.bot.club_sync.fresh.return_value = None
+
+        embed = await self.run_command('session')
+
+        self.assertEqual(embed.title, "📚 Current Session Details")
+        self.assertEqual(self.fields(embed), [
+            ("Book", "Test Book Title"),
+            ("Author", "Test Author"),
+            ("Due Date", "2025-05-01"),
+            ("Discussions", "2 scheduled"),
+        ])
+        self.assertEqual(embed.footer.text, "Keep reading! 📖")
+        self.bot.api.get_club.assert_awaited_once_with(
+            "club-1", include=["active_session.book", "active_session.due_date", "active_session.discussions"]
+        )
+
+    async def test_discussions_command(self):
+        """Test the discussions command lists discussions in date order"""
+        embed = await self.run_command('discussions')
+
+        self.assertEqual(embed.title, "📚 Book Discussion Details")
+        self.assertEqual(self.fields(embed), [
+            ("Discussion 1: First Discussion", "**Date**: 2025-04-15\n**Location**: Library"),
+            ("Discussion 2: Second Discussion", "**Date**: 2025-04-22\n**Location**: TBD"),
+        ])
+        self.assertEqual(embed.footer.text, "Don't stop reading! 📖")
+
+    async def test_undated_discussions(self):
+        """Test discussions whose dates could not be read are listed last, as TBD"""
+        undated = Discussion(title="Undated Discussion", date=None, id="discussion-3")
+        session = SESSION.replace(due_date=None, discussions=(undated,) + SESSION.discussions)
+        self.bot.club_sync.fresh.return_value = CLUB.replace(active_session=session)
+
+        embed = await self.run_command('discussions')
+
+        self.assertEqual(self.fields(embed)[-1], ("Discussion 3: Undated Discussion", "**Date**: TBD\n**Location**: TBD"))
+
+    async def test_no_discussions(self):
+        """Test the discussions command says so when none are scheduled"""
+        self.bot.club_sync.fresh.return_value = CLUB.replace(active_session=SESSION.replace(discussions=()))
+
+        embed = await self.run_command('discussions')
+
+        self.assertIsNone(embed)
+        self.interaction.followup.send.assert_awaited_once_with("There are no discussions scheduled for this session.")
+
+    async def test_no_active_session(self):
+        """Test commands say so when there is no active session"""
+        self.bot.club_sync.fresh.return_value = CLUB.replace(active_session=None)
+
+        embed = await self.run_command('session')
+
+        self.assertIsNone(embed)
+        self.interaction.followup.send.assert_awaited_once_with("There is no active reading session right now.")
+
+    async def test_book_summary_command(self):
         """Test the book_summary command"""
-        # Mock an interaction
-        interaction = AsyncMock()
-        interaction.response = AsyncMock()
-        
-        # Mock the embed creation
-        mock_embed = MagicMock()
-        mock_create_embed.return_value = mock_embed
-        
-        # Run the command
-        book_summary_command = self.commands['book_summary']['func']
-        await book_summary_command(interaction)
-        
-        # Verify OpenAI service was called with the book title
-        self.bot.openai_service.get_response.assert_called_once()
-        args, _ = self.bot.openai_service.get_response.call_args
-        self.assertIn("Test Book Title", args[0])
-        
-        # Verify the embed was created with the right parameters
-        mock_create_embed.assert_called_once()
-        args, kwargs = mock_create_embed.call_args
-        self.assertEqual(kwargs['title'], "🤖 Book Summary")
-        self.assertEqual(kwargs['description'], "This is a test book summary.")
-        self.assertEqual(kwargs['color_key'], "info")
-        
-        # Verify the interaction response was sent
-        interaction.response.send_message.assert_called_once_with(embed=mock_embed)
+        embed = await self.run_command('book_summary')
+
+        self.bot.openai_service.get_response.assert_awaited_once_with("What is Test Book Title about?")
+        self.assertEqual(embed.title, "🤖 Book Summary")
+        self.assertEqual(embed.description, "This is a test book summary.")
+
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+Tests for request coalescing in the API clients
+"""
+import unittest
+from unittest.mock import patch, Mock
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.singleflight import SingleFlight, AsyncSingleFlight
+from api.bookclub_api import BookClubAPI
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for SingleFlight"""
+
+    def run_concurrently(self, flight, fn, count=5):
+        """Call flight.do from several threads at once, returning results and errors"""
+        results, errors = [], []
+
+        def worker():
+            try:
+                results.append(flight.do("key", fn))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results, errors
+
+    def test_concurrent_calls_are_coalesced(self):
+        """Test concurrent callers share one call and one result"""
+        flight = SingleFlight()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"id": "club-1"}
+
+        results, errors = self.run_concurrently(flight, fn)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(flight.stats(), {"calls": 1, "coalesced": 4, "in_flight": 0})
+
+    def test_errors_reach_every_waiter(self):
+        """Test an error is raised in every concurrent caller"""
+        flight = SingleFlight()
+
+        def fn():
+            time.sleep(0.1)
+            raise ValueError("upstream failed")
+
+        results, errors = self.run_concurrently(flight, fn)
+
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), 5)
+        self.assertTrue(all(isinstance(error, ValueError) for error in errors))
+
+    def test_sequential_calls_are_not_coalesced(self):
+        """Test a finished call is not reused"""
+        flight = SingleFlight()
+        self.assertEqual(flight.do("key", lambda: 1), 1)
+        self.assertEqual(flight.do("key", lambda: 2), 2)
+
+class TestAsyncSingleFlight(unittest.TestCase):
+    """Test cases for AsyncSingleFlight"""
+
+    def test_concurrent_calls_are_coalesced(self):
+        """Test concurrent coroutines share one call and one result"""
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"id": "club-1"}
+
+        async def run():
+            return await asyncio.gather(*(flight.do("key", fn) for _ in range(5)))
+
+        results = asyncio.run(run())
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(flight.stats(), {"calls": 1, "coalesced": 4, "in_flight": 0})
+
+    def test_errors_reach_every_waiter(self):
+        """Test an error is raised in every concurrent coroutine"""
+        flight = AsyncSingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+
+        async def run():
+            return await asyncio.gather(*(flight.do("key", fn) for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(run())
+
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    def test_cancelled_caller_does_not_cancel_others(self):
+        """Test cancelling one waiter leaves the shared call running for the rest"""
+        flight = AsyncSingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def run():
+            first = asyncio.ensure_future(flight.do("key", fn))
+            second = asyncio.ensure_future(flight.do("key", fn))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(run()), "done")
+
+class TestClientCoalescing(unittest.TestCase):
+    """Test cases for coalescing in BookClubAPI"""
+
+    @patch('requests.Session.request')
+    def test_concurrent_get_club(self, mock_request):
+        """Test concurrent identical reads fire a single upstream request"""
+        api = BookClubAPI("http://test-url.supabase.co", "test-key")
+        mock_response = Mock()
+        mock_response.json.return_value = {"id": "club-1"}
+        mock_response.raise_for_status = Mock()
+
+        def slow_request(*args, **kwargs):
+            time.sleep(0.1)
+            return mock_response
+        mock_request.side_effect = slow_request
+
+        threads = [threading.Thread(target=api.get_club, args=("club-1",)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        mock_request.assert_called_once()
+        self.assertEqual(api.stats()["singleflight"]["coalesced"], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -97,4 +97,10 @@ CONNECTION_MESSAGES = [
     "📡 I seem to have lost my connection to the book database.",
     "🌐 The library network is down. Can we try again later?",
     "🔌 I got disconnected from the literary mainframe!"
-]
\ No newline at end of file
+]
+
+TIMEOUT_MESSAGES = [
+    "⏳ The library is taking too long to answer. Can we try again later?",
+    "🐌 That took longer than reading War and Peace! Please try again.",
+    "⌛ I ran out of time looking that up. Let's try again in a bit."
+]
@@ -0,0 +1,113 @@
+"""
+Deadline propagation for command handlers
+
+A handler sets a time budget with `deadline()`, and every outbound call made
+while handling it (API, weather, OpenAI) sizes its timeout with `timeout_for()`
+so that it never outlives the budget. The budget is kept in a context variable,
+so it follows the handler into tasks and threads it starts.
+"""
+import asyncio
+import contextvars
+import time
+from contextlib import contextmanager
+
+# Monotonic time at which the current budget runs out, or None when unbounded
+_expires_at = contextvars.ContextVar("deadline_expires_at", default=None)
+
+class DeadlineExceeded(Exception):
+    """Raised when the current time budget runs out before a call completes."""
+    pass
+
+@contextmanager
+def deadline(seconds):
+    """
+    Set a time budget for everything run inside the block
+
+    Nested budgets can only shrink the enclosing one, never extend it.
+
+    Args:
+        seconds (float): The budget, in seconds
+    """
+    expires_at = time.monotonic() + seconds
+    current = _expires_at.get()
+    if current is not None:
+        expires_at = min(expires_at, current)
+    token = _expires_at.set(expires_at)
+    try:
+        yield
+    finally:
+        _expires_at.reset(token)
+
+def remaining():
+    """
+    Get the time left in the current budget
+
+    Returns:
+        float: Seconds left, possibly negative, or None if no budget is set
+    """
+    expires_at = _expires_at.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+def expired():
+    """
+    Check whether the current budget has run out
+
+    Returns:
+        bool: True if a budget is set and no time is left
+    """
+    left = remaining()
+    return left is not None and left <= 0
+
+def timeout_for(default=None):
+    """
+    Size the timeout of an outbound call to fit the current budget
+
+    Args:
+        default (float or tuple, optional): The call's own timeout, in seconds or as
+            a (connect, read) tuple. Defaults to None, meaning no timeout.
+
+    Returns:
+        float or tuple: The default, with every part capped at the time left
+
+    Raises:
+        DeadlineExceeded: If the budget has already run out
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded("Deadline exceeded before the call was made")
+    if default is None:
+        return left
+    if isinstance(default, tuple):
+        return tuple(min(part, left) for part in default)
+    return min(default, left)
+
+async def run_within_deadline(awaitable):
+    """
+    Await a call, cancelling it if the current budget runs out first
+
+    Args:
+        awaitable: The coroutine or future to await
+
+    Returns:
+        The awaitable's result
+
+    Raises:
+        DeadlineExceeded: If the budget runs out before the call completes
+    """
+    left = remaining()
+    if left is None:
+        return await awaitable
+    if left <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded("Deadline exceeded before the call was made")
+    try:
+        return await asyncio.wait_for(awaitable, left)
+    except asyncio.TimeoutError:
+        if not expired():
+            raise  # The call timed out on its own
+        raise DeadlineExceeded("Deadline exceeded while waiting for the call") from None
@@ -6,12 +6,23 @@ from datetime import datetime
 import pytz
 from discord.ext import tasks
 
+from api.rate_limit import BACKGROUND, priority
 from utils.constants import READING_REMINDERS
 from utils.embeds import create_embed
 
 def setup_scheduled_tasks(bot):
     """Setup all scheduled tasks for the bot"""
     
+    @tasks.loop(seconds=bot.config.CLUB_SYNC_INTERVAL)
+    async def sync_club():
+        """Pull the club's changes since the last sync and patch bot.club with them."""
+        try:
+            with priority(BACKGROUND):
+                await bot.club_sync.sync()
+        except Exception as e:
+            # Keep serving the last synced club; commands refetch once it is too stale
+            bot.logger.warning(f"Club sync failed: {e}")
+    
     @tasks.loop(hours=1)
     async def send_reminder_message():
         """Send daily reading reminders."""
@@ -31,6 +42,7 @@ def setup_scheduled_tasks(bot):
                 print("Reminder message sent.")
     
     # Start the scheduled tasks
+    sync_club.start()
     send_reminder_message.start()
     
     # Return the task so it can be stopped if needed